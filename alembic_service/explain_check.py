@@ -0,0 +1,245 @@
+"""
+Проверка планов запросов к схеме кошелька.
+
+Заполняет таблицы тестовыми данными внутри транзакции, выполняет EXPLAIN
+для каждой формы запроса из сервисов и завершается с ошибкой, если хотя бы
+один из них читает таблицу последовательным сканированием (Seq Scan).
+Настройки планировщика не меняются: объем данных подобран так, чтобы
+Seq Scan по индексируемой таблице был дороже поиска по индексу.
+Пустые секции и справочники из нескольких строк (SMALL_TABLES) читаются
+целиком и ошибкой не считаются.
+В конце транзакция откатывается, данные в базе не меняются.
+
+Запуск на локальной базе после `alembic upgrade head`:
+    python alembic_service/explain_check.py
+
+В сборке (ненулевой код, если какой-то запрос читает таблицу целиком):
+    docker compose --profile ci run --rm explain_check
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for path in (BASE_DIR, os.path.join(BASE_DIR, "app/backend")):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from sqlalchemy import ClauseElement, Executable, column, select, text, values
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from common.Enums import PaymentWorker, TransactionStatus
+from common.Enums.ValuteCode import ValuteCode
+from common.Models import (
+    Currency,
+    PaymentProviderBalance,
+    StripeAccounts,
+    Wallet,
+    WalletAccount,
+    WalletTransaction,
+)
+from wallet_service.app.services.TransactionHistory import TransactionHistory
+from alembic_service.config import settings
+
+SEED_USERS = 5000
+SEED_TX_PER_WALLET = 100
+SEED_PREFIX = "explain-check"
+
+# Таблицы из нескольких строк, для них Seq Scan дешевле индекса
+SMALL_TABLES = {"currencies", "payment_provider_balances"}
+
+SEED_SQL = [
+    f"""
+    INSERT INTO "Users" (login, is_active, two_factor_enabled, auth_provider)
+    SELECT '{SEED_PREFIX}-' || g, true, false, 'local'
+    FROM generate_series(1, {SEED_USERS}) g
+    """,
+    f"""
+    INSERT INTO wallets (user_id)
+    SELECT id FROM "Users" WHERE login LIKE '{SEED_PREFIX}-%'
+    """,
+    f"""
+    INSERT INTO wallet_accounts (wallet_id, currency_code, type, amount)
+    SELECT w.id, c.code::valutecode, 'FIAT', 100
+    FROM wallets w
+    JOIN "Users" u ON u.id = w.user_id AND u.login LIKE '{SEED_PREFIX}-%'
+    CROSS JOIN (VALUES ('RUB'), ('USD'), ('EUR')) c(code)
+    """,
+    f"""
+    INSERT INTO stripe_accounts (user_id, stripe_account_id)
+    SELECT id, 'acct_' || id FROM "Users" WHERE login LIKE '{SEED_PREFIX}-%'
+    """,
+    f"""
+    INSERT INTO wallet_transactions (
+        user_id, wallet_id, amount, currency, operation_type, status,
+        date, correlation_id, idempotency_key, external_id
+    )
+    SELECT
+        w.user_id, w.id, 1, 'USD', 'TRANSFER',
+        (CASE WHEN g % 50 = 0 THEN 'PENDING' ELSE 'COMPLETED' END)::transactionstatus,
+        now() - g * interval '1 day', gen_random_uuid(),
+        '{SEED_PREFIX}-' || w.id || '-' || g, 'po_' || w.id || '_' || g
+    FROM wallets w
+    JOIN "Users" u ON u.id = w.user_id AND u.login LIKE '{SEED_PREFIX}-%'
+    CROSS JOIN generate_series(1, {SEED_TX_PER_WALLET}) g
+    """,
+    'ANALYZE "Users", wallets, wallet_accounts, stripe_accounts, wallet_transactions',
+]
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    sql = compiler.process(element.statement, **kw)
+    # EXPLAIN возвращает одну колонку с планом, а не колонки запроса:
+    # без этого типы колонок запроса применяются к JSON плана
+    compiler._result_columns = []
+    return "EXPLAIN (FORMAT JSON) " + sql
+
+
+def seq_scans(plan: dict, allowed: set[str]) -> list[str]:
+    """Таблицы, которые план читает последовательным сканированием"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        relation = plan.get("Relation Name", "?")
+        if relation not in allowed:
+            found.append(relation)
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child, allowed))
+    return found
+
+
+async def empty_tables(conn: AsyncConnection) -> set[str]:
+    """Пустые таблицы и секции, например секции будущих месяцев"""
+    rows = await conn.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace "
+            "AND reltuples = 0"
+        )
+    )
+    return set(rows.scalars())
+
+
+async def sample(conn: AsyncConnection):
+    row = (
+        await conn.execute(
+            select(
+                WalletTransaction.id,
+                WalletTransaction.wallet_id,
+                WalletTransaction.user_id,
+                WalletTransaction.correlation_id,
+                WalletTransaction.idempotency_key,
+                WalletTransaction.external_id,
+                WalletTransaction.date,
+            )
+            .where(WalletTransaction.idempotency_key.like(f"{SEED_PREFIX}-%"))
+            .limit(1)
+        )
+    ).one()
+    return row
+
+
+def query_shapes(row) -> dict:
+    """Формы запросов, которые выполняют wallet_service и wallet_worker"""
+    results_values = values(
+        column("correlation_id", WalletTransaction.__table__.c.correlation_id.type),
+        column("status", WalletTransaction.__table__.c.status.type),
+        name="results",
+    ).data([(row.correlation_id, TransactionStatus.COMPLETED)])
+
+    # Запросы истории строит сам TransactionHistory, как в ListTransactions
+    history = TransactionHistory()
+
+    return {
+        "wallet by user_id": select(Wallet).where(Wallet.user_id == row.user_id),
+        "wallets by user_id list": select(Wallet.user_id, Wallet.id).where(
+            Wallet.user_id.in_([row.user_id, row.user_id + 1])
+        ),
+        "wallet accounts of wallet": select(WalletAccount).where(
+            WalletAccount.wallet_id == row.wallet_id
+        ),
+        "transaction by id": select(WalletTransaction).where(
+            WalletTransaction.id == row.id
+        ),
+        "transaction by correlation_id": select(WalletTransaction.status).where(
+            WalletTransaction.correlation_id == row.correlation_id,
+            WalletTransaction.wallet_id == row.wallet_id,
+        ),
+        "transaction by idempotency_key": select(WalletTransaction).where(
+            WalletTransaction.idempotency_key == row.idempotency_key
+        ),
+        "transaction by external_id": select(WalletTransaction).where(
+            WalletTransaction.external_id == row.external_id
+        ),
+        "pending transactions": select(WalletTransaction.id)
+        .where(WalletTransaction.status == TransactionStatus.PENDING)
+        .order_by(WalletTransaction.date)
+        .limit(100),
+        "history first page": history.page_query(wallet_id=row.wallet_id, limit=50),
+        "history next page": history.page_query(
+            wallet_id=row.wallet_id,
+            limit=50,
+            cursor=history.encode_cursor(row.date, row.id),
+        ),
+        "history export": history.query(wallet_id=row.wallet_id),
+        # Та же связка, что и в UPDATE ... FROM (VALUES ...) результатов wallet_worker
+        "operation results batch join": select(WalletTransaction.id).where(
+            WalletTransaction.correlation_id == results_values.c.correlation_id,
+            WalletTransaction.status.in_(
+                [TransactionStatus.PENDING, TransactionStatus.PROCESSED]
+            ),
+        ),
+        "provider balance by provider": select(PaymentProviderBalance).where(
+            PaymentProviderBalance.provider == PaymentWorker.STRIPE
+        ),
+        "stripe account by user_id": select(StripeAccounts).where(
+            StripeAccounts.user_id == row.user_id
+        ),
+        "currency by code": select(Currency).where(Currency.code == ValuteCode.USD),
+    }
+
+
+async def main() -> int:
+    engine = create_async_engine(settings.postgres_url)
+    failures = []
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            try:
+                for statement in SEED_SQL:
+                    await conn.execute(text(statement))
+                allowed = SMALL_TABLES | await empty_tables(conn)
+
+                for name, statement in query_shapes(await sample(conn)).items():
+                    plan = (await conn.execute(Explain(statement))).scalar()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    tables = seq_scans(plan[0]["Plan"], allowed)
+                    status = "SEQ SCAN " + ", ".join(tables) if tables else "ok"
+                    print(f"{name:<40} {status}")
+                    if tables:
+                        failures.append(name)
+            finally:
+                await trans.rollback()
+    finally:
+        await engine.dispose()
+
+    if failures:
+        print(f"\nЗапросы без подходящего индекса: {', '.join(failures)}")
+        return 1
+    print("\nВсе запросы используют индексы")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
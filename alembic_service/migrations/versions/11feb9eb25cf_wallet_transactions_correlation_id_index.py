@@ -0,0 +1,41 @@
+"""wallet_transactions correlation_id index
+
+Revision ID: 11feb9eb25cf
+Revises: fb4fd4dad741
+Create Date: 2026-10-19 12:04:11.527301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '11feb9eb25cf'
+down_revision: Union[str, None] = 'fb4fd4dad741'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_wallet_transactions_correlation_id'),
+            'wallet_transactions',
+            ['correlation_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_wallet_transactions_correlation_id'),
+            table_name='wallet_transactions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,215 @@
+"""wallet_transactions monthly partitions
+
+Revision ID: 3b7e9c41d0a2
+Revises: 8d3f1a6c2e57
+Create Date: 2026-10-19 16:21:47.306518
+
+ВНИМАНИЕ: миграция требует окна обслуживания.
+Вся миграция идет одной транзакцией: переименование таблицы берет ACCESS
+EXCLUSIVE блокировку wallet_transactions и держит ее до COMMIT, то есть на
+время полного копирования строк и построения индексов. Все чтения и записи
+операций в это время ждут. Индексы на секционированной таблице нельзя строить
+CONCURRENTLY, а копирование пачками в отдельных транзакциях потребовало бы
+догонять строки, вставленные во время копирования, поэтому перед запуском
+нужно остановить wallet_service и wallet_worker. Время простоя примерно равно
+времени INSERT ... SELECT всей таблицы плюс построения индексов; его стоит
+замерить на копии продовой базы. lock_timeout не дает миграции встать в
+очередь за долгой транзакцией и заблокировать всех остальных.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e9c41d0a2'
+down_revision: Union[str, None] = '8d3f1a6c2e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Партиции создаются заранее на столько месяцев вперед
+PARTITIONS_AHEAD_MONTHS = 3
+
+COLUMNS = (
+    'id, user_id, currency, from_currency, to_currency, amount, operation_type, status, date, '
+    'correlation_id, external_id, idempotency_key, payment_worker, wallet_id, to_wallet_id, from_wallet_id'
+)
+
+COLUMNS_DDL = """
+    id INTEGER NOT NULL DEFAULT nextval('wallet_transactions_id_seq'),
+    user_id INTEGER NOT NULL REFERENCES "Users" (id),
+    currency valutecode,
+    from_currency valutecode,
+    to_currency valutecode,
+    amount NUMERIC(18, 2) NOT NULL,
+    operation_type operationtype NOT NULL,
+    status transactionstatus NOT NULL DEFAULT 'PENDING',
+    date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    correlation_id UUID,
+    external_id VARCHAR,
+    idempotency_key VARCHAR NOT NULL,
+    payment_worker paymentworker,
+    wallet_id INTEGER NOT NULL REFERENCES wallets (id),
+    to_wallet_id INTEGER REFERENCES wallets (id),
+    from_wallet_id INTEGER REFERENCES wallets (id),
+"""
+
+# Партиция месяца month_start с границами по UTC. Если строки этого месяца уже
+# попали в партицию по умолчанию, они переносятся в новую партицию перед подключением.
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION wallet_transactions_create_partition(month_start date)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    start_ts timestamptz := date_trunc('month', month_start::timestamp) AT TIME ZONE 'UTC';
+    end_ts timestamptz := (date_trunc('month', month_start::timestamp) + interval '1 month') AT TIME ZONE 'UTC';
+    partition_name text := 'wallet_transactions_p' || to_char(month_start, 'YYYYMM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM wallet_transactions_default WHERE date >= start_ts AND date < end_ts
+    ) THEN
+        EXECUTE format('CREATE TABLE %I (LIKE wallet_transactions INCLUDING DEFAULTS)', partition_name);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM wallet_transactions_default WHERE date >= %L AND date < %L RETURNING *) '
+            'INSERT INTO %I SELECT * FROM moved',
+            start_ts, end_ts, partition_name
+        );
+        EXECUTE format(
+            'ALTER TABLE wallet_transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, start_ts, end_ts
+        );
+    ELSE
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF wallet_transactions FOR VALUES FROM (%L) TO (%L)',
+            partition_name, start_ts, end_ts
+        );
+    END IF;
+END;
+$$
+"""
+
+# Партиции текущего месяца и months_ahead следующих
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION wallet_transactions_ensure_partitions(months_ahead integer)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        PERFORM wallet_transactions_create_partition(
+            (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => i))::date
+        );
+    END LOOP;
+END;
+$$
+"""
+
+# Партиции для месяцев, за которые уже есть операции
+BACKFILL_PARTITIONS = """
+DO $$
+DECLARE
+    month_start date;
+BEGIN
+    FOR month_start IN
+        SELECT g::date
+        FROM generate_series(
+            (SELECT date_trunc('month', coalesce(min(date), now()) AT TIME ZONE 'UTC') FROM wallet_transactions_legacy),
+            date_trunc('month', now() AT TIME ZONE 'UTC'),
+            interval '1 month'
+        ) g
+    LOOP
+        PERFORM wallet_transactions_create_partition(month_start);
+    END LOOP;
+END;
+$$
+"""
+
+INDEXES = [
+    dict(index_name='ix_wallet_transactions_correlation_id', columns=['correlation_id']),
+    dict(index_name='ix_wallet_transactions_idempotency_key', columns=['idempotency_key']),
+    dict(index_name='ix_wallet_transactions_external_id', columns=['external_id']),
+    dict(
+        index_name='ix_wallet_transactions_pending_date',
+        columns=['date'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    ),
+    dict(
+        index_name='ix_wallet_transactions_wallet_id_date_id',
+        columns=['wallet_id', sa.text('date DESC'), sa.text('id DESC')],
+        postgresql_include=['operation_type', 'currency', 'status', 'amount', 'correlation_id'],
+    ),
+]
+
+
+def _drop_indexes() -> None:
+    for index in reversed(INDEXES):
+        op.drop_index(index['index_name'], table_name='wallet_transactions', if_exists=True)
+
+
+def _create_indexes() -> None:
+    # Индекс на секционированной таблице создается и на всех ее партициях
+    for index in INDEXES:
+        op.create_index(table_name='wallet_transactions', unique=False, **index)
+
+
+# Сколько ждать блокировку таблицы, прежде чем миграция завершится с ошибкой
+LOCK_TIMEOUT = '10s'
+
+
+def upgrade() -> None:
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    # Имена индексов и первичного ключа освобождаются для новой таблицы
+    _drop_indexes()
+    op.execute('ALTER TABLE wallet_transactions RENAME TO wallet_transactions_legacy')
+    op.execute('ALTER TABLE wallet_transactions_legacy RENAME CONSTRAINT wallet_transactions_pkey TO wallet_transactions_legacy_pkey')
+    # Последовательность id переходит к новой таблице и не удаляется вместе со старой
+    op.execute('ALTER SEQUENCE wallet_transactions_id_seq OWNED BY NONE')
+
+    # Ключ секционирования обязан входить в первичный ключ
+    op.execute(
+        'CREATE TABLE wallet_transactions ('
+        + COLUMNS_DDL
+        + '    CONSTRAINT wallet_transactions_pkey PRIMARY KEY (id, date)\n'
+        ') PARTITION BY RANGE (date)'
+    )
+    op.execute('ALTER SEQUENCE wallet_transactions_id_seq OWNED BY wallet_transactions.id')
+    op.execute('CREATE TABLE wallet_transactions_default PARTITION OF wallet_transactions DEFAULT')
+
+    op.execute(CREATE_PARTITION_FUNCTION)
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+    op.execute(BACKFILL_PARTITIONS)
+    op.execute(f'SELECT wallet_transactions_ensure_partitions({PARTITIONS_AHEAD_MONTHS})')
+
+    op.execute(f'INSERT INTO wallet_transactions ({COLUMNS}) SELECT {COLUMNS} FROM wallet_transactions_legacy')
+    op.execute('DROP TABLE wallet_transactions_legacy')
+    _create_indexes()
+
+
+def downgrade() -> None:
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    # Отсоединенные и заархивированные партиции в обычную таблицу не возвращаются
+    _drop_indexes()
+    op.execute('ALTER TABLE wallet_transactions RENAME TO wallet_transactions_partitioned')
+    op.execute('ALTER TABLE wallet_transactions_partitioned RENAME CONSTRAINT wallet_transactions_pkey TO wallet_transactions_partitioned_pkey')
+    op.execute('ALTER SEQUENCE wallet_transactions_id_seq OWNED BY NONE')
+
+    op.execute(
+        'CREATE TABLE wallet_transactions ('
+        + COLUMNS_DDL
+        + '    CONSTRAINT wallet_transactions_pkey PRIMARY KEY (id)\n'
+        ')'
+    )
+    op.execute('ALTER TABLE wallet_transactions ALTER COLUMN date DROP DEFAULT')
+    op.execute('ALTER SEQUENCE wallet_transactions_id_seq OWNED BY wallet_transactions.id')
+
+    op.execute(f'INSERT INTO wallet_transactions ({COLUMNS}) SELECT {COLUMNS} FROM wallet_transactions_partitioned')
+    op.execute('DROP TABLE wallet_transactions_partitioned')
+    op.execute('DROP FUNCTION wallet_transactions_ensure_partitions(integer)')
+    op.execute('DROP FUNCTION wallet_transactions_create_partition(date)')
+    _create_indexes()
@@ -0,0 +1,42 @@
+"""wallet_transactions history index
+
+Revision ID: 5c0e7d2a9b14
+Revises: 11feb9eb25cf
+Create Date: 2026-10-19 13:27:45.902318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0e7d2a9b14'
+down_revision: Union[str, None] = '11feb9eb25cf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ключ совпадает с порядком keyset-пагинации, INCLUDE позволяет отдавать страницу index-only scan
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_wallet_transactions_wallet_id_date_id',
+            'wallet_transactions',
+            ['wallet_id', sa.text('date DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_include=['operation_type', 'currency', 'status', 'amount', 'correlation_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_wallet_transactions_wallet_id_date_id',
+            table_name='wallet_transactions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
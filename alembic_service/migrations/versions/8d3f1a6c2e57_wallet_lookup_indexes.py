@@ -0,0 +1,55 @@
+"""wallet lookup indexes
+
+Revision ID: 8d3f1a6c2e57
+Revises: 5c0e7d2a9b14
+Create Date: 2026-10-19 14:52:08.114736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f1a6c2e57'
+down_revision: Union[str, None] = '5c0e7d2a9b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# wallet_transactions.wallet_id покрыт ix_wallet_transactions_wallet_id_date_id,
+# correlation_id - ix_wallet_transactions_correlation_id, wallets.user_id - уникальным ограничением
+INDEXES = [
+    dict(index_name='ix_wallet_transactions_idempotency_key', table_name='wallet_transactions', columns=['idempotency_key']),
+    dict(index_name='ix_wallet_transactions_external_id', table_name='wallet_transactions', columns=['external_id']),
+    dict(
+        index_name='ix_wallet_transactions_pending_date',
+        table_name='wallet_transactions',
+        columns=['date'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    ),
+    dict(index_name='ix_payment_provider_balances_provider', table_name='payment_provider_balances', columns=['provider']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        for index in INDEXES:
+            op.create_index(
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **index,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index in reversed(INDEXES):
+            op.drop_index(
+                index['index_name'],
+                table_name=index['table_name'],
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
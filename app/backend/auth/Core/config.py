@@ -1,21 +1,49 @@
 from pydantic_settings import SettingsConfigDict
-from common.Core.config import Postgres, Redis, Google
+from common.Core.config import Postgres, Redis, Google, TokenRevocation
 from pathlib import Path
 
 
-class Settings(Postgres, Redis, Google):
+class Settings(Postgres, Redis, Google, TokenRevocation):
     NOVAFIN_URL: str
     jwt_private_key: Path = Path("auth/certs/jwt_private.pem")
     jwt_public_key: Path = Path("auth/certs/jwt_public.pem")
+    # Публичные ключи прошлых пар: токены, подписанные ими, принимаются до exp
+    jwt_previous_public_keys: list[Path] = []
+    jwt_keys_check_interval_s: float = 5.0
 
     jwt_access_live_m: float = 15.0
     jwt_refresh_live_m: float = 10080.0
     jwt_algorithm: str = "RS256"
+    # Сколько шлюз может кэшировать набор ключей из GetPublicKeys
+    jwt_keys_max_age_s: int = 300
 
     REDIS_KEY_SESSIONS: str
     MAX_SESSIONS: int
     REDIS_SESSIONS_LIVE: int
     REDIS_KEY_OPT: str
+    OTP_TTL_S: int = 300
+    OTP_MAX_ATTEMPTS: int = 5
+    # Очистка истекших сессий: период, ключей за один SCAN и предел ключей в секунду
+    SESSION_SWEEP_INTERVAL_S: float = 600.0
+    SESSION_SWEEP_BATCH: int = 200
+    SESSION_SWEEP_MAX_KEYS_PER_S: int = 2000
+
+    # Общий HTTP/2 клиент для запросов к Google
+    OAUTH_HTTP_TIMEOUT_S: float = 10.0
+    OAUTH_HTTP_CONNECT_TIMEOUT_S: float = 5.0
+    OAUTH_HTTP_MAX_CONNECTIONS: int = 20
+    OAUTH_HTTP_MAX_KEEPALIVE: int = 10
+    OAUTH_HTTP_KEEPALIVE_EXPIRY_S: float = 60.0
+    # Кэш discovery и ключей Google для проверки id_token
+    GOOGLE_DISCOVERY_URL: str = (
+        "https://accounts.google.com/.well-known/openid-configuration"
+    )
+    GOOGLE_METADATA_MAX_AGE_S: float = 3600.0
+    GOOGLE_METADATA_MIN_REFRESH_S: float = 60.0
+
+    # Процессы bcrypt и предел операций в очереди, сверх него вызов отклоняется
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
 
     model_config = SettingsConfigDict(extra="ignore")
 
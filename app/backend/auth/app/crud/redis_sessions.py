@@ -1,49 +1,197 @@
+import json
 import redis
 from auth.Core.config import settings
 from auth.Core.redis_client import redis_client
 from datetime import datetime, timedelta, timezone
 
 
+# KEYS[1] - сессии пользователя; ARGV: refresh_id, время, MAX_SESSIONS, TTL
+ADD_SESSION_LUA = """
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+local extra = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[3])
+if extra > 0 then
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, extra - 1)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+# KEYS[1] - сессии пользователя; ARGV: старый refresh_id, новый refresh_id,
+# время, MAX_SESSIONS, TTL. 0, если старой сессии нет
+ROTATE_SESSION_LUA = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[2])
+local extra = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[4])
+if extra > 0 then
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, extra - 1)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return 1
+"""
+
+# KEYS[1] - код, KEYS[2] - счетчик попыток; ARGV: введенный код, MAX попыток.
+# 1 - код верный, 0 - неверный, -1 - кода нет или истек, -2 - попытки исчерпаны
+VERIFY_OTP_LUA = """
+local code = redis.call('GET', KEYS[1])
+if not code then
+    return -1
+end
+if code == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 1
+end
+if redis.call('INCR', KEYS[2]) >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return -2
+end
+return 0
+"""
+
+OTP_VALID = 1
+OTP_INVALID = 0
+OTP_EXPIRED = -1
+OTP_ATTEMPTS_EXCEEDED = -2
+
+
 class RedisSessions:
     def __init__(self, redis_cli: redis.Redis, session_prefix: str):
         self.redis_cli = redis_cli
         self.session_prefix = session_prefix
+        self._add_session = redis_cli.register_script(ADD_SESSION_LUA)
+        self._rotate_session = redis_cli.register_script(ROTATE_SESSION_LUA)
+        self._verify_otp = redis_cli.register_script(VERIFY_OTP_LUA)
 
-    async def add_refresh_token(self, user_id: str, refresh_token: str):
-        sessions_key = f"sessions:{user_id}"
-        current_time = datetime.timestamp(datetime.now(tz=timezone.utc))
-        await self.redis_cli.zadd(sessions_key, {refresh_token: current_time})
+    @staticmethod
+    def _now() -> float:
+        return datetime.timestamp(datetime.now(tz=timezone.utc))
 
-        if await self.redis_cli.zcard(sessions_key) > settings.MAX_SESSIONS:
-            await self.redis_cli.zremrangebyrank(sessions_key, 0, 0)
+    async def add_refresh_token(self, user_id: str, refresh_token: str):
+        await self._add_session(
+            keys=[f"sessions:{user_id}"],
+            args=[
+                refresh_token,
+                self._now(),
+                settings.MAX_SESSIONS,
+                settings.REDIS_SESSIONS_LIVE,
+            ],
+        )
 
-        await self.redis_cli.expire(sessions_key, settings.REDIS_SESSIONS_LIVE)
+    async def rotate_refresh_token(
+        self, user_id: str, old_refresh_token: str, new_refresh_token: str
+    ) -> bool:
+        """
+        Замена refresh_id сессии одной атомарной операцией. False, если старой
+        сессии нет: токен уже использован или сессия завершена
+        """
+        rotated = await self._rotate_session(
+            keys=[f"sessions:{user_id}"],
+            args=[
+                old_refresh_token,
+                new_refresh_token,
+                self._now(),
+                settings.MAX_SESSIONS,
+                settings.REDIS_SESSIONS_LIVE,
+            ],
+        )
+        return rotated == 1
 
     def get_refresh_tokens(self, user_id: str) -> list[str]:
         sessions_key = f"sessions:{user_id}"
         return self.redis_cli.zrange(sessions_key, 0, -1)
 
+    async def issue_otp(self, user_id: str, code: str):
+        key = f"{settings.REDIS_KEY_OPT}:{user_id}"
+        async with self.redis_cli.pipeline(transaction=True) as pipe:
+            pipe.set(key, code, ex=settings.OTP_TTL_S)
+            pipe.set(f"{key}:attempts", 0, ex=settings.OTP_TTL_S)
+            await pipe.execute()
+
+    async def verify_otp(self, user_id: str, code: str) -> int:
+        key = f"{settings.REDIS_KEY_OPT}:{user_id}"
+        return await self._verify_otp(
+            keys=[key, f"{key}:attempts"], args=[code, settings.OTP_MAX_ATTEMPTS]
+        )
+
+    @staticmethod
+    def _expired_before() -> float:
+        """Сессии с временем создания раньше этого момента уже истекли"""
+        return (
+            datetime.now(tz=timezone.utc)
+            - timedelta(minutes=settings.jwt_refresh_live_m)
+        ).timestamp()
+
     async def is_token_expired(self, user_id: str, refresh_token: str) -> bool:
         score = await self.redis_cli.zscore(f"sessions:{user_id}", refresh_token)
 
         if score is None:
             return True
 
-        return score < int(datetime.now(tz=timezone.utc).timestamp())
+        return score < self._expired_before()
 
     async def remove_expired_tokens(self, user_id: str):
         await self.redis_cli.zremrangebyscore(
-            f"sessions:{user_id}",
-            "-inf",
-            int(datetime.now(tz=timezone.utc).timestamp()),
+            f"sessions:{user_id}", "-inf", f"({self._expired_before()}"
         )
 
+    async def sweep_session_keys(self, keys: list) -> tuple[int, int]:
+        """
+        Удаление истекших сессий из ключей keys одним запросом.
+        Возвращает (удалено сессий, освобождено байт по MEMORY USAGE)
+        """
+        expired_before = f"({self._expired_before()}"
+        async with self.redis_cli.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.memory_usage(key)
+                pipe.zremrangebyscore(key, "-inf", expired_before)
+                pipe.memory_usage(key)
+            results = await pipe.execute()
+
+        removed, reclaimed = 0, 0
+        for before, count, after in zip(*[iter(results)] * 3):
+            if count:
+                removed += count
+                reclaimed += (before or 0) - (after or 0)
+        return removed, reclaimed
+
+    async def expire_stale_otp_keys(self, keys: list) -> int:
+        """TTL для ключей кода 2FA без срока жизни. Возвращает их число"""
+        async with self.redis_cli.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.ttl(key)
+            ttls = await pipe.execute()
+
+        stale = [key for key, ttl in zip(keys, ttls) if ttl == -1]
+        if stale:
+            async with self.redis_cli.pipeline(transaction=False) as pipe:
+                for key in stale:
+                    pipe.expire(key, settings.OTP_TTL_S)
+                await pipe.execute()
+        return len(stale)
+
     async def remove_token(self, user_id: str, refresh_token: str):
         """
         :param refresh_token: id refresh токена
         """
         await self.redis_cli.zrem(f"sessions:{user_id}", refresh_token)
 
+    async def revoke_access_token(self, token_hash: str, exp: float):
+        """
+        Отзыв access токена до его exp: ключ для шлюзов, которые подключатся
+        позже, и сообщение в канал для подписанных
+        """
+        ttl = int(exp - datetime.now(tz=timezone.utc).timestamp()) + 1
+        if ttl <= 0:
+            return
+        async with self.redis_cli.pipeline(transaction=False) as pipe:
+            pipe.set(f"{settings.REDIS_KEY_REVOKED}:{token_hash}", exp, ex=ttl)
+            pipe.publish(
+                settings.REDIS_REVOKED_CHANNEL,
+                json.dumps({"hash": token_hash, "exp": exp}),
+            )
+            await pipe.execute()
+
 
 redis_sessions_helper = RedisSessions(
     redis_cli=redis_client, session_prefix=settings.REDIS_KEY_SESSIONS
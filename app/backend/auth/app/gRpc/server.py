@@ -1,10 +1,15 @@
+import asyncio
 import grpc
 from common.schemas import BaseResponse
 from common.gRpc.auth import auth_pb2, auth_pb2_grpc
 from auth.exceptions.catch_errors import catch_errors
 from auth.app.logger import logger
 from auth.app import services, utils
+from auth.app.google_oauth import google_oauth
+from auth.app.passwords import password_hasher
+from auth.app.session_sweeper import session_sweeper
 from auth.Core.database_helper import async_database_helper
+from auth.Core.config import settings
 from grpc import RpcContext
 from auth.Core.redis_client import redis_client
 
@@ -13,23 +18,41 @@ class AuthServiceServicer(auth_pb2_grpc.AuthServiceServicer):
     @catch_errors(logger=logger, response_class=auth_pb2.CheckAccessResponse)
     async def CheckAccess(self, request, context: RpcContext):
         res: BaseResponse = await services.check_access(request.jwt_access)
-        response = utils.parse_response_pydantic_to_grpc(
-            response_pydantic=res, response_grpc=auth_pb2.CheckAccessResponse
+        payload: dict = res.detail["payload"]
+
+        return auth_pb2.CheckAccessResponse(
+            meta=utils.response_meta(res),
+            payload=auth_pb2.AccessPayload(
+                user_id=payload.get("user_id"),
+                iat=payload.get("iat"),
+                exp=payload.get("exp"),
+            ),
         )
 
-        return response
-
     @catch_errors(logger=logger, response_class=auth_pb2.GetNewTokensResponse)
     async def GetNewTokens(self, request, context: RpcContext):
         res: BaseResponse = await services.get_new_tokens(
             jwt_access=request.jwt_access, jwt_refresh=request.jwt_refresh
         )
 
-        response = utils.parse_response_pydantic_to_grpc(
-            response_pydantic=res, response_grpc=auth_pb2.GetNewTokensResponse
+        return auth_pb2.GetNewTokensResponse(
+            meta=utils.response_meta(res),
+            tokens=utils.tokens_to_grpc(res.detail["tokens"]),
+            user_id=res.detail["user_id"],
         )
 
-        return response
+    @catch_errors(logger=logger, response_class=auth_pb2.AuthenticateResponse)
+    async def Authenticate(self, request, context: RpcContext):
+        res: BaseResponse = await services.authenticate(
+            jwt_access=request.jwt_access, jwt_refresh=request.jwt_refresh
+        )
+        tokens: dict | None = res.detail.get("tokens")
+
+        return auth_pb2.AuthenticateResponse(
+            meta=auth_pb2.BaseResponse(status=res.status, message=res.message),
+            user_id=res.detail["user_id"],
+            tokens=utils.tokens_to_grpc(tokens),
+        )
 
     @catch_errors(logger=logger, response_class=auth_pb2.LoginResponse)
     async def Login(self, request, context):
@@ -38,14 +61,14 @@ class AuthServiceServicer(auth_pb2_grpc.AuthServiceServicer):
                 email=request.user_email,
                 password=request.password,
                 session=session,
-                redis_cli=redis_client,
             )
-            response = utils.parse_response_pydantic_to_grpc(
-                response_pydantic=res, response_grpc=auth_pb2.LoginResponse
+            return auth_pb2.LoginResponse(
+                meta=utils.response_meta(res),
+                tokens=utils.tokens_to_grpc(res.detail.get("tokens")),
+                two_factor=res.detail.get("2FA", False),
+                user_id=res.detail.get("user_id", ""),
             )
 
-            return response
-
     @catch_errors(logger=logger, response_class=auth_pb2.LogoutResponse)
     async def Logout(self, request, context):
         res: BaseResponse = await services.logout(
@@ -72,7 +95,7 @@ class AuthServiceServicer(auth_pb2_grpc.AuthServiceServicer):
     @catch_errors(logger=logger, response_class=auth_pb2.Verify2faResponse)
     async def Verify_2fa(self, request, context):
         res: BaseResponse = await services.verify_2fa(
-            user_id=request.user_id, otp_code=request.opt_code, redis_cli=redis_client
+            user_id=request.user_id, otp_code=request.opt_code
         )
         response = utils.parse_response_pydantic_to_grpc(
             response_pydantic=res, response_grpc=auth_pb2.Verify2faResponse
@@ -104,6 +127,12 @@ class AuthServiceServicer(auth_pb2_grpc.AuthServiceServicer):
 
         return response
 
+    async def GetPublicKeys(self, request, context):
+        return auth_pb2.GetPublicKeysResponse(
+            keys=[auth_pb2.PublicKey(**key) for key in utils.public_keys()],
+            max_age_s=settings.jwt_keys_max_age_s,
+        )
+
 
 async def serve():
     server = grpc.aio.server(
@@ -126,6 +155,20 @@ async def serve():
     )
     auth_pb2_grpc.add_AuthServiceServicer_to_server(AuthServiceServicer(), server)
     server.add_insecure_port("[::]:8001")
+    await password_hasher.start()
+    google_oauth.start()
     await server.start()
     logger.info("Сервер запущен")
-    await server.wait_for_termination()
+    pool_metrics_task = asyncio.create_task(
+        async_database_helper.report_pool_metrics(
+            logger=logger, interval_s=settings.POSTGRES_POOL_METRICS_INTERVAL_S
+        )
+    )
+    session_sweeper_task = asyncio.create_task(session_sweeper.run())
+    try:
+        await server.wait_for_termination()
+    finally:
+        pool_metrics_task.cancel()
+        session_sweeper_task.cancel()
+        password_hasher.shutdown()
+        await google_oauth.close()
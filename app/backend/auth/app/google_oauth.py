@@ -0,0 +1,145 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import grpc
+import httpx
+import jwt
+
+from auth.Core.config import settings
+from auth.app.logger import logger
+
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+
+
+class GoogleOAuth:
+    """
+    Google sign-in over one shared HTTP/2 client. The OIDC discovery document
+    and Google's signing keys are cached for metadata_max_age_s, so the
+    id_token from the code exchange is verified locally and the userinfo
+    request is only a fallback when Google returns no id_token.
+    """
+
+    def __init__(self, metadata_max_age_s: float, min_refresh_s: float):
+        self._metadata_max_age_s = metadata_max_age_s
+        self._min_refresh_s = min_refresh_s
+        self._client: Optional[httpx.AsyncClient] = None
+        self._discovery: Dict[str, Any] = {}
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(
+                    settings.OAUTH_HTTP_TIMEOUT_S,
+                    connect=settings.OAUTH_HTTP_CONNECT_TIMEOUT_S,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.OAUTH_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OAUTH_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.OAUTH_HTTP_KEEPALIVE_EXPIRY_S,
+                ),
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        self.start()
+        return self._client
+
+    async def _refresh(self, force: bool = False):
+        async with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if age < self._metadata_max_age_s and not force:
+                return
+            if age < self._min_refresh_s:
+                return
+            discovery_resp = await self.client.get(settings.GOOGLE_DISCOVERY_URL)
+            discovery_resp.raise_for_status()
+            discovery = discovery_resp.json()
+            jwks_resp = await self.client.get(discovery["jwks_uri"])
+            jwks_resp.raise_for_status()
+            keys = {
+                key.key_id: key
+                for key in jwt.PyJWKSet.from_dict(jwks_resp.json()).keys
+                if key.key_id
+            }
+            self._discovery, self._keys = discovery, keys
+            self._fetched_at = time.monotonic()
+            logger.info(f"Ключи Google обновлены: {list(keys)}")
+
+    async def _signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        await self._refresh()
+        if kid not in self._keys:
+            # Google сменил ключи раньше, чем истек кэш
+            await self._refresh(force=True)
+        if kid not in self._keys:
+            raise jwt.InvalidTokenError("Unknown Google key id")
+        return self._keys[kid]
+
+    async def exchange_code(self, code: str) -> dict:
+        """Обмен кода авторизации на токены Google"""
+        token_resp = await self.client.post(
+            settings.GOOGLE_TOKEN_URL,
+            data={
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": settings.GOOGLE_OAUTH_REDIRECT_URI,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+
+        token_data = token_resp.json()
+        if not token_data.get("access_token"):
+            raise grpc.RpcError("No access token")
+
+        return token_data
+
+    async def verify_id_token(self, id_token: str) -> dict:
+        header = jwt.get_unverified_header(id_token)
+        key = await self._signing_key(header.get("kid"))
+        claims = jwt.decode(
+            id_token,
+            key=key.key,
+            algorithms=[key.algorithm_name],
+            audience=settings.GOOGLE_CLIENT_ID,
+            issuer=GOOGLE_ISSUERS,
+            options={"require": ["exp", "iat", "iss", "aud", "sub"]},
+        )
+        if not claims.get("email") or not claims.get("email_verified"):
+            raise jwt.InvalidTokenError("Google account email is not verified")
+        return claims
+
+    async def get_user_info(self, access_token: str) -> dict:
+        userinfo_response = await self.client.get(
+            settings.GOOGLE_USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+
+        if userinfo_response.status_code != 200:
+            raise grpc.RpcError("Failed to fetch user info")
+
+        return userinfo_response.json()
+
+    async def user_info(self, token_data: dict) -> dict:
+        """Данные пользователя из id_token, без него - из userinfo"""
+        id_token = token_data.get("id_token")
+        if id_token:
+            return await self.verify_id_token(id_token)
+        logger.info(f"Google не вернул id_token, запрос userinfo")
+        return await self.get_user_info(token_data["access_token"])
+
+
+google_oauth = GoogleOAuth(
+    metadata_max_age_s=settings.GOOGLE_METADATA_MAX_AGE_S,
+    min_refresh_s=settings.GOOGLE_METADATA_MIN_REFRESH_S,
+)
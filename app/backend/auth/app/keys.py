@@ -0,0 +1,158 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+
+from auth.Core.config import settings
+from auth.app.logger import logger
+
+EC_ALGORITHMS = {"secp256r1": "ES256", "secp384r1": "ES384", "secp521r1": "ES512"}
+
+
+def algorithm_for(key: Any) -> str:
+    """Алгоритм подписи JWT по типу ключа"""
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return settings.jwt_algorithm
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        return EC_ALGORITHMS[key.curve.name]
+    if isinstance(
+        key,
+        (
+            ed25519.Ed25519PrivateKey,
+            ed25519.Ed25519PublicKey,
+            ed448.Ed448PrivateKey,
+            ed448.Ed448PublicKey,
+        ),
+    ):
+        return "EdDSA"
+    raise ValueError(f"Unsupported key type: {type(key).__name__}")
+
+
+def key_id(public_key: Any) -> str:
+    """kid ключа: отпечаток SHA-256 публичного ключа в DER"""
+    der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return hashlib.sha256(der).hexdigest()[:16]
+
+
+@dataclass
+class VerificationKey:
+    kid: str
+    alg: str
+    key: Any
+    pem: str
+
+
+class KeyManager:
+    """
+    Parsed JWT keys of the auth service. Files are re-read only when their
+    mtime changes, checked at most once per check_interval_s.
+
+    The private key signs new tokens. Every configured public key verifies
+    tokens, so during rotation the previous key stays in public_keys until
+    the tokens it signed expire.
+    """
+
+    def __init__(
+        self, private_key: Path, public_keys: List[Path], check_interval_s: float
+    ):
+        self._private_path = private_key
+        self._public_paths = public_keys
+        self._check_interval_s = check_interval_s
+        self._checked_at = float("-inf")
+        self._mtimes: Dict[Path, float] = {}
+        self._signing: Optional[Tuple[str, str, Any]] = None
+        self._verification: Dict[str, VerificationKey] = {}
+
+    def _current_mtimes(self) -> Dict[Path, float]:
+        return {
+            path: path.stat().st_mtime
+            for path in [self._private_path, *self._public_paths]
+            if path.exists()
+        }
+
+    def _load(self, mtimes: Dict[Path, float]):
+        verification: Dict[str, VerificationKey] = {}
+        for path in self._public_paths:
+            if path not in mtimes:
+                logger.warning(f"Публичный ключ {path} не найден")
+                continue
+            pem = path.read_bytes()
+            public_key = serialization.load_pem_public_key(pem)
+            kid = key_id(public_key)
+            verification[kid] = VerificationKey(
+                kid=kid, alg=algorithm_for(public_key), key=public_key, pem=pem.decode()
+            )
+
+        signing = None
+        if self._private_path in mtimes:
+            private_key = serialization.load_pem_private_key(
+                self._private_path.read_bytes(), password=None
+            )
+            public_key = private_key.public_key()
+            kid = key_id(public_key)
+            signing = (kid, algorithm_for(private_key), private_key)
+            if kid not in verification:
+                verification[kid] = VerificationKey(
+                    kid=kid,
+                    alg=signing[1],
+                    key=public_key,
+                    pem=public_key.public_bytes(
+                        encoding=serialization.Encoding.PEM,
+                        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+                    ).decode(),
+                )
+
+        self._signing, self._verification, self._mtimes = signing, verification, mtimes
+        logger.info(
+            f"Ключи JWT загружены: подпись {signing[0] if signing else None}, "
+            f"проверка {list(verification)}"
+        )
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < self._check_interval_s:
+            return
+        self._checked_at = now
+        mtimes = self._current_mtimes()
+        if mtimes == self._mtimes:
+            return
+        try:
+            self._load(mtimes)
+        except (OSError, ValueError) as e:
+            # Файл мог быть прочитан во время записи: остаются прежние ключи
+            logger.error(f"Не удалось загрузить ключи JWT: {e}")
+            if self._signing is None and not self._verification:
+                raise
+
+    def signing_key(self) -> Tuple[str, str, Any]:
+        """(kid, alg, private key) для выпуска токенов"""
+        self._refresh()
+        if self._signing is None:
+            raise ValueError("JWT private key is not configured")
+        return self._signing
+
+    def verification_keys(self, kid: Optional[str]) -> List[VerificationKey]:
+        """Ключи для проверки токена; без kid - все, для токенов до появления kid"""
+        self._refresh()
+        if kid is None:
+            return list(self._verification.values())
+        key = self._verification.get(kid)
+        return [key] if key else []
+
+    def public_keys(self) -> List[VerificationKey]:
+        self._refresh()
+        return list(self._verification.values())
+
+
+key_manager = KeyManager(
+    private_key=settings.jwt_private_key,
+    public_keys=[settings.jwt_public_key, *settings.jwt_previous_public_keys],
+    check_interval_s=settings.jwt_keys_check_interval_s,
+)
@@ -0,0 +1,78 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from auth.Core.config import settings
+from auth.app import utils
+from auth.app.logger import logger
+from auth.exceptions.exceptions import PasswordHasherBusy
+
+
+def _ping() -> None:
+    return None
+
+
+class PasswordHasher:
+    """
+    bcrypt in a process pool so hashing does not block the event loop.
+    At most max_pending operations are queued or running; beyond that calls
+    fail immediately with PasswordHasherBusy instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self._workers = workers
+        self._max_pending = max_pending
+        self._pending = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: форк процесса с работающим gRPC небезопасен
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def start(self):
+        """Запуск процессов заранее, чтобы первый вход не ждал их старта"""
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        await asyncio.gather(
+            *(loop.run_in_executor(pool, _ping) for _ in range(self._workers))
+        )
+
+    async def _run(self, func: Callable, *args) -> Any:
+        if self._pending >= self._max_pending:
+            raise PasswordHasherBusy("Too many password operations, retry later")
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor(), func, *args)
+        except BrokenProcessPool:
+            logger.error(
+                "Пул процессов bcrypt завершился аварийно, будет создан заново"
+            )
+            self._pool = None
+            raise
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(utils.hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(utils.verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
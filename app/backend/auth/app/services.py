@@ -1,12 +1,19 @@
 import random
 from urllib.parse import urlencode
-import httpx
+import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from redis import Redis
 from celery_workers.notifications import tasks
 from auth.app.crud import users_crud
-from auth.app.crud.redis_sessions import redis_sessions_helper
+from auth.app.crud.redis_sessions import (
+    OTP_ATTEMPTS_EXCEEDED,
+    OTP_EXPIRED,
+    OTP_VALID,
+    redis_sessions_helper,
+)
 from auth.app import utils
+from auth.app.google_oauth import google_oauth
+from auth.app.passwords import password_hasher
 from auth.app.logger import logger
 from auth.exceptions.exceptions import UserAlreadyExists, WeakPassword
 from auth.Core.config import settings
@@ -23,7 +30,7 @@ async def register(login: str, password: str, session: AsyncSession) -> BaseResp
     if len(check_user) != 0:
         raise UserAlreadyExists(f"User with login {login} already exist")
     logger.info(f"Пользователь не найден")
-    hash_pwd: str = utils.hash_password(password)
+    hash_pwd: str = await password_hasher.hash(password)
     email_verification_code: str = utils.get_email_verifi_code(login)
 
     new_user_data = {
@@ -48,9 +55,7 @@ async def register(login: str, password: str, session: AsyncSession) -> BaseResp
     )
 
 
-async def login(
-    email: str, password, session: AsyncSession, redis_cli: Redis
-) -> BaseResponse:
+async def login(email: str, password, session: AsyncSession) -> BaseResponse:
     logger.info(f"Try find user with email={email}...")
     user: list[Users] = await users_crud.get_users_by_filter(
         session=session, login=email
@@ -64,7 +69,7 @@ async def login(
 
     hash_pwd_user: str = user[0].password
 
-    if not utils.verify_password(
+    if not await password_hasher.verify(
         plain_password=password, hashed_password=hash_pwd_user
     ):
         raise WeakPassword("Invalid email or password")
@@ -79,8 +84,7 @@ async def login(
         user_id = str(user[0].id)
         logger.info(f"Add opt code and attempts in redis...")
 
-        await redis_cli.set(f"{settings.REDIS_KEY_OPT}:{user_id}", opt, ex=300)
-        await redis_cli.set(f"{settings.REDIS_KEY_OPT}:{user_id}:attempts", 0, ex=300)
+        await redis_sessions_helper.issue_otp(user_id=user_id, code=opt)
 
         logger.info(f"Add in redis success")
         logger.info(f"Sending email with code {opt} to {user[0].login}...")
@@ -116,6 +120,9 @@ async def logout(jwt_access: str, jwt_refresh: str) -> BaseResponse:
         user_id=access_payload.get("user_id"),
         refresh_token=refresh_payload.get("refresh_id"),
     )
+    await redis_sessions_helper.revoke_access_token(
+        token_hash=utils.token_hash(jwt_access), exp=access_payload["exp"]
+    )
     logger.info(f"Delete success!")
     return BaseResponse(status="success", message="User logout success.")
 
@@ -137,26 +144,13 @@ async def get_new_tokens(jwt_access: str, jwt_refresh: str) -> BaseResponse:
     refresh_payload: dict = utils.decode_tokens(jwt_refresh)
     logger.info(f"Decode success!")
 
-    logger.info(f"Getting user sessions...")
-    user_sessions: list[str] = await redis_sessions_helper.get_refresh_tokens(
-        user_id=access_payload.get("user_id")
-    )
-    logger.info(f"sessions:{user_sessions}")
-    logger.info(f"Success!")
-
-    if refresh_payload.get("refresh_id").encode() not in user_sessions:
-        raise Exception(f"User session not founded.")
-
-    logger.info(f"Remove refresh_id in user sessions...")
-    await redis_sessions_helper.remove_token(
+    logger.info(f"Rotating user session...")
+    new_tokens: dict | None = await utils.rotate_tokens(
         user_id=access_payload.get("user_id"),
-        refresh_token=refresh_payload.get("refresh_id"),
-    )
-    logger.info(f"Success!")
-    logger.info(f"Getting new pair of tokens...")
-    new_tokens: dict = await utils.generate_and_store_tokens(
-        user_id=access_payload.get("user_id")
+        refresh_id=refresh_payload.get("refresh_id"),
     )
+    if new_tokens is None:
+        raise Exception(f"User session not founded.")
     logger.info(f"Success!")
 
     return BaseResponse(
@@ -166,15 +160,35 @@ async def get_new_tokens(jwt_access: str, jwt_refresh: str) -> BaseResponse:
     )
 
 
-async def verify_2fa(user_id: str, otp_code: str, redis_cli: Redis) -> BaseResponse:
-    opt = await redis_cli.get(f"2fa:{user_id}")
+async def authenticate(jwt_access: str, jwt_refresh: str) -> BaseResponse:
+    """
+    Проверка access токена, а если он истек - обновление пары токенов
+    в том же вызове
+    """
+    logger.info(f"Decoding jwt access...")
+    try:
+        access_payload: dict = utils.decode_tokens(jwt_access)
+    except jwt.ExpiredSignatureError:
+        logger.info(f"Access токен истек, обновление токенов...")
+        return await get_new_tokens(jwt_access=jwt_access, jwt_refresh=jwt_refresh)
+    logger.info(f"Decode success!")
+    return BaseResponse(
+        status="success",
+        message="Access is allowed",
+        detail={"user_id": access_payload.get("user_id")},
+    )
+
+
+async def verify_2fa(user_id: str, otp_code: str) -> BaseResponse:
+    result = await redis_sessions_helper.verify_otp(user_id=user_id, code=otp_code)
 
-    if not opt or opt.decode() != otp_code:
+    if result == OTP_EXPIRED:
+        raise Exception("Verification code expired")
+    if result == OTP_ATTEMPTS_EXCEEDED:
+        raise Exception("Too many attempts, request a new code")
+    if result != OTP_VALID:
         raise Exception("Invalid verification code")
 
-    await redis_cli.delete(f"2fa:{user_id}")
-    await redis_cli.delete(f"2fa:{user_id}:attempts")
-
     tokens = await utils.generate_and_store_tokens(user_id)
 
     return BaseResponse(
@@ -207,45 +221,40 @@ async def get_google_auth_url() -> BaseResponse:
 async def handle_google_callback(
     session: AsyncSession, code: str, redis_cli: Redis
 ) -> BaseResponse:
-    async with httpx.AsyncClient() as client:
+    # 1. Получить токены
+    logger.info(f"Получение токенов от google")
+    token_data: dict = await google_oauth.exchange_code(code=code)
+
+    # 2. Данные пользователя из id_token
+    logger.info(f"Проверка id_token google")
+    user_info: dict = await google_oauth.user_info(token_data)
+    email = user_info["email"]
+    logger.info(f"userinfo: {user_info}")
+
+    # 3. Проверить есть ли пользователь
+    logger.info(f"Проверка на существование пользователя")
+    user = await users_crud.get_users_by_filter(session=session, login=email)
+    if len(user) == 0:
+        logger.info(f"Пользователь не найден")
+        user = await users_crud.create_user(
+            session=session,
+            login=email,
+            auth_provider=AuthProvider.google,
+            is_active=True,
+        )
 
-        # 1. Получить access_token
-        logger.info(f"Получение access_token от google")
-        token: str = await utils.get_google_tokens(code=code, client=client)
-        logger.info(f"access_token_google: {token}")
+    else:
+        user = user[0]
 
-        # 2. Получить userinfo
-        logger.info(f"Получение userinfo от google")
-        user_info: dict = await utils.get_google_user_info(
-            access_token=token, client=client
-        )
-        email = user_info["email"]
-        logger.info(f"userinfo: {user_info}")
-
-        # 3. Проверить есть ли пользователь
-        logger.info(f"Проверка на существование пользователя")
-        user = await users_crud.get_users_by_filter(session=session, login=email)
-        if len(user) == 0:
-            logger.info(f"Пользователь не найден")
-            user = await users_crud.create_user(
-                session=session,
-                login=email,
-                auth_provider=AuthProvider.google,
-                is_active=True,
-            )
-
-        else:
-            user = user[0]
-
-        # 4. Сгенерировать токены и сохранить refresh в redis
-        logger.info(f"Генерация токенов")
-        tokens = await utils.generate_and_store_tokens(str(user.id))
-        logger.info(f"Токены: {tokens}")
-
-        # 5. Отдать токены и редирект ссылку
-        response = BaseResponse(
-            status="success",
-            message="User login grom google success!",
-            detail={"tokens": tokens, "redirect_url": None},
-        )
-        return response
+    # 4. Сгенерировать токены и сохранить refresh в redis
+    logger.info(f"Генерация токенов")
+    tokens = await utils.generate_and_store_tokens(str(user.id))
+    logger.info(f"Токены: {tokens}")
+
+    # 5. Отдать токены и редирект ссылку
+    response = BaseResponse(
+        status="success",
+        message="User login grom google success!",
+        detail={"tokens": tokens, "redirect_url": None},
+    )
+    return response
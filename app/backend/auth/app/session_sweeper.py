@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+from auth.Core.config import settings
+from auth.app.crud.redis_sessions import RedisSessions, redis_sessions_helper
+from auth.app.logger import logger
+
+
+class SessionSweeper:
+    """
+    Periodically trims expired refresh ids from every sessions:{user_id} key
+    and gives a TTL to 2FA keys left without one. Keys are walked with SCAN in
+    batches of batch_size, each batch is one pipeline, and the walk is paced
+    to at most max_keys_per_s keys so Redis keeps serving other clients.
+    """
+
+    def __init__(
+        self,
+        sessions: RedisSessions,
+        interval_s: float,
+        batch_size: int,
+        max_keys_per_s: int,
+    ):
+        self.sessions = sessions
+        self.interval_s = interval_s
+        self.batch_size = batch_size
+        self.max_keys_per_s = max_keys_per_s
+
+    async def _batches(self, match: str):
+        batch: list = []
+        async for key in self.sessions.redis_cli.scan_iter(
+            match=match, count=self.batch_size
+        ):
+            batch.append(key)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _pace(self, started: float, keys: int):
+        delay = keys / self.max_keys_per_s - (time.monotonic() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def sweep(self) -> dict:
+        """Один проход по всем ключам сессий и кодов 2FA"""
+        started = time.monotonic()
+        stats = {"keys": 0, "removed": 0, "reclaimed_bytes": 0, "otp_expired": 0}
+
+        async for batch in self._batches("sessions:*"):
+            batch_started = time.monotonic()
+            removed, reclaimed = await self.sessions.sweep_session_keys(batch)
+            stats["keys"] += len(batch)
+            stats["removed"] += removed
+            stats["reclaimed_bytes"] += reclaimed
+            await self._pace(batch_started, len(batch))
+
+        async for batch in self._batches(f"{settings.REDIS_KEY_OPT}:*"):
+            batch_started = time.monotonic()
+            stats["otp_expired"] += await self.sessions.expire_stale_otp_keys(batch)
+            stats["keys"] += len(batch)
+            await self._pace(batch_started, len(batch))
+
+        stats["duration_s"] = round(time.monotonic() - started, 3)
+        return stats
+
+    async def run(self):
+        while True:
+            try:
+                stats = await self.sweep()
+                logger.info(
+                    f"Очистка сессий: ключей {stats['keys']}, "
+                    f"удалено сессий {stats['removed']}, "
+                    f"освобождено {stats['reclaimed_bytes']} байт, "
+                    f"TTL кодам 2FA {stats['otp_expired']}, "
+                    f"за {stats['duration_s']} с"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Очистка сессий прервана: {e}")
+            await asyncio.sleep(self.interval_s)
+
+
+session_sweeper = SessionSweeper(
+    sessions=redis_sessions_helper,
+    interval_s=settings.SESSION_SWEEP_INTERVAL_S,
+    batch_size=settings.SESSION_SWEEP_BATCH,
+    max_keys_per_s=settings.SESSION_SWEEP_MAX_KEYS_PER_S,
+)
@@ -1,14 +1,13 @@
 import json
 from typing import Any
-import httpx
 import bcrypt
 import hashlib
 import time
 import uuid
 from datetime import datetime, timezone, timedelta
-import grpc
 import jwt
 from auth.Core.config import settings
+from auth.app.keys import key_manager
 from auth.app.crud.redis_sessions import redis_sessions_helper
 from auth.app.logger import logger
 from common.gRpc.auth import auth_pb2
@@ -42,16 +41,31 @@ def create_jwt_token(
         "iat": datetime.now(tz=timezone.utc).timestamp(),
         "exp": (datetime.now(tz=timezone.utc) + timedelta(minutes=live)).timestamp(),
     }
-    private_key = settings.jwt_private_key.read_text()
+    kid, algorithm, private_key = key_manager.signing_key()
 
     return jwt.encode(
         payload=payload,
         key=private_key,
-        algorithm=settings.jwt_algorithm,
+        algorithm=algorithm,
+        headers={"kid": kid},
     )
 
 
-async def generate_and_store_tokens(user_id: str) -> dict:
+def token_hash(token: str) -> str:
+    """Идентификатор токена в кэше шлюза и списке отозванных"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def public_keys() -> list[dict]:
+    """Набор публичных ключей для проверки токенов на стороне других сервисов"""
+    return [
+        {"kid": key.kid, "alg": key.alg, "pem": key.pem}
+        for key in key_manager.public_keys()
+    ]
+
+
+def create_tokens(user_id: str) -> tuple[dict, str]:
+    """Новая пара токенов и refresh_id сессии"""
     refresh_id = str(uuid.uuid4())
     tokens = {
         "jwt_access": create_jwt_token(
@@ -61,6 +75,11 @@ async def generate_and_store_tokens(user_id: str) -> dict:
             live=settings.jwt_refresh_live_m, refresh_id=refresh_id
         ),
     }
+    return tokens, refresh_id
+
+
+async def generate_and_store_tokens(user_id: str) -> dict:
+    tokens, refresh_id = create_tokens(user_id)
     logger.info(f"Push refresh token in redis...")
     await redis_sessions_helper.add_refresh_token(
         user_id=user_id, refresh_token=refresh_id
@@ -70,14 +89,35 @@ async def generate_and_store_tokens(user_id: str) -> dict:
     return tokens
 
 
+async def rotate_tokens(user_id: str, refresh_id: str) -> dict | None:
+    """Новая пара токенов вместо сессии refresh_id; None, если сессии нет"""
+    tokens, new_refresh_id = create_tokens(user_id)
+    if not await redis_sessions_helper.rotate_refresh_token(
+        user_id=user_id,
+        old_refresh_token=refresh_id,
+        new_refresh_token=new_refresh_id,
+    ):
+        return None
+    return tokens
+
+
 def decode_tokens(token: str, verify_exp: bool = True) -> dict:
-    public_key = settings.jwt_public_key.read_text()
-    return jwt.decode(
-        jwt=token,
-        key=public_key,
-        algorithms=settings.jwt_algorithm,
-        options={"verify_exp": verify_exp},
-    )
+    keys = key_manager.verification_keys(jwt.get_unverified_header(token).get("kid"))
+    if not keys:
+        raise jwt.InvalidTokenError("Unknown key id")
+
+    error: jwt.InvalidTokenError = jwt.InvalidSignatureError()
+    for key in keys:
+        try:
+            return jwt.decode(
+                jwt=token,
+                key=key.key,
+                algorithms=[key.alg],
+                options={"verify_exp": verify_exp},
+            )
+        except jwt.InvalidSignatureError as e:
+            error = e
+    raise error
 
 
 def parse_detail_values_to_json(
@@ -93,48 +133,24 @@ def parse_detail_values_to_json(
     return meta
 
 
-def parse_response_pydantic_to_grpc(response_pydantic, response_grpc):
-    meta = auth_pb2.BaseResponse(
+def response_meta(response_pydantic) -> auth_pb2.BaseResponse:
+    """meta без detail для ответов, где данные переданы типизированными полями"""
+    return auth_pb2.BaseResponse(
         status=response_pydantic.status,
         message=response_pydantic.message,
     )
 
-    meta = parse_detail_values_to_json(detail=response_pydantic.detail, meta=meta)
-
-    return response_grpc(meta=meta)
-
-
-async def get_google_tokens(code: str, client: httpx.AsyncClient) -> str:
-    # Обмен кода на токен
-    token_resp = await client.post(
-        settings.GOOGLE_TOKEN_URL,
-        data={
-            "client_id": settings.GOOGLE_CLIENT_ID,
-            "client_secret": settings.GOOGLE_CLIENT_SECRET,
-            "code": code,
-            "grant_type": "authorization_code",
-            "redirect_uri": settings.GOOGLE_OAUTH_REDIRECT_URI,
-        },
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-    )
-
-    token_data = token_resp.json()
-    access_token = token_data.get("access_token")
-    if not access_token:
-        raise grpc.RpcError("No access token")
 
-    return access_token
+def tokens_to_grpc(tokens: dict | None) -> auth_pb2.Tokens | None:
+    return auth_pb2.Tokens(**tokens) if tokens else None
 
 
-async def get_google_user_info(access_token: str, client: httpx.AsyncClient) -> dict:
-    userinfo_response = await client.get(
-        settings.GOOGLE_USERINFO_URL,
-        headers={"Authorization": f"Bearer {access_token}"},
+def parse_response_pydantic_to_grpc(response_pydantic, response_grpc):
+    meta = auth_pb2.BaseResponse(
+        status=response_pydantic.status,
+        message=response_pydantic.message,
     )
 
-    if userinfo_response.status_code != 200:
-        raise grpc.RpcError("Failed to fetch user info")
-
-    userinfo = userinfo_response.json()
+    meta = parse_detail_values_to_json(detail=response_pydantic.detail, meta=meta)
 
-    return userinfo
+    return response_grpc(meta=meta)
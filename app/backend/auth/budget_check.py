@@ -0,0 +1,177 @@
+"""
+Бюджет запросов к БД и времени для методов AuthServiceServicer.
+
+Создает тестового пользователя внутри транзакции, вызывает методы сервиса по
+сценарию входа и сравнивает число SQL запросов и время каждого вызова с
+BUDGETS. В конце транзакция откатывается. Письма не отправляются, обмен
+кода Google заменяется ответом в памяти, Redis используется настоящий.
+Ошибку сборки дает только число запросов, max_ms - ориентир, превышение
+которого помечается в отчете.
+
+Запуск на локальном окружении (Postgres после `alembic upgrade head`, Redis):
+    PYTHONPATH=app/backend python -m auth.budget_check
+
+В сборке (ненулевой код при превышении бюджета):
+    docker compose --profile ci run --rm auth_budget_check
+"""
+
+import asyncio
+import sys
+import uuid
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from auth.app import utils
+from auth.app.crud.redis_sessions import redis_sessions_helper
+from auth.app.gRpc.server import AuthServiceServicer
+from auth.app.google_oauth import google_oauth
+from auth.app.passwords import password_hasher
+from auth.Core.database_helper import async_database_helper
+from celery_workers.notifications import tasks
+from common.gRpc.auth import auth_pb2
+from common.Metrics.query_budget import (
+    Budget,
+    BudgetContext,
+    report,
+    rolled_back,
+    run_budgets,
+)
+
+SEED_LOGIN = "budget-check@novafin.local"
+SEED_PASSWORD = "budget-check-password"
+SEED_OTP = "123456"
+
+# Login и Registrate считают bcrypt (cost 8) в пуле процессов: ~11 мс на
+# проверку на одном ядре разработчика, запас на медленные раннеры CI
+BUDGETS: Dict[str, Budget] = {
+    "Login": Budget(max_queries=1, max_ms=250),
+    "Verify_2fa": Budget(max_queries=0, max_ms=100),
+    "CheckAccess": Budget(max_queries=0, max_ms=100),
+    "GetNewTokens": Budget(max_queries=0, max_ms=100),
+    "Authenticate": Budget(max_queries=0, max_ms=100),
+    "Logout": Budget(max_queries=0, max_ms=100),
+    # SELECT на существование, INSERT и refresh созданного пользователя
+    "Registrate": Budget(max_queries=3, max_ms=250),
+    "GetPublicKeys": Budget(max_queries=0, max_ms=100),
+    "Get_google_auth_url": Budget(max_queries=0, max_ms=100),
+    # Первый вход через Google: поиск пользователя и создание нового
+    "Handle_google_callback": Budget(max_queries=3, max_ms=200),
+}
+
+
+async def _exchange_code(code: str) -> dict:
+    return {"access_token": f"budget-check-{code}", "id_token": code}
+
+
+async def _user_info(token_data: dict) -> dict:
+    return {"email": f"{token_data['id_token']}@novafin.local", "email_verified": True}
+
+
+async def seed(conn: AsyncConnection) -> str:
+    user_id = (
+        await conn.execute(
+            text(
+                """
+                INSERT INTO "Users" (login, password, is_active, two_factor_enabled, auth_provider)
+                VALUES (:login, :password, true, false, 'local')
+                RETURNING id
+                """
+            ),
+            {"login": SEED_LOGIN, "password": utils.hash_password(SEED_PASSWORD)},
+        )
+    ).scalar_one()
+    # Код 2FA, который проверяет Verify_2fa
+    await redis_sessions_helper.issue_otp(user_id=str(user_id), code=SEED_OTP)
+    return str(user_id)
+
+
+def cases(user_id: str):
+    servicer = AuthServiceServicer()
+    context = BudgetContext()
+    tokens: Dict[str, str] = {}
+
+    async def call(method, request):
+        response = await method(request, context)
+        # У GetPublicKeysResponse нет meta
+        meta = getattr(response, "meta", None)
+        if meta is not None and meta.status != "success":
+            raise RuntimeError(meta.message)
+        issued = getattr(response, "tokens", None)
+        if issued is not None and issued.jwt_access:
+            tokens.update(jwt_access=issued.jwt_access, jwt_refresh=issued.jwt_refresh)
+        return response
+
+    calls = {
+        "Login": lambda: call(
+            servicer.Login,
+            auth_pb2.LoginRequest(user_email=SEED_LOGIN, password=SEED_PASSWORD),
+        ),
+        "Verify_2fa": lambda: call(
+            servicer.Verify_2fa,
+            auth_pb2.Verify2faRequest(user_id=user_id, opt_code=SEED_OTP),
+        ),
+        "CheckAccess": lambda: call(
+            servicer.CheckAccess,
+            auth_pb2.CheckAccessRequest(jwt_access=tokens["jwt_access"]),
+        ),
+        "GetNewTokens": lambda: call(
+            servicer.GetNewTokens,
+            auth_pb2.GetNewTokensRequest(
+                jwt_access=tokens["jwt_access"], jwt_refresh=tokens["jwt_refresh"]
+            ),
+        ),
+        "Authenticate": lambda: call(
+            servicer.Authenticate,
+            auth_pb2.AuthenticateRequest(
+                jwt_access=tokens["jwt_access"], jwt_refresh=tokens["jwt_refresh"]
+            ),
+        ),
+        "Logout": lambda: call(
+            servicer.Logout,
+            auth_pb2.LogoutRequest(
+                jwt_access=tokens["jwt_access"], jwt_refresh=tokens["jwt_refresh"]
+            ),
+        ),
+        "Registrate": lambda: call(
+            servicer.Registrate,
+            auth_pb2.RegistrateRequest(
+                login=f"budget-check-{uuid.uuid4()}@novafin.local",
+                password=SEED_PASSWORD,
+            ),
+        ),
+        "GetPublicKeys": lambda: call(
+            servicer.GetPublicKeys, auth_pb2.GetPublicKeysRequest()
+        ),
+        "Get_google_auth_url": lambda: call(
+            servicer.Get_google_auth_url, auth_pb2.GetGoogleAuthUrlRequest()
+        ),
+        "Handle_google_callback": lambda: call(
+            servicer.Handle_google_callback,
+            auth_pb2.HandleGoogleCallbackRequest(code=f"budget-check-{uuid.uuid4()}"),
+        ),
+    }
+    return [(name, BUDGETS[name], method) for name, method in calls.items()]
+
+
+async def main() -> int:
+    delay = tasks.send_verification_email.delay
+    tasks.send_verification_email.delay = lambda *args, **kwargs: None
+    google_oauth.exchange_code, google_oauth.user_info = _exchange_code, _user_info
+    # Процессы bcrypt запускаются заранее, как в serve(), а не в первом Login
+    await password_hasher.start()
+    try:
+        async with rolled_back(async_database_helper) as conn:
+            user_id = await seed(conn)
+            results = await run_budgets(async_database_helper, cases(user_id))
+    finally:
+        tasks.send_verification_email.delay = delay
+        del google_oauth.exchange_code, google_oauth.user_info
+        password_hasher.shutdown()
+        await async_database_helper.engine.dispose()
+    return report(results)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -14,3 +14,9 @@ class WeakPassword(AuthError):
     """Пароль не удовлетворяет требованиям"""
 
     pass
+
+
+class PasswordHasherBusy(AuthError):
+    """Очередь хеширования паролей заполнена"""
+
+    pass
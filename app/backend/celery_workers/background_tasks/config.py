@@ -3,6 +3,15 @@ from common.Core.config import Postgres
 
 
 class Settings(Postgres):
+    POSTGRES_POOL_PROFILE: str = "small"
+    # Каталог архива должен быть постоянным томом (см. docker-compose.yaml)
+    ARCHIVE_DIR: str = "/var/lib/novafin/archive"
+    # Удалять партицию после проверенной выгрузки; False - только отсоединять
+    ARCHIVE_DROP_PARTITIONS: bool = True
+    ARCHIVE_BATCH_SIZE: int = 10000
+    PARTITIONS_AHEAD_MONTHS: int = 3
+    PARTITIONS_RETENTION_MONTHS: int = 12
+
     model_config = SettingsConfigDict(extra="ignore")
 
 
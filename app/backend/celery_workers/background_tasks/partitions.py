@@ -0,0 +1,227 @@
+import os
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+from celery_workers.background_tasks.async_database_helper import async_database_helper
+from celery_workers.background_tasks.config import settings
+from celery_workers.background_tasks.logger import logger
+
+PARTITION_NAME = re.compile(r"^wallet_transactions_p(\d{4})(\d{2})$")
+
+# Ключ advisory lock обслуживания: задачу ставит в очередь каждая реплика wallet_service
+MAINTENANCE_LOCK = "wallet_transactions_partitions"
+
+# Колонки архива: перечисления и UUID сохраняются строками
+ARCHIVE_COLUMNS = [
+    ("id", "int64"),
+    ("user_id", "int64"),
+    ("currency", "string"),
+    ("from_currency", "string"),
+    ("to_currency", "string"),
+    ("amount", "decimal"),
+    ("operation_type", "string"),
+    ("status", "string"),
+    ("date", "timestamp"),
+    ("correlation_id", "string"),
+    ("external_id", "string"),
+    ("idempotency_key", "string"),
+    ("payment_worker", "string"),
+    ("wallet_id", "int64"),
+    ("to_wallet_id", "int64"),
+    ("from_wallet_id", "int64"),
+]
+
+
+def _archive_schema():
+    import pyarrow as pa
+
+    types = {
+        "int64": pa.int64(),
+        "string": pa.string(),
+        "decimal": pa.decimal128(18, 2),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in ARCHIVE_COLUMNS])
+
+
+def _select_partition(partition: str) -> str:
+    columns = ", ".join(
+        f"{name}::text AS {name}" if kind == "string" else name
+        for name, kind in ARCHIVE_COLUMNS
+    )
+    return f'SELECT {columns} FROM "{partition}" ORDER BY date, id'
+
+
+def _retention_cutoff() -> date:
+    """Первый месяц, партиции которого остаются в базе"""
+    today = datetime.now(timezone.utc).date()
+    months = today.year * 12 + today.month - 1 - settings.PARTITIONS_RETENTION_MONTHS
+    return date(months // 12, months % 12 + 1, 1)
+
+
+async def ensure_partitions():
+    async with async_database_helper.engine.begin() as conn:
+        await conn.execute(
+            text("SELECT wallet_transactions_ensure_partitions(:ahead)"),
+            {"ahead": settings.PARTITIONS_AHEAD_MONTHS},
+        )
+    logger.info(
+        f"Партиции wallet_transactions созданы на {settings.PARTITIONS_AHEAD_MONTHS} мес. вперед"
+    )
+
+
+async def _expired_partitions() -> List[Tuple[str, bool]]:
+    """
+    Партиции старше срока хранения: (имя, подключена ли к wallet_transactions).
+    Отсоединенные, но не удаленные таблицы остаются после прерванного архивирования.
+    """
+    async with async_database_helper.engine.connect() as conn:
+        rows = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT c.relname, i.inhrelid IS NOT NULL AS attached
+                    FROM pg_class c
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+                    WHERE c.relkind = 'r'
+                      AND n.nspname = current_schema()
+                      AND c.relname LIKE 'wallet_transactions_p%'
+                    """
+                )
+            )
+        ).all()
+
+    cutoff = _retention_cutoff()
+    expired = []
+    for name, attached in rows:
+        match = PARTITION_NAME.match(name)
+        if match and date(int(match[1]), int(match[2]), 1) < cutoff:
+            expired.append((name, attached))
+    return sorted(expired)
+
+
+def _fsync(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+async def _partition_rows(partition: str) -> int:
+    async with async_database_helper.engine.connect() as conn:
+        return (
+            await conn.execute(text(f'SELECT count(*) FROM "{partition}"'))
+        ).scalar_one()
+
+
+async def archive_partition(partition: str) -> Tuple[Path, int]:
+    """
+    Выгрузка отсоединенной партиции в Parquet (zstd).
+    Строки читаются серверным курсором пачками по ARCHIVE_BATCH_SIZE,
+    файл появляется под итоговым именем только после полной записи и fsync.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    archive_dir = Path(settings.ARCHIVE_DIR)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{partition}.parquet"
+    tmp_path = archive_dir / f"{partition}.parquet.tmp"
+
+    schema = _archive_schema()
+    rows = 0
+    with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+        async with async_database_helper.engine.connect() as conn:
+            result = await conn.stream(
+                text(_select_partition(partition)).execution_options(
+                    yield_per=settings.ARCHIVE_BATCH_SIZE
+                )
+            )
+            async for batch in result.mappings().partitions():
+                writer.write_table(
+                    pa.Table.from_pylist([dict(row) for row in batch], schema=schema)
+                )
+                rows += len(batch)
+    _fsync(tmp_path)
+    os.replace(tmp_path, path)
+    # Переименование сохраняется на диске только после fsync каталога
+    _fsync(archive_dir)
+
+    logger.info(f"Партиция {partition} выгружена в {path}, строк: {rows}")
+    return path, rows
+
+
+async def _verify_archive(partition: str, path: Path, written: int) -> bool:
+    """Число строк в файле, прочитанное заново, совпадает с партицией в базе"""
+    import pyarrow.parquet as pq
+
+    in_file = pq.read_metadata(path).num_rows
+    in_table = await _partition_rows(partition)
+    if in_file == written == in_table:
+        return True
+    logger.error(
+        f"Архив {path} не совпадает с партицией {partition}: "
+        f"в файле {in_file}, записано {written}, в таблице {in_table}"
+    )
+    return False
+
+
+async def archive_old_partitions():
+    for partition, attached in await _expired_partitions():
+        if attached:
+            async with async_database_helper.engine.begin() as conn:
+                await conn.execute(
+                    text(
+                        f'ALTER TABLE wallet_transactions DETACH PARTITION "{partition}"'
+                    )
+                )
+            logger.info(f"Партиция {partition} отсоединена")
+
+        path, rows = await archive_partition(partition)
+
+        if not settings.ARCHIVE_DROP_PARTITIONS:
+            logger.info(f"Партиция {partition} оставлена отсоединенной")
+            continue
+        if not await _verify_archive(partition, path, rows):
+            # Таблица остается отсоединенной, следующий запуск выгрузит ее заново
+            continue
+
+        async with async_database_helper.engine.begin() as conn:
+            await conn.execute(text(f'DROP TABLE "{partition}"'))
+        logger.info(f"Партиция {partition} удалена")
+
+
+async def maintain_partitions() -> bool:
+    """
+    Создание будущих и архивирование устаревших партиций под advisory lock.
+    Если обслуживание уже идет в другом процессе, запуск пропускается: иначе два
+    запуска пишут один .tmp файл или удаляют партицию, которую другой еще выгружает.
+    """
+    async with async_database_helper.engine.connect() as lock_conn:
+        locked = (
+            await lock_conn.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:key))"),
+                {"key": MAINTENANCE_LOCK},
+            )
+        ).scalar_one()
+        await lock_conn.commit()
+        if not locked:
+            logger.info("Обслуживание партиций уже выполняется, запуск пропущен")
+            return False
+
+        try:
+            await ensure_partitions()
+            await archive_old_partitions()
+        finally:
+            await lock_conn.execute(
+                text("SELECT pg_advisory_unlock(hashtext(:key))"),
+                {"key": MAINTENANCE_LOCK},
+            )
+            await lock_conn.commit()
+    return True
@@ -1,3 +1,4 @@
+from celery_workers.background_tasks import partitions
 from celery_workers.background_tasks import utils
 from celery_workers.background_tasks.app import celery_app
 import asyncio
@@ -25,3 +26,28 @@ def update_currencies(self):
     # Запускаем асинхронный код в event loop
     loop = asyncio.get_event_loop()
     return loop.run_until_complete(_async_update())
+
+
+@celery_app.task(
+    name="maintain_transaction_partitions",
+    ignore_result=True,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 60},
+    bind=True,
+)
+def maintain_transaction_partitions(self):
+    """
+    Создание партиций wallet_transactions на следующие месяцы
+    и архивирование устаревших
+    """
+
+    async def _async_maintain():
+        try:
+            if not await partitions.maintain_partitions():
+                return "Partitions are maintained by another worker"
+            return "Partitions maintained successfully"
+        except Exception as e:
+            self.retry(exc=e)
+
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(_async_maintain())
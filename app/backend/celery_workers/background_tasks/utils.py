@@ -25,33 +25,18 @@ async def fetch_cbr_rates():
                 continue
 
     async with async_database_helper.session_factory() as session:
-        for currency, rate_to_rub in rates.items():
-            if not isinstance(currency, str):
-                continue
-            logger.info(f"To update: {currency}: {rate_to_rub}")
-            logger.info(f"Get Currency")
-            currency_list = await crud.get_by_filter(
-                session=session, model=Currency, code=ValuteCode(currency).value
-            )
-            if len(currency_list) == 0:
-                logger.info(f"Currency not founded\nCreate new Currency")
-                new_currency = await crud.create(
-                    session=session,
-                    model=Currency,
-                    code=ValuteCode(currency),
-                    rate_to_base=rate_to_rub,
-                )
-                logger.info(f"Currency created")
-                continue
-
-            logger.info(f"Currency founded\nUpdate Currency")
-            await crud.update_by_id(
-                session=session,
-                model=Currency,
-                object_id=currency_list[0].id,
-                rate_to_base=rate_to_rub,
-            )
-            logger.info(f"Currency updated")
+        # Один INSERT ... ON CONFLICT вместо SELECT и INSERT/UPDATE на каждую валюту
+        currencies = await crud.upsert_many(
+            session=session,
+            model=Currency,
+            rows=[
+                {"code": ValuteCode(currency), "rate_to_base": rate_to_rub}
+                for currency, rate_to_rub in rates.items()
+            ],
+            conflict_cols=["code"],
+            update_cols=["rate_to_base"],
+        )
         await session.commit()
+        logger.info(f"Currencies upserted: {len(currencies)}")
 
     logger.info(f"===CBR rates updated {rates} ===")
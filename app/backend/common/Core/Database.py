@@ -1,13 +1,197 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+    async_sessionmaker,
+)
+
+from common.Core.config import PoolProfile, Postgres
+from common.Metrics.pool import InstrumentedQueuePool, PoolMetrics
+
+logger = logging.getLogger(__name__)
+
+# Отставание реплики: 0, если все полученные WAL уже применены,
+# иначе время с момента последней примененной транзакции
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def create_engine(
+    url: str, echo: bool, pool: Optional[PoolProfile] = None
+) -> AsyncEngine:
+    """Engine с параметрами пула из профиля; без профиля - настройки SQLAlchemy по умолчанию"""
+    if pool is None:
+        return create_async_engine(url=url, echo=echo)
+
+    connect_args = {"prepared_statement_cache_size": pool.statement_cache_size}
+    if pool.pgbouncer:
+        # Собственный кэш asyncpg тоже отключается, а имена выражений делаются
+        # уникальными, чтобы не пересекаться на общем серверном соединении
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+
+    return create_async_engine(
+        url=url,
+        echo=echo,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool.pool_size,
+        max_overflow=pool.max_overflow,
+        pool_timeout=pool.pool_timeout,
+        pool_pre_ping=pool.pool_pre_ping,
+        pool_recycle=pool.pool_recycle,
+        connect_args=connect_args,
+    )
+
+
+class Replica:
+    """Read replica engine with the last measured lag and probe latency."""
+
+    def __init__(self, url: str, echo: bool, pool: Optional[PoolProfile] = None):
+        self.engine: AsyncEngine = create_engine(url=url, echo=echo, pool=pool)
+        self.lag_s: float = math.inf
+        self.latency_s: float = math.inf
+        self.probed_at: float = -math.inf
+
+    async def _lag(self) -> float:
+        async with self.engine.connect() as conn:
+            return (await conn.execute(REPLICA_LAG_SQL)).scalar()
+
+    async def probe(self, timeout_s: float):
+        started = time.perf_counter()
+        try:
+            lag = await asyncio.wait_for(self._lag(), timeout=timeout_s)
+            self.lag_s = float(lag or 0)
+            self.latency_s = time.perf_counter() - started
+        except Exception as e:
+            logger.warning(f"Реплика {self.engine.url.host} недоступна: {str(e)}")
+            self.lag_s = math.inf
+            self.latency_s = math.inf
+        self.probed_at = time.monotonic()
 
 
 class Database:
-    def __init__(self, url, echo):
-        self.engine = create_async_engine(url=url, echo=echo)
+    ROUND_ROBIN = "round_robin"
+    LEAST_LATENCY = "least_latency"
+
+    def __init__(
+        self,
+        url,
+        echo,
+        replica_urls: Sequence[str] = (),
+        replica_strategy: str = ROUND_ROBIN,
+        replica_max_lag_s: float = 5.0,
+        replica_probe_interval_s: float = 5.0,
+        pool: Optional[PoolProfile] = None,
+    ):
+        self.engine = create_engine(url=url, echo=echo, pool=pool)
         self.session_factory = async_sessionmaker(
             bind=self.engine, autoflush=False, autocommit=False
         )
 
+        if replica_strategy not in (self.ROUND_ROBIN, self.LEAST_LATENCY):
+            raise ValueError(
+                f"Неизвестная стратегия выбора реплики: {replica_strategy}"
+            )
+        self.replicas: List[Replica] = [Replica(u, echo, pool) for u in replica_urls]
+        self.replica_strategy = replica_strategy
+        self.replica_max_lag_s = replica_max_lag_s
+        self.replica_probe_interval_s = replica_probe_interval_s
+        self._round_robin = itertools.count()
+
+        self.pool_metrics: Dict[str, PoolMetrics] = {
+            "primary": PoolMetrics("primary").attach(self.engine)
+        }
+        for replica in self.replicas:
+            name = f"replica {replica.engine.url.host}:{replica.engine.url.port}"
+            self.pool_metrics[name] = PoolMetrics(name).attach(replica.engine)
+
+    @classmethod
+    def from_settings(cls, settings: Postgres, echo: bool = False) -> "Database":
+        return cls(
+            url=settings.postgres_url,
+            echo=echo,
+            replica_urls=settings.postgres_replica_urls,
+            replica_strategy=settings.POSTGRES_REPLICA_STRATEGY,
+            replica_max_lag_s=settings.POSTGRES_REPLICA_MAX_LAG_S,
+            replica_probe_interval_s=settings.POSTGRES_REPLICA_PROBE_INTERVAL_S,
+            pool=settings.postgres_pool,
+        )
+
     async def get_async_session(self) -> AsyncSession:
         async with self.session_factory() as sess:
             yield sess
+
+    async def monitor_replicas(self):
+        """
+        Фоновый замер отставания реплик раз в replica_probe_interval_s.
+        Запросы чтения только читают последний результат и не ждут реплик
+        """
+        while self.replicas:
+            await asyncio.gather(
+                *(
+                    r.probe(timeout_s=self.replica_probe_interval_s)
+                    for r in self.replicas
+                )
+            )
+            await asyncio.sleep(self.replica_probe_interval_s)
+
+    def read_engine(self) -> AsyncEngine:
+        """
+        Engine для чтения: реплика по выбранной стратегии среди тех,
+        чье отставание не превышает replica_max_lag_s, иначе основной сервер.
+        Реплика без свежего замера (monitor_replicas не запущен или завис)
+        считается недоступной
+        """
+        if not self.replicas:
+            return self.engine
+
+        fresh_after = time.monotonic() - 3 * self.replica_probe_interval_s
+        healthy = [
+            r
+            for r in self.replicas
+            if r.lag_s <= self.replica_max_lag_s and r.probed_at >= fresh_after
+        ]
+        if not healthy:
+            logger.warning(
+                "Нет реплик с допустимым отставанием, чтение с основного сервера"
+            )
+            return self.engine
+
+        if self.replica_strategy == self.LEAST_LATENCY:
+            replica = min(healthy, key=lambda r: r.latency_s)
+        else:
+            replica = healthy[next(self._round_robin) % len(healthy)]
+        return replica.engine
+
+    @asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        """Сессия только для чтения; данные могут отставать от основного сервера"""
+        async with self.session_factory(bind=self.read_engine()) as sess:
+            yield sess
+
+    async def report_pool_metrics(self, logger: logging.Logger, interval_s: float):
+        """Периодическая запись метрик пулов соединений в лог"""
+        while True:
+            await asyncio.sleep(interval_s)
+            for name, metrics in self.pool_metrics.items():
+                logger.info(f"Пул соединений {name}: {metrics.collect()}")
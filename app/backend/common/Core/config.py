@@ -1,17 +1,107 @@
+from typing import Optional
+
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class PoolProfile(BaseModel):
+    """Connection pool and asyncpg statement cache parameters."""
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_pre_ping: bool = False
+    pool_recycle: int = -1
+    # Кэш подготовленных выражений asyncpg на каждое соединение
+    statement_cache_size: int = 100
+    # Режим для PgBouncer в transaction/statement pooling: без именованных
+    # подготовленных выражений, которые не переживают смену серверного соединения
+    pgbouncer: bool = False
+
+
+POOL_PROFILES = {
+    "default": PoolProfile(),
+    # Фоновые задачи и редкие запросы
+    "small": PoolProfile(
+        pool_size=2,
+        max_overflow=3,
+        pool_timeout=10.0,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    ),
+    # Нагруженные gRPC сервисы
+    "large": PoolProfile(
+        pool_size=20,
+        max_overflow=20,
+        pool_timeout=10.0,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        statement_cache_size=500,
+    ),
+    # Соединения через PgBouncer: пул держит сам PgBouncer
+    "pgbouncer": PoolProfile(
+        pool_size=10,
+        max_overflow=0,
+        pool_timeout=10.0,
+        pool_pre_ping=True,
+        statement_cache_size=0,
+        pgbouncer=True,
+    ),
+}
+
+
 class Postgres(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_USER: str
     POSTGRES_DB: str
     POSTGRES_HOST: str
     POSTGRES_PORT: str
+    # Реплики для чтения через запятую: "replica1:5432,replica2:5432"
+    POSTGRES_REPLICA_HOSTS: str = ""
+    # round_robin или least_latency
+    POSTGRES_REPLICA_STRATEGY: str = "round_robin"
+    POSTGRES_REPLICA_MAX_LAG_S: float = 5.0
+    POSTGRES_REPLICA_PROBE_INTERVAL_S: float = 5.0
+    # Профиль пула из POOL_PROFILES, отдельные параметры можно переопределить
+    POSTGRES_POOL_PROFILE: str = "default"
+    POSTGRES_POOL_SIZE: Optional[int] = None
+    POSTGRES_POOL_MAX_OVERFLOW: Optional[int] = None
+    POSTGRES_POOL_TIMEOUT_S: Optional[float] = None
+    POSTGRES_POOL_PRE_PING: Optional[bool] = None
+    POSTGRES_POOL_RECYCLE_S: Optional[int] = None
+    POSTGRES_STATEMENT_CACHE_SIZE: Optional[int] = None
+    POSTGRES_POOL_METRICS_INTERVAL_S: float = 60.0
 
     @property
     def postgres_url(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def postgres_replica_urls(self) -> list[str]:
+        return [
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{host.strip()}/{self.POSTGRES_DB}"
+            for host in self.POSTGRES_REPLICA_HOSTS.split(",")
+            if host.strip()
+        ]
+
+    @property
+    def postgres_pool(self) -> PoolProfile:
+        try:
+            profile = POOL_PROFILES[self.POSTGRES_POOL_PROFILE]
+        except KeyError:
+            raise ValueError(f"Неизвестный профиль пула: {self.POSTGRES_POOL_PROFILE}")
+        overrides = {
+            "pool_size": self.POSTGRES_POOL_SIZE,
+            "max_overflow": self.POSTGRES_POOL_MAX_OVERFLOW,
+            "pool_timeout": self.POSTGRES_POOL_TIMEOUT_S,
+            "pool_pre_ping": self.POSTGRES_POOL_PRE_PING,
+            "pool_recycle": self.POSTGRES_POOL_RECYCLE_S,
+            "statement_cache_size": self.POSTGRES_STATEMENT_CACHE_SIZE,
+        }
+        return profile.model_copy(
+            update={k: v for k, v in overrides.items() if v is not None}
+        )
+
     model_config = SettingsConfigDict()
 
 
@@ -27,6 +117,15 @@ class Redis(BaseSettings):
     model_config = SettingsConfigDict()
 
 
+class TokenRevocation(BaseSettings):
+    # Отозванный при выходе access токен: ключ {REDIS_KEY_REVOKED}:{sha256 токена}
+    # со значением exp живет до истечения токена, сообщение уходит в канал
+    REDIS_KEY_REVOKED: str = "revoked"
+    REDIS_REVOKED_CHANNEL: str = "auth:revoked"
+
+    model_config = SettingsConfigDict()
+
+
 class SMTPMail(BaseSettings):
     SMTP_MAIL_SERVER: str
     SMTP_MAIL_PORT: str
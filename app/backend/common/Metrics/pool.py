@@ -0,0 +1,140 @@
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """
+    Connection pool gauges maintained from SQLAlchemy pool events.
+    Queue wait excludes the time spent opening new connections, which is
+    reported separately. Wait statistics and the in-use peak are reset
+    on every collect().
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.in_use = 0
+        self.in_use_peak = 0
+        self.opened = 0
+        self.closed = 0
+        self.invalidated = 0
+        self._reset_window()
+
+    def _reset_window(self):
+        self.checkouts = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.connect_total_s = 0.0
+        self.connect_max_s = 0.0
+        self.in_use_peak = self.in_use
+
+    def attach(self, engine: AsyncEngine) -> "PoolMetrics":
+        sync_engine = engine.sync_engine
+        if isinstance(sync_engine.pool, InstrumentedQueuePool):
+            sync_engine.pool.metrics = self
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "close", self._on_close)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "checkin", self._on_checkin)
+        return self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.opened += 1
+
+    def _on_close(self, dbapi_connection, connection_record):
+        self.closed += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidated += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.in_use += 1
+        self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        self.in_use = max(self.in_use - 1, 0)
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        self.checkouts += 1
+        self.wait_total_s += seconds
+        self.wait_max_s = max(self.wait_max_s, seconds)
+        if timed_out:
+            self.timeouts += 1
+
+    def observe_connect(self, seconds: float):
+        self.connects += 1
+        self.connect_total_s += seconds
+        self.connect_max_s = max(self.connect_max_s, seconds)
+
+    def collect(self) -> Dict[str, Any]:
+        snapshot = {
+            "in_use": self.in_use,
+            "in_use_peak": self.in_use_peak,
+            "opened": self.opened,
+            "closed": self.closed,
+            "invalidated": self.invalidated,
+            "checkouts": self.checkouts,
+            "queue_wait_avg_ms": round(
+                self.wait_total_s / self.checkouts * 1000 if self.checkouts else 0.0, 3
+            ),
+            "queue_wait_max_ms": round(self.wait_max_s * 1000, 3),
+            "queue_timeouts": self.timeouts,
+            "connects": self.connects,
+            "connect_avg_ms": round(
+                self.connect_total_s / self.connects * 1000 if self.connects else 0.0,
+                3,
+            ),
+            "connect_max_ms": round(self.connect_max_s * 1000, 3),
+        }
+        self._reset_window()
+        return snapshot
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that reports how long checkouts wait in the pool
+    queue and, separately, how long opening new connections takes.
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    # Ключ в record.info: время открытия соединения до выдачи из _do_get
+    _CONNECT_TIME_KEY = "_metrics_connect_s"
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        record = super()._create_connection()
+        record.info[self._CONNECT_TIME_KEY] = time.perf_counter() - started
+        return record
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+
+        elapsed = time.perf_counter() - started
+        # Новое соединение открывалось внутри _do_get: это не ожидание в очереди
+        connect_s = record.info.pop(self._CONNECT_TIME_KEY, None)
+        if self.metrics is not None:
+            if connect_s is not None:
+                self.metrics.observe_connect(connect_s)
+                elapsed = max(elapsed - connect_s, 0.0)
+            self.metrics.observe_wait(elapsed)
+        return record
+
+    def recreate(self):
+        # engine.dispose() пересоздает пул, метрики переходят к новому
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
@@ -0,0 +1,174 @@
+"""
+Бюджет запросов к БД и времени выполнения для gRPC методов.
+
+Используется проверками budget_check сервисов: каждый метод вызывается на
+заполненной тестовыми данными базе, считаются SQL запросы и время вызова.
+Превышение числа запросов или ошибка вызова завершают проверку с ненулевым
+кодом. Время на общей базе CI нестабильно, поэтому max_ms только помечается
+в отчете (SLOW) и сборку не ломает.
+"""
+
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+import grpc
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker
+
+from common.Core.Database import Database
+
+# Служебные выражения вложенных транзакций проверки не входят в бюджет
+IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@dataclass
+class Statement:
+    sql: str
+    duration_ms: float
+
+
+@dataclass
+class Budget:
+    max_queries: int
+    max_ms: float
+
+
+@dataclass
+class BudgetResult:
+    name: str
+    budget: Budget
+    elapsed_ms: float
+    statements: List[Statement] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def queries(self) -> int:
+        return len(self.statements)
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and self.queries <= self.budget.max_queries
+
+    @property
+    def slow(self) -> bool:
+        return self.elapsed_ms > self.budget.max_ms
+
+
+class QueryCounter:
+    """Records SQL statements executed on an engine and how long each one took."""
+
+    def __init__(self, database: Database):
+        self._engine = database.engine.sync_engine
+        self.statements: List[Statement] = []
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_budget_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_budget_started"].pop()
+        if statement.lstrip().upper().startswith(IGNORED_PREFIXES):
+            return
+        self.statements.append(
+            Statement(
+                sql=" ".join(statement.split()),
+                duration_ms=(time.perf_counter() - started) * 1000,
+            )
+        )
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self._engine, "before_cursor_execute", self._before)
+        event.listen(self._engine, "after_cursor_execute", self._after)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self._engine, "before_cursor_execute", self._before)
+        event.remove(self._engine, "after_cursor_execute", self._after)
+
+
+class BudgetContext:
+    """Minimal grpc.ServicerContext: abort() raises instead of ending an RPC."""
+
+    async def abort(self, code: grpc.StatusCode, details: str = ""):
+        raise RuntimeError(f"{code.name}: {details}")
+
+    def set_code(self, code):
+        pass
+
+    def set_details(self, details):
+        pass
+
+    def is_active(self) -> bool:
+        return True
+
+
+@asynccontextmanager
+async def rolled_back(database: Database) -> AsyncIterator[AsyncConnection]:
+    """
+    Все сессии database работают внутри одной транзакции через SAVEPOINT,
+    которая откатывается в конце: данные в базе не меняются
+    """
+    session_factory, read_engine = database.session_factory, database.read_engine
+    async with database.engine.connect() as conn:
+        trans = await conn.begin()
+        database.session_factory = async_sessionmaker(
+            bind=conn,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
+
+        database.read_engine = lambda: conn
+        try:
+            yield conn
+        finally:
+            database.session_factory, database.read_engine = (
+                session_factory,
+                read_engine,
+            )
+            await trans.rollback()
+
+
+Case = Tuple[str, Budget, Callable[[], Awaitable[Any]]]
+
+
+async def measure(database: Database, name: str, budget: Budget, call) -> BudgetResult:
+    with QueryCounter(database) as counter:
+        started = time.perf_counter()
+        error = None
+        try:
+            await call()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    return BudgetResult(name, budget, elapsed_ms, counter.statements, error)
+
+
+def report(results: List[BudgetResult], slowest: int = 3) -> int:
+    """Таблица результатов и самые медленные запросы; 1, если бюджет запросов превышен"""
+    for r in results:
+        status = "FAIL" if not r.passed else "SLOW" if r.slow else "ok"
+        print(
+            f"{r.name:<32} {r.queries:>3}/{r.budget.max_queries:<3} queries "
+            f"{r.elapsed_ms:>8.1f}/{r.budget.max_ms:<6.0f} ms  {status}"
+        )
+        if r.error:
+            print(f"    {r.error}")
+        for s in sorted(r.statements, key=lambda s: s.duration_ms, reverse=True)[
+            :slowest
+        ]:
+            print(f"    {s.duration_ms:8.2f} ms  {s.sql[:160]}")
+
+    failed = [r.name for r in results if not r.passed]
+    if failed:
+        print(f"\nПревышен бюджет: {', '.join(failed)}")
+        return 1
+    slow = [r.name for r in results if r.slow]
+    if slow:
+        print(f"\nДольше max_ms (не ошибка): {', '.join(slow)}")
+    print("\nВсе методы укладываются в бюджет запросов")
+    return 0
+
+
+async def run_budgets(database: Database, cases: List[Case]) -> List[BudgetResult]:
+    return [await measure(database, name, budget, call) for name, budget, call in cases]
@@ -3,4 +3,6 @@ from sqlalchemy.orm import DeclarativeBase, mapped_column, Mapped
 
 class Base(DeclarativeBase):
     __abstract__ = True
+    # Серверные значения по умолчанию возвращаются в том же INSERT/UPDATE через RETURNING
+    __mapper_args__ = {"eager_defaults": True}
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -8,7 +8,7 @@ import datetime
 class PaymentProviderBalance(Base):
     __tablename__ = "payment_provider_balances"
 
-    provider: Mapped[PaymentWorker] = mapped_column(nullable=False)
+    provider: Mapped[PaymentWorker] = mapped_column(nullable=False, index=True)
     currency: Mapped[ValuteCode] = mapped_column(nullable=False)
     available_amount: Mapped[float]
     updated_at: Mapped[datetime.datetime] = mapped_column(
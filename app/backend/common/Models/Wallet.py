@@ -26,7 +26,8 @@ class Wallet(Base):
     accounts: Mapped[list["WalletAccount"]] = relationship(
         back_populates="wallet",
         cascade="all, delete-orphan",
-        lazy="selectin",  # Для быстрой загрузки вместе с кошельком
+        # Счета загружаются только явно: selectinload(Wallet.accounts) там, где они нужны
+        lazy="raise",
     )
 
     transactions: Mapped[list["WalletTransaction"]] = relationship(
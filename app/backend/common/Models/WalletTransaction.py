@@ -1,6 +1,6 @@
 from uuid import UUID, uuid4
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import Numeric, DateTime, func, ForeignKey, Enum
+from sqlalchemy import Numeric, DateTime, func, ForeignKey, Enum, Index, desc, text
 import datetime
 from typing import TYPE_CHECKING, Optional
 from common.Models.Base import Base
@@ -16,6 +16,34 @@ if TYPE_CHECKING:
 
 class WalletTransaction(Base):
     __tablename__ = "wallet_transactions"
+    # Помесячные партиции по date, создаются заранее функцией
+    # wallet_transactions_ensure_partitions (см. миграцию 3b7e9c41d0a2)
+    __table_args__ = (
+        # Keyset-пагинация истории кошелька: покрывает выборку без чтения таблицы
+        Index(
+            "ix_wallet_transactions_wallet_id_date_id",
+            "wallet_id",
+            desc("date"),
+            desc("id"),
+            postgresql_include=[
+                "operation_type",
+                "currency",
+                "status",
+                "amount",
+                "correlation_id",
+            ],
+        ),
+        # Поиск зависших операций: индекс только по строкам в статусе PENDING
+        Index(
+            "ix_wallet_transactions_pending_date",
+            "date",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    # Ключ секционирования обязан входить в первичный ключ
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
     user_id: Mapped[int] = mapped_column(ForeignKey("Users.id"))
     currency: Mapped[ValuteCode] = mapped_column(Enum(ValuteCode), nullable=True)
@@ -32,11 +60,14 @@ class WalletTransaction(Base):
         server_default=TransactionStatus.PENDING.value,
     )
     date: Mapped[datetime.datetime] = mapped_column(
-        DateTime(timezone=True), default=func.now()
+        DateTime(timezone=True),
+        primary_key=True,
+        default=func.now(),
+        server_default=func.now(),
     )
-    correlation_id: Mapped[UUID] = mapped_column(nullable=True)
-    external_id: Mapped[str] = mapped_column(nullable=True)
-    idempotency_key: Mapped[str] = mapped_column(nullable=False)
+    correlation_id: Mapped[UUID] = mapped_column(nullable=True, index=True)
+    external_id: Mapped[str] = mapped_column(nullable=True, index=True)
+    idempotency_key: Mapped[str] = mapped_column(nullable=False, index=True)
     payment_worker: Mapped[PaymentWorker] = mapped_column(nullable=True)
 
     # Внешний ключ на FiatWallet
@@ -1,10 +1,46 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, delete, exc, Result
-from typing import Type, TypeVar, List, Optional
+from sqlalchemy import (
+    update,
+    delete,
+    insert,
+    exc,
+    Result,
+    column,
+    values,
+    literal,
+    Select,
+)
+from sqlalchemy.orm import raiseload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Any, Dict, Iterator, Type, TypeVar, List, Optional, Sequence
 
 T = TypeVar("T")
 
+# Протокол PostgreSQL ограничивает число параметров одного запроса
+MAX_BIND_PARAMS = 32767
+
+
+def _chunks(
+    model: Type[T], rows: Sequence[Dict[str, Any]]
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Части rows, которые помещаются в один запрос. Считаем по всем колонкам таблицы,
+    так как Python-умолчания модели тоже передаются параметрами.
+    """
+    size = max(1, MAX_BIND_PARAMS // len(model.__table__.columns))
+    for start in range(0, len(rows), size):
+        yield list(rows[start : start + size])
+
+
+def _same_keys(model: Type[T], rows: Sequence[Dict[str, Any]]) -> List[str]:
+    keys = list(rows[0])
+    if any(row.keys() != rows[0].keys() for row in rows):
+        raise ValueError(f"Rows for {model.__name__} must have the same keys")
+    return keys
+
 
 class CRUD:
     @staticmethod
@@ -13,13 +49,14 @@ class CRUD:
         model: Type[T],
         limit: int = 100,
         skip: int = 0,
+        options: Sequence[LoaderOption] = (),
         **filters,
     ) -> List[T]:
         try:
             filters_conditions = [
                 getattr(model, key) == value for key, value in filters.items()
             ]
-            stmt = select(model).limit(limit).offset(skip)
+            stmt = select(model).options(*options).limit(limit).offset(skip)
 
             if filters_conditions:
                 stmt = stmt.filter(*filters_conditions)
@@ -33,17 +70,180 @@ class CRUD:
         except exc.SQLAlchemyError as e:
             raise ValueError(f"Failed to get {model.__name__}: {str(e)}")
 
+    @staticmethod
+    def _where(stmt: Select, model: Type[T], filters: Dict[str, Any]) -> Select:
+        """Условия равенства по фильтрам; SQL кэшируется по форме запроса"""
+        return stmt.where(
+            *[
+                (
+                    getattr(model, key).is_(None)
+                    if value is None
+                    else getattr(model, key) == value
+                )
+                for key, value in filters.items()
+            ]
+        )
+
+    @staticmethod
+    async def get_one(
+        session: AsyncSession,
+        model: Type[T],
+        options: Sequence[LoaderOption] = (),
+        **filters,
+    ) -> Optional[T]:
+        """
+        Первый объект по фильтрам. Связи не загружаются и не подгружаются
+        лениво, кроме перечисленных в options (например selectinload)
+        """
+        try:
+            stmt = select(model).options(raiseload("*"), *options)
+            stmt = CRUD._where(stmt, model, filters).limit(1)
+            res: Result = await session.execute(stmt)
+            return res.scalars().first()
+        except exc.SQLAlchemyError as e:
+            raise ValueError(f"Failed to get {model.__name__}: {str(e)}")
+
+    @staticmethod
+    async def exists(session: AsyncSession, model: Type[T], **filters) -> bool:
+        try:
+            stmt = select(literal(1)).select_from(model)
+            stmt = CRUD._where(stmt, model, filters).limit(1)
+            res: Result = await session.execute(stmt)
+            return res.scalar() is not None
+        except exc.SQLAlchemyError as e:
+            raise ValueError(f"Failed to check {model.__name__}: {str(e)}")
+
+    @staticmethod
+    async def get_scalar(
+        session: AsyncSession, column_attr: InstrumentedAttribute, **filters
+    ) -> Any:
+        """Значение одной колонки первой подходящей строки, например Wallet.id"""
+        model = column_attr.class_
+        try:
+            stmt = CRUD._where(select(column_attr), model, filters).limit(1)
+            res: Result = await session.execute(stmt)
+            return res.scalar()
+        except exc.SQLAlchemyError as e:
+            raise ValueError(f"Failed to get {model.__name__}: {str(e)}")
+
     @staticmethod
     async def create(session: AsyncSession, model: Type[T], **kwargs) -> T:
         try:
             new_object: T = model(**kwargs)
             session.add(new_object)
+            # Серверные значения по умолчанию приходят через RETURNING (eager_defaults)
             await session.flush()
-            await session.refresh(new_object)
             return new_object
         except exc.SQLAlchemyError as e:
             raise ValueError(f"Failed to create {model.__name__}: {str(e)}")
 
+    @staticmethod
+    async def bulk_create(
+        session: AsyncSession, model: Type[T], rows: Sequence[Dict[str, Any]]
+    ) -> List[T]:
+        """Многострочный INSERT ... RETURNING частями по MAX_BIND_PARAMS параметров"""
+        if not rows:
+            return []
+        _same_keys(model, rows)
+        try:
+            created: List[T] = []
+            for chunk in _chunks(model, rows):
+                res: Result = await session.execute(
+                    insert(model).values(chunk).returning(model)
+                )
+                created.extend(res.scalars().all())
+            return created
+        except exc.SQLAlchemyError as e:
+            raise ValueError(f"Failed to create {model.__name__}: {str(e)}")
+
+    @staticmethod
+    async def bulk_update(
+        session: AsyncSession,
+        model: Type[T],
+        rows: Sequence[Dict[str, Any]],
+        key: str = "id",
+    ) -> List[T]:
+        """
+        UPDATE ... FROM (VALUES ...) RETURNING одним запросом на часть строк.
+        Каждая строка содержит key и новые значения колонок.
+        """
+        if not rows:
+            return []
+        update_cols = [k for k in _same_keys(model, rows) if k != key]
+        if not update_cols:
+            raise ValueError("No fields provided for update.")
+
+        table = model.__table__
+        try:
+            updated: List[T] = []
+            for chunk in _chunks(model, rows):
+                data = values(
+                    *(column(name, table.c[name].type) for name in [key, *update_cols]),
+                    name="data",
+                ).data([(row[key], *(row[c] for c in update_cols)) for row in chunk])
+                res: Result = await session.execute(
+                    update(model)
+                    .where(getattr(model, key) == data.c[key])
+                    .values({c: data.c[c] for c in update_cols})
+                    .returning(model)
+                    .execution_options(
+                        synchronize_session=False, populate_existing=True
+                    )
+                )
+                updated.extend(res.scalars().all())
+            return updated
+        except exc.SQLAlchemyError as e:
+            raise ValueError(f"Failed to update {model.__name__}: {str(e)}")
+
+    @staticmethod
+    async def upsert_many(
+        session: AsyncSession,
+        model: Type[T],
+        rows: Sequence[Dict[str, Any]],
+        conflict_cols: Sequence[str],
+        update_cols: Optional[Sequence[str]] = None,
+    ) -> List[T]:
+        """
+        INSERT ... ON CONFLICT (conflict_cols) DO UPDATE SET update_cols RETURNING.
+        Без update_cols конфликтующие строки пропускаются и не возвращаются.
+        При повторе ключа конфликта внутри rows остается последняя строка.
+        """
+        if not rows:
+            return []
+        _same_keys(model, rows)
+        rows = list(
+            {tuple(row[c] for c in conflict_cols): row for row in rows}.values()
+        )
+
+        try:
+            result: List[T] = []
+            for chunk in _chunks(model, rows):
+                stmt = pg_insert(model).values(chunk)
+                if update_cols:
+                    set_ = {c: stmt.excluded[c] for c in update_cols}
+                    # onupdate колонок ON CONFLICT сам не применяет
+                    for col in model.__table__.columns:
+                        if (
+                            col.onupdate is not None
+                            and col.onupdate.is_clause_element
+                            and col.name not in set_
+                        ):
+                            set_[col.name] = col.onupdate.arg
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=list(conflict_cols), set_=set_
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(
+                        index_elements=list(conflict_cols)
+                    )
+                res: Result = await session.execute(
+                    stmt.returning(model).execution_options(populate_existing=True)
+                )
+                result.extend(res.scalars().all())
+            return result
+        except exc.SQLAlchemyError as e:
+            raise ValueError(f"Failed to upsert {model.__name__}: {str(e)}")
+
     @staticmethod
     async def update_by_id(
         session: AsyncSession, model: Type[T], object_id: int, **update_fields
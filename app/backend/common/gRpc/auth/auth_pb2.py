@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x61uth/auth.proto\x12\x04\x61uth\"\x8e\x01\n\x0c\x42\x61seResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12.\n\x06\x64\x65tail\x18\x03 \x03(\x0b\x32\x1e.auth.BaseResponse.DetailEntry\x1a-\n\x0b\x44\x65tailEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"(\n\x12\x43heckAccessRequest\x12\x12\n\njwt_access\x18\x01 \x01(\t\"7\n\x13\x43heckAccessResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\">\n\x13GetNewTokensRequest\x12\x12\n\njwt_access\x18\x01 \x01(\t\x12\x13\n\x0bjwt_refresh\x18\x02 \x01(\t\"8\n\x14GetNewTokensResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"4\n\x0cLoginRequest\x12\x12\n\nuser_email\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"1\n\rLoginResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"8\n\rLogoutRequest\x12\x12\n\njwt_access\x18\x01 \x01(\t\x12\x13\n\x0bjwt_refresh\x18\x02 \x01(\t\"2\n\x0eLogoutResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"4\n\x11RegistrateRequest\x12\r\n\x05login\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"6\n\x12RegistrateResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"5\n\x10Verify2faRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x10\n\x08opt_code\x18\x02 \x01(\t\"5\n\x11Verify2faResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"+\n\x1bHandleGoogleCallbackRequest\x12\x0c\n\x04\x63ode\x18\x01 \x01(\t\"@\n\x1cHandleGoogleCallbackResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"\x19\n\x17GetGoogleAuthUrlRequest\"<\n\x18GetGoogleAuthUrlResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse2\xb6\x04\n\x0b\x41uthService\x12\x42\n\x0b\x43heckAccess\x12\x18.auth.CheckAccessRequest\x1a\x19.auth.CheckAccessResponse\x12\x45\n\x0cGetNewTokens\x12\x19.auth.GetNewTokensRequest\x1a\x1a.auth.GetNewTokensResponse\x12\x30\n\x05Login\x12\x12.auth.LoginRequest\x1a\x13.auth.LoginResponse\x12\x33\n\x06Logout\x12\x13.auth.LogoutRequest\x1a\x14.auth.LogoutResponse\x12?\n\nRegistrate\x12\x17.auth.RegistrateRequest\x1a\x18.auth.RegistrateResponse\x12=\n\nVerify_2fa\x12\x16.auth.Verify2faRequest\x1a\x17.auth.Verify2faResponse\x12_\n\x16Handle_google_callback\x12!.auth.HandleGoogleCallbackRequest\x1a\".auth.HandleGoogleCallbackResponse\x12T\n\x13Get_google_auth_url\x12\x1d.auth.GetGoogleAuthUrlRequest\x1a\x1e.auth.GetGoogleAuthUrlResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x61uth/auth.proto\x12\x04\x61uth\"\x8e\x01\n\x0c\x42\x61seResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12.\n\x06\x64\x65tail\x18\x03 \x03(\x0b\x32\x1e.auth.BaseResponse.DetailEntry\x1a-\n\x0b\x44\x65tailEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"(\n\x12\x43heckAccessRequest\x12\x12\n\njwt_access\x18\x01 \x01(\t\":\n\rAccessPayload\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0b\n\x03iat\x18\x02 \x01(\x01\x12\x0b\n\x03\x65xp\x18\x03 \x01(\x01\"]\n\x13\x43heckAccessResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\x12$\n\x07payload\x18\x02 \x01(\x0b\x32\x13.auth.AccessPayload\">\n\x13GetNewTokensRequest\x12\x12\n\njwt_access\x18\x01 \x01(\t\x12\x13\n\x0bjwt_refresh\x18\x02 \x01(\t\"g\n\x14GetNewTokensResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\x12\x1c\n\x06tokens\x18\x02 \x01(\x0b\x32\x0c.auth.Tokens\x12\x0f\n\x07user_id\x18\x03 \x01(\t\"4\n\x0cLoginRequest\x12\x12\n\nuser_email\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"\x84\x01\n\rLoginResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\x12!\n\x06tokens\x18\x02 \x01(\x0b\x32\x0c.auth.TokensH\x00\x88\x01\x01\x12\x12\n\ntwo_factor\x18\x03 \x01(\x08\x12\x0f\n\x07user_id\x18\x04 \x01(\tB\t\n\x07_tokens\"8\n\rLogoutRequest\x12\x12\n\njwt_access\x18\x01 \x01(\t\x12\x13\n\x0bjwt_refresh\x18\x02 \x01(\t\"2\n\x0eLogoutResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"4\n\x11RegistrateRequest\x12\r\n\x05login\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"6\n\x12RegistrateResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"5\n\x10Verify2faRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x10\n\x08opt_code\x18\x02 \x01(\t\"5\n\x11Verify2faResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"+\n\x1bHandleGoogleCallbackRequest\x12\x0c\n\x04\x63ode\x18\x01 \x01(\t\"@\n\x1cHandleGoogleCallbackResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"\x19\n\x17GetGoogleAuthUrlRequest\"<\n\x18GetGoogleAuthUrlResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\"\x16\n\x14GetPublicKeysRequest\"2\n\tPublicKey\x12\x0b\n\x03kid\x18\x01 \x01(\t\x12\x0b\n\x03\x61lg\x18\x02 \x01(\t\x12\x0b\n\x03pem\x18\x03 \x01(\t\"I\n\x15GetPublicKeysResponse\x12\x1d\n\x04keys\x18\x01 \x03(\x0b\x32\x0f.auth.PublicKey\x12\x11\n\tmax_age_s\x18\x02 \x01(\x05\"1\n\x06Tokens\x12\x12\n\njwt_access\x18\x01 \x01(\t\x12\x13\n\x0bjwt_refresh\x18\x02 \x01(\t\">\n\x13\x41uthenticateRequest\x12\x12\n\njwt_access\x18\x01 \x01(\t\x12\x13\n\x0bjwt_refresh\x18\x02 \x01(\t\"w\n\x14\x41uthenticateResponse\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.auth.BaseResponse\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12!\n\x06tokens\x18\x03 \x01(\x0b\x32\x0c.auth.TokensH\x00\x88\x01\x01\x42\t\n\x07_tokens2\xc7\x05\n\x0b\x41uthService\x12\x42\n\x0b\x43heckAccess\x12\x18.auth.CheckAccessRequest\x1a\x19.auth.CheckAccessResponse\x12\x45\n\x0cGetNewTokens\x12\x19.auth.GetNewTokensRequest\x1a\x1a.auth.GetNewTokensResponse\x12\x30\n\x05Login\x12\x12.auth.LoginRequest\x1a\x13.auth.LoginResponse\x12\x33\n\x06Logout\x12\x13.auth.LogoutRequest\x1a\x14.auth.LogoutResponse\x12?\n\nRegistrate\x12\x17.auth.RegistrateRequest\x1a\x18.auth.RegistrateResponse\x12=\n\nVerify_2fa\x12\x16.auth.Verify2faRequest\x1a\x17.auth.Verify2faResponse\x12_\n\x16Handle_google_callback\x12!.auth.HandleGoogleCallbackRequest\x1a\".auth.HandleGoogleCallbackResponse\x12T\n\x13Get_google_auth_url\x12\x1d.auth.GetGoogleAuthUrlRequest\x1a\x1e.auth.GetGoogleAuthUrlResponse\x12H\n\rGetPublicKeys\x12\x1a.auth.GetPublicKeysRequest\x1a\x1b.auth.GetPublicKeysResponse\x12\x45\n\x0c\x41uthenticate\x12\x19.auth.AuthenticateRequest\x1a\x1a.auth.AuthenticateResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -39,36 +39,50 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_BASERESPONSE_DETAILENTRY']._serialized_end=168
   _globals['_CHECKACCESSREQUEST']._serialized_start=170
   _globals['_CHECKACCESSREQUEST']._serialized_end=210
-  _globals['_CHECKACCESSRESPONSE']._serialized_start=212
-  _globals['_CHECKACCESSRESPONSE']._serialized_end=267
-  _globals['_GETNEWTOKENSREQUEST']._serialized_start=269
-  _globals['_GETNEWTOKENSREQUEST']._serialized_end=331
-  _globals['_GETNEWTOKENSRESPONSE']._serialized_start=333
-  _globals['_GETNEWTOKENSRESPONSE']._serialized_end=389
-  _globals['_LOGINREQUEST']._serialized_start=391
-  _globals['_LOGINREQUEST']._serialized_end=443
-  _globals['_LOGINRESPONSE']._serialized_start=445
-  _globals['_LOGINRESPONSE']._serialized_end=494
-  _globals['_LOGOUTREQUEST']._serialized_start=496
-  _globals['_LOGOUTREQUEST']._serialized_end=552
-  _globals['_LOGOUTRESPONSE']._serialized_start=554
-  _globals['_LOGOUTRESPONSE']._serialized_end=604
-  _globals['_REGISTRATEREQUEST']._serialized_start=606
-  _globals['_REGISTRATEREQUEST']._serialized_end=658
-  _globals['_REGISTRATERESPONSE']._serialized_start=660
-  _globals['_REGISTRATERESPONSE']._serialized_end=714
-  _globals['_VERIFY2FAREQUEST']._serialized_start=716
-  _globals['_VERIFY2FAREQUEST']._serialized_end=769
-  _globals['_VERIFY2FARESPONSE']._serialized_start=771
-  _globals['_VERIFY2FARESPONSE']._serialized_end=824
-  _globals['_HANDLEGOOGLECALLBACKREQUEST']._serialized_start=826
-  _globals['_HANDLEGOOGLECALLBACKREQUEST']._serialized_end=869
-  _globals['_HANDLEGOOGLECALLBACKRESPONSE']._serialized_start=871
-  _globals['_HANDLEGOOGLECALLBACKRESPONSE']._serialized_end=935
-  _globals['_GETGOOGLEAUTHURLREQUEST']._serialized_start=937
-  _globals['_GETGOOGLEAUTHURLREQUEST']._serialized_end=962
-  _globals['_GETGOOGLEAUTHURLRESPONSE']._serialized_start=964
-  _globals['_GETGOOGLEAUTHURLRESPONSE']._serialized_end=1024
-  _globals['_AUTHSERVICE']._serialized_start=1027
-  _globals['_AUTHSERVICE']._serialized_end=1593
+  _globals['_ACCESSPAYLOAD']._serialized_start=212
+  _globals['_ACCESSPAYLOAD']._serialized_end=270
+  _globals['_CHECKACCESSRESPONSE']._serialized_start=272
+  _globals['_CHECKACCESSRESPONSE']._serialized_end=365
+  _globals['_GETNEWTOKENSREQUEST']._serialized_start=367
+  _globals['_GETNEWTOKENSREQUEST']._serialized_end=429
+  _globals['_GETNEWTOKENSRESPONSE']._serialized_start=431
+  _globals['_GETNEWTOKENSRESPONSE']._serialized_end=534
+  _globals['_LOGINREQUEST']._serialized_start=536
+  _globals['_LOGINREQUEST']._serialized_end=588
+  _globals['_LOGINRESPONSE']._serialized_start=591
+  _globals['_LOGINRESPONSE']._serialized_end=723
+  _globals['_LOGOUTREQUEST']._serialized_start=725
+  _globals['_LOGOUTREQUEST']._serialized_end=781
+  _globals['_LOGOUTRESPONSE']._serialized_start=783
+  _globals['_LOGOUTRESPONSE']._serialized_end=833
+  _globals['_REGISTRATEREQUEST']._serialized_start=835
+  _globals['_REGISTRATEREQUEST']._serialized_end=887
+  _globals['_REGISTRATERESPONSE']._serialized_start=889
+  _globals['_REGISTRATERESPONSE']._serialized_end=943
+  _globals['_VERIFY2FAREQUEST']._serialized_start=945
+  _globals['_VERIFY2FAREQUEST']._serialized_end=998
+  _globals['_VERIFY2FARESPONSE']._serialized_start=1000
+  _globals['_VERIFY2FARESPONSE']._serialized_end=1053
+  _globals['_HANDLEGOOGLECALLBACKREQUEST']._serialized_start=1055
+  _globals['_HANDLEGOOGLECALLBACKREQUEST']._serialized_end=1098
+  _globals['_HANDLEGOOGLECALLBACKRESPONSE']._serialized_start=1100
+  _globals['_HANDLEGOOGLECALLBACKRESPONSE']._serialized_end=1164
+  _globals['_GETGOOGLEAUTHURLREQUEST']._serialized_start=1166
+  _globals['_GETGOOGLEAUTHURLREQUEST']._serialized_end=1191
+  _globals['_GETGOOGLEAUTHURLRESPONSE']._serialized_start=1193
+  _globals['_GETGOOGLEAUTHURLRESPONSE']._serialized_end=1253
+  _globals['_GETPUBLICKEYSREQUEST']._serialized_start=1255
+  _globals['_GETPUBLICKEYSREQUEST']._serialized_end=1277
+  _globals['_PUBLICKEY']._serialized_start=1279
+  _globals['_PUBLICKEY']._serialized_end=1329
+  _globals['_GETPUBLICKEYSRESPONSE']._serialized_start=1331
+  _globals['_GETPUBLICKEYSRESPONSE']._serialized_end=1404
+  _globals['_TOKENS']._serialized_start=1406
+  _globals['_TOKENS']._serialized_end=1455
+  _globals['_AUTHENTICATEREQUEST']._serialized_start=1457
+  _globals['_AUTHENTICATEREQUEST']._serialized_end=1519
+  _globals['_AUTHENTICATERESPONSE']._serialized_start=1521
+  _globals['_AUTHENTICATERESPONSE']._serialized_end=1640
+  _globals['_AUTHSERVICE']._serialized_start=1643
+  _globals['_AUTHSERVICE']._serialized_end=2354
 # @@protoc_insertion_point(module_scope)
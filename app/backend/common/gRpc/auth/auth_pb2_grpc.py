@@ -85,6 +85,18 @@ class AuthServiceStub(object):
             response_deserializer=auth_dot_auth__pb2.GetGoogleAuthUrlResponse.FromString,
             _registered_method=True,
         )
+        self.GetPublicKeys = channel.unary_unary(
+            "/auth.AuthService/GetPublicKeys",
+            request_serializer=auth_dot_auth__pb2.GetPublicKeysRequest.SerializeToString,
+            response_deserializer=auth_dot_auth__pb2.GetPublicKeysResponse.FromString,
+            _registered_method=True,
+        )
+        self.Authenticate = channel.unary_unary(
+            "/auth.AuthService/Authenticate",
+            request_serializer=auth_dot_auth__pb2.AuthenticateRequest.SerializeToString,
+            response_deserializer=auth_dot_auth__pb2.AuthenticateResponse.FromString,
+            _registered_method=True,
+        )
 
 
 class AuthServiceServicer(object):
@@ -138,6 +150,18 @@ class AuthServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def GetPublicKeys(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def Authenticate(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_AuthServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -181,6 +205,16 @@ def add_AuthServiceServicer_to_server(servicer, server):
             request_deserializer=auth_dot_auth__pb2.GetGoogleAuthUrlRequest.FromString,
             response_serializer=auth_dot_auth__pb2.GetGoogleAuthUrlResponse.SerializeToString,
         ),
+        "GetPublicKeys": grpc.unary_unary_rpc_method_handler(
+            servicer.GetPublicKeys,
+            request_deserializer=auth_dot_auth__pb2.GetPublicKeysRequest.FromString,
+            response_serializer=auth_dot_auth__pb2.GetPublicKeysResponse.SerializeToString,
+        ),
+        "Authenticate": grpc.unary_unary_rpc_method_handler(
+            servicer.Authenticate,
+            request_deserializer=auth_dot_auth__pb2.AuthenticateRequest.FromString,
+            response_serializer=auth_dot_auth__pb2.AuthenticateResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "auth.AuthService", rpc_method_handlers
@@ -432,3 +466,63 @@ class AuthService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def GetPublicKeys(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/auth.AuthService/GetPublicKeys",
+            auth_dot_auth__pb2.GetPublicKeysRequest.SerializeToString,
+            auth_dot_auth__pb2.GetPublicKeysResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def Authenticate(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/auth.AuthService/Authenticate",
+            auth_dot_auth__pb2.AuthenticateRequest.SerializeToString,
+            auth_dot_auth__pb2.AuthenticateResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bwallet_service/wallet.proto\x12\x06wallet\"&\n\x13\x43reateWalletRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"7\n\x0eWalletResponse\x12\x11\n\twallet_id\x18\x01 \x01(\t\x12\x12\n\ncreated_at\x18\x02 \x01(\t\"H\n\x11GetBalanceRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x15\n\x08\x63urrency\x18\x02 \x01(\tH\x00\x88\x01\x01\x42\x0b\n\t_currency\"\xaa\x01\n\x0f\x42\x61lanceResponse\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x36\n\x08\x62\x61lances\x18\x02 \x03(\x0b\x32$.wallet.BalanceResponse.BalanceEntry\x1aN\n\x0c\x42\x61lanceEntry\x12\x10\n\x08\x63urrency\x18\x01 \x01(\t\x12\x13\n\x06\x61mount\x18\x02 \x01(\x01H\x00\x88\x01\x01\x12\x0c\n\x04type\x18\x03 \x01(\tB\t\n\x07_amount\"v\n\x0fTransferRequest\x12\x14\n\x0c\x66rom_user_id\x18\x01 \x01(\t\x12\x12\n\nto_user_id\x18\x02 \x01(\t\x12\x0e\n\x06\x61mount\x18\x03 \x01(\x01\x12\x10\n\x08\x63urrency\x18\x04 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x05 \x01(\t\"n\n\x0fWithdrawRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0e\n\x06\x61mount\x18\x02 \x01(\x01\x12\x10\n\x08\x63urrency\x18\x03 \x01(\t\x12\x0f\n\x07getaway\x18\x04 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x05 \x01(\t\"v\n\x0e\x43onvertRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x15\n\rfrom_currency\x18\x02 \x01(\t\x12\x13\n\x0bto_currency\x18\x03 \x01(\t\x12\x0e\n\x06\x61mount\x18\x04 \x01(\x01\x12\x17\n\x0fidempotency_key\x18\x05 \x01(\t\";\n\x11OperationResponse\x12\x16\n\x0e\x63orrelation_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\"~\n\x1f\x43reatePaymentTransactionRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0e\n\x06\x61mount\x18\x02 \x01(\x01\x12\x10\n\x08\x63urrency\x18\x03 \x01(\t\x12\x0f\n\x07gateway\x18\x04 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x05 \x01(\t\".\n\x1b\x43onnectAccountStripeRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"2\n\x1aPaymentTransactionResponse\x12\x14\n\x0credirect_url\x18\x01 \x01(\t\"\x87\x03\n\x19StripePaymentNotification\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x12\n\nevent_type\x18\x02 \x01(\t\x12\x10\n\x08livemode\x18\x04 \x01(\x08\x12G\n\x0epayment_intent\x18\x05 \x01(\x0b\x32/.wallet.StripePaymentNotification.PaymentIntent\x12\x17\n\x0fidempotency_key\x18\x06 \x01(\t\x1a\xcf\x01\n\rPaymentIntent\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0e\n\x06\x61mount\x18\x02 \x01(\x05\x12\x10\n\x08\x63urrency\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12O\n\x08metadata\x18\x05 \x03(\x0b\x32=.wallet.StripePaymentNotification.PaymentIntent.MetadataEntry\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"3\n\x0fWebhookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t2\xd4\x05\n\rWalletService\x12\x43\n\x0c\x43reateWallet\x12\x1b.wallet.CreateWalletRequest\x1a\x16.wallet.WalletResponse\x12@\n\nGetBalance\x12\x19.wallet.GetBalanceRequest\x1a\x17.wallet.BalanceResponse\x12>\n\x08Transfer\x12\x17.wallet.TransferRequest\x1a\x19.wallet.OperationResponse\x12<\n\x07\x43onvert\x12\x16.wallet.ConvertRequest\x1a\x19.wallet.OperationResponse\x12O\n\x19\x43reateWithdrawTransaction\x12\x17.wallet.WithdrawRequest\x1a\x19.wallet.OperationResponse\x12g\n\x18\x43reatePaymentTransaction\x12\'.wallet.CreatePaymentTransactionRequest\x1a\".wallet.PaymentTransactionResponse\x12_\n\x14\x43onnectAccountStripe\x12#.wallet.ConnectAccountStripeRequest\x1a\".wallet.PaymentTransactionResponse\x12Q\n\x13HandleStripePayment\x12!.wallet.StripePaymentNotification\x1a\x17.wallet.WebhookResponse\x12P\n\x12HandleStripePayout\x12!.wallet.StripePaymentNotification\x1a\x17.wallet.WebhookResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bwallet_service/wallet.proto\x12\x06wallet\"&\n\x13\x43reateWalletRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"7\n\x0eWalletResponse\x12\x11\n\twallet_id\x18\x01 \x01(\t\x12\x12\n\ncreated_at\x18\x02 \x01(\t\"H\n\x11GetBalanceRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x15\n\x08\x63urrency\x18\x02 \x01(\tH\x00\x88\x01\x01\x42\x0b\n\t_currency\"\xaa\x01\n\x0f\x42\x61lanceResponse\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x36\n\x08\x62\x61lances\x18\x02 \x03(\x0b\x32$.wallet.BalanceResponse.BalanceEntry\x1aN\n\x0c\x42\x61lanceEntry\x12\x10\n\x08\x63urrency\x18\x01 \x01(\t\x12\x13\n\x06\x61mount\x18\x02 \x01(\x01H\x00\x88\x01\x01\x12\x0c\n\x04type\x18\x03 \x01(\tB\t\n\x07_amount\"v\n\x0fTransferRequest\x12\x14\n\x0c\x66rom_user_id\x18\x01 \x01(\t\x12\x12\n\nto_user_id\x18\x02 \x01(\t\x12\x0e\n\x06\x61mount\x18\x03 \x01(\x01\x12\x10\n\x08\x63urrency\x18\x04 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x05 \x01(\t\"t\n\x13\x42\x61tchTransferResult\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x17\n\x0fidempotency_key\x18\x02 \x01(\t\x12\x16\n\x0e\x63orrelation_id\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\r\n\x05\x65rror\x18\x05 \x01(\t\"n\n\x0fWithdrawRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0e\n\x06\x61mount\x18\x02 \x01(\x01\x12\x10\n\x08\x63urrency\x18\x03 \x01(\t\x12\x0f\n\x07getaway\x18\x04 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x05 \x01(\t\"v\n\x0e\x43onvertRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x15\n\rfrom_currency\x18\x02 \x01(\t\x12\x13\n\x0bto_currency\x18\x03 \x01(\t\x12\x0e\n\x06\x61mount\x18\x04 \x01(\x01\x12\x17\n\x0fidempotency_key\x18\x05 \x01(\t\";\n\x11OperationResponse\x12\x16\n\x0e\x63orrelation_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\"R\n\x16OperationStatusRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x16\n\x0e\x63orrelation_id\x18\x02 \x01(\t\x12\x0f\n\x07wait_ms\x18\x03 \x01(\x05\"\x92\x01\n\x17OperationStatusResponse\x12\x16\n\x0e\x63orrelation_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x11\n\toperation\x18\x03 \x01(\t\x12\x13\n\x06\x61mount\x18\x04 \x01(\x01H\x00\x88\x01\x01\x12\x12\n\x05\x65rror\x18\x05 \x01(\tH\x01\x88\x01\x01\x42\t\n\x07_amountB\x08\n\x06_error\"\xf5\x01\n\x17ListTransactionsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\x13\n\x06\x63ursor\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x1b\n\x0eoperation_type\x18\x04 \x01(\tH\x01\x88\x01\x01\x12\x15\n\x08\x63urrency\x18\x05 \x01(\tH\x02\x88\x01\x01\x12\x16\n\tdate_from\x18\x06 \x01(\tH\x03\x88\x01\x01\x12\x14\n\x07\x64\x61te_to\x18\x07 \x01(\tH\x04\x88\x01\x01\x42\t\n\x07_cursorB\x11\n\x0f_operation_typeB\x0b\n\t_currencyB\x0c\n\n_date_fromB\n\n\x08_date_to\"\x8e\x01\n\x10TransactionEntry\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x16\n\x0e\x63orrelation_id\x18\x02 \x01(\t\x12\x16\n\x0eoperation_type\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x10\n\x08\x63urrency\x18\x05 \x01(\t\x12\x0e\n\x06\x61mount\x18\x06 \x01(\x01\x12\x0c\n\x04\x64\x61te\x18\x07 \x01(\t\"t\n\x18ListTransactionsResponse\x12.\n\x0ctransactions\x18\x01 \x03(\x0b\x32\x18.wallet.TransactionEntry\x12\x18\n\x0bnext_cursor\x18\x02 \x01(\tH\x00\x88\x01\x01\x42\x0e\n\x0c_next_cursor\"\xc8\x01\n\x19\x45xportTransactionsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x1b\n\x0eoperation_type\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x15\n\x08\x63urrency\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x16\n\tdate_from\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x14\n\x07\x64\x61te_to\x18\x05 \x01(\tH\x03\x88\x01\x01\x42\x11\n\x0f_operation_typeB\x0b\n\t_currencyB\x0c\n\n_date_fromB\n\n\x08_date_to\"C\n\x11TransactionsChunk\x12.\n\x0ctransactions\x18\x01 \x03(\x0b\x32\x18.wallet.TransactionEntry\"~\n\x1f\x43reatePaymentTransactionRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0e\n\x06\x61mount\x18\x02 \x01(\x01\x12\x10\n\x08\x63urrency\x18\x03 \x01(\t\x12\x0f\n\x07gateway\x18\x04 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x05 \x01(\t\".\n\x1b\x43onnectAccountStripeRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"2\n\x1aPaymentTransactionResponse\x12\x14\n\x0credirect_url\x18\x01 \x01(\t\"\x87\x03\n\x19StripePaymentNotification\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x12\n\nevent_type\x18\x02 \x01(\t\x12\x10\n\x08livemode\x18\x04 \x01(\x08\x12G\n\x0epayment_intent\x18\x05 \x01(\x0b\x32/.wallet.StripePaymentNotification.PaymentIntent\x12\x17\n\x0fidempotency_key\x18\x06 \x01(\t\x1a\xcf\x01\n\rPaymentIntent\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0e\n\x06\x61mount\x18\x02 \x01(\x05\x12\x10\n\x08\x63urrency\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12O\n\x08metadata\x18\x05 \x03(\x0b\x32=.wallet.StripePaymentNotification.PaymentIntent.MetadataEntry\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"3\n\x0fWebhookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t2\xe9\x08\n\rWalletService\x12\x43\n\x0c\x43reateWallet\x12\x1b.wallet.CreateWalletRequest\x1a\x16.wallet.WalletResponse\x12@\n\nGetBalance\x12\x19.wallet.GetBalanceRequest\x1a\x17.wallet.BalanceResponse\x12\x44\n\x0cWatchBalance\x12\x19.wallet.GetBalanceRequest\x1a\x17.wallet.BalanceResponse0\x01\x12>\n\x08Transfer\x12\x17.wallet.TransferRequest\x1a\x19.wallet.OperationResponse\x12U\n\x12GetOperationStatus\x12\x1e.wallet.OperationStatusRequest\x1a\x1f.wallet.OperationStatusResponse\x12U\n\x10ListTransactions\x12\x1f.wallet.ListTransactionsRequest\x1a .wallet.ListTransactionsResponse\x12T\n\x12\x45xportTransactions\x12!.wallet.ExportTransactionsRequest\x1a\x19.wallet.TransactionsChunk0\x01\x12I\n\rBatchTransfer\x12\x17.wallet.TransferRequest\x1a\x1b.wallet.BatchTransferResult(\x01\x30\x01\x12<\n\x07\x43onvert\x12\x16.wallet.ConvertRequest\x1a\x19.wallet.OperationResponse\x12O\n\x19\x43reateWithdrawTransaction\x12\x17.wallet.WithdrawRequest\x1a\x19.wallet.OperationResponse\x12g\n\x18\x43reatePaymentTransaction\x12\'.wallet.CreatePaymentTransactionRequest\x1a\".wallet.PaymentTransactionResponse\x12_\n\x14\x43onnectAccountStripe\x12#.wallet.ConnectAccountStripeRequest\x1a\".wallet.PaymentTransactionResponse\x12Q\n\x13HandleStripePayment\x12!.wallet.StripePaymentNotification\x1a\x17.wallet.WebhookResponse\x12P\n\x12HandleStripePayout\x12!.wallet.StripePaymentNotification\x1a\x17.wallet.WebhookResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -45,26 +45,42 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_BALANCERESPONSE_BALANCEENTRY']._serialized_end=381
   _globals['_TRANSFERREQUEST']._serialized_start=383
   _globals['_TRANSFERREQUEST']._serialized_end=501
-  _globals['_WITHDRAWREQUEST']._serialized_start=503
-  _globals['_WITHDRAWREQUEST']._serialized_end=613
-  _globals['_CONVERTREQUEST']._serialized_start=615
-  _globals['_CONVERTREQUEST']._serialized_end=733
-  _globals['_OPERATIONRESPONSE']._serialized_start=735
-  _globals['_OPERATIONRESPONSE']._serialized_end=794
-  _globals['_CREATEPAYMENTTRANSACTIONREQUEST']._serialized_start=796
-  _globals['_CREATEPAYMENTTRANSACTIONREQUEST']._serialized_end=922
-  _globals['_CONNECTACCOUNTSTRIPEREQUEST']._serialized_start=924
-  _globals['_CONNECTACCOUNTSTRIPEREQUEST']._serialized_end=970
-  _globals['_PAYMENTTRANSACTIONRESPONSE']._serialized_start=972
-  _globals['_PAYMENTTRANSACTIONRESPONSE']._serialized_end=1022
-  _globals['_STRIPEPAYMENTNOTIFICATION']._serialized_start=1025
-  _globals['_STRIPEPAYMENTNOTIFICATION']._serialized_end=1416
-  _globals['_STRIPEPAYMENTNOTIFICATION_PAYMENTINTENT']._serialized_start=1209
-  _globals['_STRIPEPAYMENTNOTIFICATION_PAYMENTINTENT']._serialized_end=1416
-  _globals['_STRIPEPAYMENTNOTIFICATION_PAYMENTINTENT_METADATAENTRY']._serialized_start=1369
-  _globals['_STRIPEPAYMENTNOTIFICATION_PAYMENTINTENT_METADATAENTRY']._serialized_end=1416
-  _globals['_WEBHOOKRESPONSE']._serialized_start=1418
-  _globals['_WEBHOOKRESPONSE']._serialized_end=1469
-  _globals['_WALLETSERVICE']._serialized_start=1472
-  _globals['_WALLETSERVICE']._serialized_end=2196
+  _globals['_BATCHTRANSFERRESULT']._serialized_start=503
+  _globals['_BATCHTRANSFERRESULT']._serialized_end=619
+  _globals['_WITHDRAWREQUEST']._serialized_start=621
+  _globals['_WITHDRAWREQUEST']._serialized_end=731
+  _globals['_CONVERTREQUEST']._serialized_start=733
+  _globals['_CONVERTREQUEST']._serialized_end=851
+  _globals['_OPERATIONRESPONSE']._serialized_start=853
+  _globals['_OPERATIONRESPONSE']._serialized_end=912
+  _globals['_OPERATIONSTATUSREQUEST']._serialized_start=914
+  _globals['_OPERATIONSTATUSREQUEST']._serialized_end=996
+  _globals['_OPERATIONSTATUSRESPONSE']._serialized_start=999
+  _globals['_OPERATIONSTATUSRESPONSE']._serialized_end=1145
+  _globals['_LISTTRANSACTIONSREQUEST']._serialized_start=1148
+  _globals['_LISTTRANSACTIONSREQUEST']._serialized_end=1393
+  _globals['_TRANSACTIONENTRY']._serialized_start=1396
+  _globals['_TRANSACTIONENTRY']._serialized_end=1538
+  _globals['_LISTTRANSACTIONSRESPONSE']._serialized_start=1540
+  _globals['_LISTTRANSACTIONSRESPONSE']._serialized_end=1656
+  _globals['_EXPORTTRANSACTIONSREQUEST']._serialized_start=1659
+  _globals['_EXPORTTRANSACTIONSREQUEST']._serialized_end=1859
+  _globals['_TRANSACTIONSCHUNK']._serialized_start=1861
+  _globals['_TRANSACTIONSCHUNK']._serialized_end=1928
+  _globals['_CREATEPAYMENTTRANSACTIONREQUEST']._serialized_start=1930
+  _globals['_CREATEPAYMENTTRANSACTIONREQUEST']._serialized_end=2056
+  _globals['_CONNECTACCOUNTSTRIPEREQUEST']._serialized_start=2058
+  _globals['_CONNECTACCOUNTSTRIPEREQUEST']._serialized_end=2104
+  _globals['_PAYMENTTRANSACTIONRESPONSE']._serialized_start=2106
+  _globals['_PAYMENTTRANSACTIONRESPONSE']._serialized_end=2156
+  _globals['_STRIPEPAYMENTNOTIFICATION']._serialized_start=2159
+  _globals['_STRIPEPAYMENTNOTIFICATION']._serialized_end=2550
+  _globals['_STRIPEPAYMENTNOTIFICATION_PAYMENTINTENT']._serialized_start=2343
+  _globals['_STRIPEPAYMENTNOTIFICATION_PAYMENTINTENT']._serialized_end=2550
+  _globals['_STRIPEPAYMENTNOTIFICATION_PAYMENTINTENT_METADATAENTRY']._serialized_start=2503
+  _globals['_STRIPEPAYMENTNOTIFICATION_PAYMENTINTENT_METADATAENTRY']._serialized_end=2550
+  _globals['_WEBHOOKRESPONSE']._serialized_start=2552
+  _globals['_WEBHOOKRESPONSE']._serialized_end=2603
+  _globals['_WALLETSERVICE']._serialized_start=2606
+  _globals['_WALLETSERVICE']._serialized_end=3735
 # @@protoc_insertion_point(module_scope)
@@ -49,12 +49,42 @@ class WalletServiceStub(object):
             response_deserializer=wallet__service_dot_wallet__pb2.BalanceResponse.FromString,
             _registered_method=True,
         )
+        self.WatchBalance = channel.unary_stream(
+            "/wallet.WalletService/WatchBalance",
+            request_serializer=wallet__service_dot_wallet__pb2.GetBalanceRequest.SerializeToString,
+            response_deserializer=wallet__service_dot_wallet__pb2.BalanceResponse.FromString,
+            _registered_method=True,
+        )
         self.Transfer = channel.unary_unary(
             "/wallet.WalletService/Transfer",
             request_serializer=wallet__service_dot_wallet__pb2.TransferRequest.SerializeToString,
             response_deserializer=wallet__service_dot_wallet__pb2.OperationResponse.FromString,
             _registered_method=True,
         )
+        self.GetOperationStatus = channel.unary_unary(
+            "/wallet.WalletService/GetOperationStatus",
+            request_serializer=wallet__service_dot_wallet__pb2.OperationStatusRequest.SerializeToString,
+            response_deserializer=wallet__service_dot_wallet__pb2.OperationStatusResponse.FromString,
+            _registered_method=True,
+        )
+        self.ListTransactions = channel.unary_unary(
+            "/wallet.WalletService/ListTransactions",
+            request_serializer=wallet__service_dot_wallet__pb2.ListTransactionsRequest.SerializeToString,
+            response_deserializer=wallet__service_dot_wallet__pb2.ListTransactionsResponse.FromString,
+            _registered_method=True,
+        )
+        self.ExportTransactions = channel.unary_stream(
+            "/wallet.WalletService/ExportTransactions",
+            request_serializer=wallet__service_dot_wallet__pb2.ExportTransactionsRequest.SerializeToString,
+            response_deserializer=wallet__service_dot_wallet__pb2.TransactionsChunk.FromString,
+            _registered_method=True,
+        )
+        self.BatchTransfer = channel.stream_stream(
+            "/wallet.WalletService/BatchTransfer",
+            request_serializer=wallet__service_dot_wallet__pb2.TransferRequest.SerializeToString,
+            response_deserializer=wallet__service_dot_wallet__pb2.BatchTransferResult.FromString,
+            _registered_method=True,
+        )
         self.Convert = channel.unary_unary(
             "/wallet.WalletService/Convert",
             request_serializer=wallet__service_dot_wallet__pb2.ConvertRequest.SerializeToString,
@@ -108,12 +138,42 @@ class WalletServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def WatchBalance(self, request, context):
+        """Подписка на изменения баланса: текущий снимок, затем новый снимок после каждой операции"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
     def Transfer(self, request, context):
         """Перевод средств между кошельками"""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def GetOperationStatus(self, request, context):
+        """Статус операции по correlation_id с опциональным ожиданием результата (long-poll)"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def ListTransactions(self, request, context):
+        """История операций кошелька (keyset-пагинация)"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def ExportTransactions(self, request, context):
+        """Выгрузка всей истории операций кошелька частями (для выписок)"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def BatchTransfer(self, request_iterator, context):
+        """Пакетный перевод средств: поток запросов, поток результатов по каждому элементу"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
     def Convert(self, request, context):
         """Конвертация валюты в кошельке"""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -163,11 +223,36 @@ def add_WalletServiceServicer_to_server(servicer, server):
             request_deserializer=wallet__service_dot_wallet__pb2.GetBalanceRequest.FromString,
             response_serializer=wallet__service_dot_wallet__pb2.BalanceResponse.SerializeToString,
         ),
+        "WatchBalance": grpc.unary_stream_rpc_method_handler(
+            servicer.WatchBalance,
+            request_deserializer=wallet__service_dot_wallet__pb2.GetBalanceRequest.FromString,
+            response_serializer=wallet__service_dot_wallet__pb2.BalanceResponse.SerializeToString,
+        ),
         "Transfer": grpc.unary_unary_rpc_method_handler(
             servicer.Transfer,
             request_deserializer=wallet__service_dot_wallet__pb2.TransferRequest.FromString,
             response_serializer=wallet__service_dot_wallet__pb2.OperationResponse.SerializeToString,
         ),
+        "GetOperationStatus": grpc.unary_unary_rpc_method_handler(
+            servicer.GetOperationStatus,
+            request_deserializer=wallet__service_dot_wallet__pb2.OperationStatusRequest.FromString,
+            response_serializer=wallet__service_dot_wallet__pb2.OperationStatusResponse.SerializeToString,
+        ),
+        "ListTransactions": grpc.unary_unary_rpc_method_handler(
+            servicer.ListTransactions,
+            request_deserializer=wallet__service_dot_wallet__pb2.ListTransactionsRequest.FromString,
+            response_serializer=wallet__service_dot_wallet__pb2.ListTransactionsResponse.SerializeToString,
+        ),
+        "ExportTransactions": grpc.unary_stream_rpc_method_handler(
+            servicer.ExportTransactions,
+            request_deserializer=wallet__service_dot_wallet__pb2.ExportTransactionsRequest.FromString,
+            response_serializer=wallet__service_dot_wallet__pb2.TransactionsChunk.SerializeToString,
+        ),
+        "BatchTransfer": grpc.stream_stream_rpc_method_handler(
+            servicer.BatchTransfer,
+            request_deserializer=wallet__service_dot_wallet__pb2.TransferRequest.FromString,
+            response_serializer=wallet__service_dot_wallet__pb2.BatchTransferResult.SerializeToString,
+        ),
         "Convert": grpc.unary_unary_rpc_method_handler(
             servicer.Convert,
             request_deserializer=wallet__service_dot_wallet__pb2.ConvertRequest.FromString,
@@ -270,6 +355,36 @@ class WalletService(object):
             _registered_method=True,
         )
 
+    @staticmethod
+    def WatchBalance(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/wallet.WalletService/WatchBalance",
+            wallet__service_dot_wallet__pb2.GetBalanceRequest.SerializeToString,
+            wallet__service_dot_wallet__pb2.BalanceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
     @staticmethod
     def Transfer(
         request,
@@ -300,6 +415,126 @@ class WalletService(object):
             _registered_method=True,
         )
 
+    @staticmethod
+    def GetOperationStatus(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/wallet.WalletService/GetOperationStatus",
+            wallet__service_dot_wallet__pb2.OperationStatusRequest.SerializeToString,
+            wallet__service_dot_wallet__pb2.OperationStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def ListTransactions(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/wallet.WalletService/ListTransactions",
+            wallet__service_dot_wallet__pb2.ListTransactionsRequest.SerializeToString,
+            wallet__service_dot_wallet__pb2.ListTransactionsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def ExportTransactions(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/wallet.WalletService/ExportTransactions",
+            wallet__service_dot_wallet__pb2.ExportTransactionsRequest.SerializeToString,
+            wallet__service_dot_wallet__pb2.TransactionsChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def BatchTransfer(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            "/wallet.WalletService/BatchTransfer",
+            wallet__service_dot_wallet__pb2.TransferRequest.SerializeToString,
+            wallet__service_dot_wallet__pb2.BatchTransferResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
     @staticmethod
     def Convert(
         request,
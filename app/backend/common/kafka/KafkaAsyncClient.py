@@ -1,3 +1,4 @@
+import asyncio
 import json
 from typing import AsyncGenerator, Any
 from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
@@ -15,14 +16,16 @@ class KafkaAsyncClient:
         self.producer = AIOKafkaProducer(bootstrap_servers=self.kafka_broker)
         await self.producer.start()
 
-    async def init_consumer(self, group_id: str, topics: list[str]):
+    async def init_consumer(
+        self, group_id: str, topics: list[str], max_poll_records: int = 10
+    ):
         self.consumer = AIOKafkaConsumer(
             *topics,
             bootstrap_servers=self.kafka_broker,
             group_id=group_id,
             enable_auto_commit=False,  # Отключаем авто-коммит
             auto_offset_reset="earliest",
-            max_poll_records=10,  # Уменьшите для теста
+            max_poll_records=max_poll_records,
             session_timeout_ms=120000,  # Увеличено до 2 минут
             heartbeat_interval_ms=30000,  # 30 секунд
             request_timeout_ms=120000,
@@ -37,6 +40,17 @@ class KafkaAsyncClient:
     async def produce_message(self, topic: str, message: str):
         await self.producer.send_and_wait(topic, message.encode("utf-8"))
 
+    async def produce_messages(self, topic: str, messages: list[str]):
+        """
+        Пакетная отправка: все сообщения ставятся в буфер продюсера сразу,
+        подтверждения брокера ожидаются одним gather, а не по одному.
+        """
+        futures = [
+            await self.producer.send(topic, message.encode("utf-8"))
+            for message in messages
+        ]
+        await asyncio.gather(*futures)
+
     async def consume_messages(self) -> AsyncGenerator[dict[str, Any], None]:
         async for msg in self.consumer:
             data = json.loads(msg.decode("utf-8"))
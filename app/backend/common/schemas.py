@@ -21,6 +21,7 @@ class WalletTransactionResult(BaseModel):
     )
     correlation_id: str = Field(description="id операции")
     amount: float
+    error: Optional[str] = Field(None, description="Причина ошибки обработки")
 
     def to_dict(self):
         return {
@@ -30,6 +31,7 @@ class WalletTransactionResult(BaseModel):
             "correlation_id": self.correlation_id,
             "idempotency_key": self.idempotency_key,
             "amount": self.amount,
+            "error": self.error,
         }
 
 
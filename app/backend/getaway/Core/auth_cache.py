@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from getaway.Core.config import settings
+from getaway.Core.redis_client import redis_client
+from getaway.app.logger import logger
+
+
+class AuthorizationCache:
+    """
+    LRU of verified access tokens keyed by token hash, plus the hashes revoked
+    by auth on logout. An entry lives for ttl_s, but never past the token exp.
+    """
+
+    def __init__(self, max_size: int, ttl_s: float):
+        self._max_size = max_size
+        self._ttl_s = ttl_s
+        self._entries: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        user_id, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user_id
+
+    def put(self, key: str, user_id: str, exp: float):
+        expires_at = min(time.time() + self._ttl_s, exp)
+        if expires_at <= time.time() or key in self._revoked:
+            return
+        self._entries[key] = (user_id, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def revoke(self, key: str, exp: float):
+        self._entries.pop(key, None)
+        now = time.time()
+        if exp <= now:
+            return
+        if len(self._revoked) >= self._max_size:
+            self._revoked = {k: e for k, e in self._revoked.items() if e > now}
+        self._revoked[key] = exp
+
+    def is_revoked(self, key: str) -> bool:
+        exp = self._revoked.get(key)
+        if exp is None:
+            return False
+        if exp <= time.time():
+            del self._revoked[key]
+            return False
+        return True
+
+    def clear(self):
+        self._entries.clear()
+
+
+class RevocationListener:
+    """
+    Applies token revocations published by auth. After every (re)subscribe the
+    revoked keys already in Redis are loaded, so messages missed while
+    disconnected are not lost.
+    """
+
+    def __init__(
+        self,
+        cache: AuthorizationCache,
+        redis_cli: Redis,
+        channel: str,
+        key_prefix: str,
+        retry_s: float,
+    ):
+        self.cache = cache
+        self.redis_cli = redis_cli
+        self.channel = channel
+        self.key_prefix = key_prefix
+        self.retry_s = retry_s
+
+    async def _load_revoked(self) -> int:
+        loaded = 0
+        keys: list[str] = []
+        async for key in self.redis_cli.scan_iter(
+            match=f"{self.key_prefix}:*", count=500
+        ):
+            keys.append(key)
+            if len(keys) == 500:
+                loaded += await self._apply(keys)
+                keys = []
+        if keys:
+            loaded += await self._apply(keys)
+        return loaded
+
+    async def _apply(self, keys: list[str]) -> int:
+        values = await self.redis_cli.mget(keys)
+        prefix_len = len(self.key_prefix) + 1
+        applied = 0
+        for key, exp in zip(keys, values):
+            if exp is not None:
+                self.cache.revoke(key[prefix_len:], float(exp))
+                applied += 1
+        return applied
+
+    async def run(self):
+        while True:
+            try:
+                async with self.redis_cli.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    loaded = await self._load_revoked()
+                    logger.info(f"Подписка на отзыв токенов, отозвано ранее: {loaded}")
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        data = json.loads(message["data"])
+                        self.cache.revoke(data["hash"], float(data["exp"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Подписка на отзыв токенов прервана: {e}")
+                # Пока подписки нет, отзывы не доходят: проверенные токены
+                # проверяются заново после переподключения
+                self.cache.clear()
+                await asyncio.sleep(self.retry_s)
+
+
+auth_cache = AuthorizationCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE, ttl_s=settings.AUTH_CACHE_TTL_S
+)
+
+revocation_listener = RevocationListener(
+    cache=auth_cache,
+    redis_cli=redis_client,
+    channel=settings.REDIS_REVOKED_CHANNEL,
+    key_prefix=settings.REDIS_KEY_REVOKED,
+    retry_s=settings.REVOCATION_RETRY_S,
+)
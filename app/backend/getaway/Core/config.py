@@ -1,14 +1,27 @@
 from pydantic_settings import SettingsConfigDict, BaseSettings
-from common.Core.config import Google, PaymentStripe
+from common.Core.config import Google, PaymentStripe, Redis, TokenRevocation
 
 
-class Settings(Google, PaymentStripe):
+class Settings(Google, PaymentStripe, Redis, TokenRevocation):
     JWT_ACCESS_COOKIE: str = "access-token"
     JWT_REFRESH_COOKIE: str = "refresh-token"
 
     ACCESS_MAX_AGE_COOKIE_S: int = 604800
     REFRESH_MAX_AGE_COOKIE_S: int = 604800
 
+    BATCH_TRANSFER_MAX_ITEMS: int = 10000
+    BALANCE_STREAM_HEARTBEAT_S: int = 15
+
+    # Ключи auth для локальной проверки access токенов
+    JWT_KEYS_REFRESH_S: float = 300.0
+    JWT_KEYS_MIN_REFRESH_S: float = 30.0
+    JWT_KEYS_RETRY_S: float = 5.0
+
+    # Кэш проверенных access токенов
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    AUTH_CACHE_TTL_S: float = 30.0
+    REVOCATION_RETRY_S: float = 5.0
+
     model_config = SettingsConfigDict(extra="ignore")
 
 
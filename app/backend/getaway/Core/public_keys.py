@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Tuple
+
+import grpc
+import jwt
+from jwt.algorithms import get_default_algorithms
+
+from common.gRpc.auth import auth_pb2
+from getaway.Core.config import settings
+from getaway.Core.grpc_clients.auth_grpc_client import auth_grpc_client
+from getaway.app.logger import logger
+
+
+class PublicKeyCache:
+    """
+    Public keys of the auth service, used to verify access tokens in the
+    gateway. Refreshed in the background and on an unknown kid.
+    """
+
+    def __init__(self, refresh_s: float, min_refresh_s: float, retry_s: float):
+        self._keys: Dict[str, Tuple[str, Any]] = {}
+        self._refresh_s = refresh_s
+        self._min_refresh_s = min_refresh_s
+        self._retry_s = retry_s
+        self._max_age_s = refresh_s
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._keys)
+
+    async def refresh(self, force: bool = True) -> bool:
+        """
+        Загрузка ключей через GetPublicKeys. Без force запрос не чаще
+        min_refresh_s: так неизвестный kid не превращается в поток RPC
+        """
+        async with self._lock:
+            if (
+                not force
+                and time.monotonic() - self._refreshed_at < self._min_refresh_s
+            ):
+                return self.ready
+
+            stub = await auth_grpc_client.get_stub()
+            if stub is None:
+                logger.warning("Не удалось получить ключи: auth недоступен")
+                return False
+            try:
+                res = await stub.GetPublicKeys(
+                    auth_pb2.GetPublicKeysRequest(), timeout=self._retry_s
+                )
+            except grpc.aio.AioRpcError as e:
+                logger.warning(f"Не удалось получить ключи: {e.code()} {e.details()}")
+                return False
+
+            keys = self._parse_keys(res.keys)
+            if not keys:
+                logger.error(
+                    "Auth не вернул ни одного пригодного ключа, набор не изменен"
+                )
+                return False
+
+            self._keys = keys
+            self._max_age_s = res.max_age_s or self._refresh_s
+            self._refreshed_at = time.monotonic()
+            logger.info(f"Ключи auth обновлены: {list(self._keys)}")
+            return self.ready
+
+    def _parse_keys(self, keys) -> Dict[str, Tuple[str, Any]]:
+        """
+        Ключи из ответа GetPublicKeys. Ключ с неизвестным алгоритмом или битым PEM
+        пропускается, для его kid остается прежний ключ, если он был
+        """
+        algorithms = get_default_algorithms()
+        parsed: Dict[str, Tuple[str, Any]] = {}
+        for key in keys:
+            try:
+                parsed[key.kid] = (key.alg, algorithms[key.alg].prepare_key(key.pem))
+            except (KeyError, ValueError, jwt.InvalidKeyError) as e:
+                logger.error(
+                    f"Ключ kid={key.kid} alg={key.alg} пропущен: {type(e).__name__} {e}"
+                )
+                if key.kid in self._keys:
+                    parsed[key.kid] = self._keys[key.kid]
+        return parsed
+
+    def _candidates(self, token: str) -> List[Tuple[str, Any]] | None:
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            # Токены, выпущенные до появления kid
+            return list(self._keys.values())
+        key = self._keys.get(kid)
+        return [key] if key else None
+
+    async def verify(self, token: str, verify_exp: bool = True) -> dict:
+        """Payload access токена; jwt.InvalidTokenError, если токен не прошел проверку"""
+        candidates = self._candidates(token)
+        if candidates is None:
+            await self.refresh(force=False)
+            candidates = self._candidates(token)
+            if candidates is None:
+                raise jwt.InvalidTokenError("Unknown key id")
+
+        error: jwt.InvalidTokenError = jwt.InvalidSignatureError("No keys")
+        for alg, key in candidates:
+            try:
+                return jwt.decode(
+                    token,
+                    key=key,
+                    algorithms=[alg],
+                    options={"verify_exp": verify_exp},
+                )
+            except jwt.InvalidSignatureError as e:
+                error = e
+        raise error
+
+    async def run(self):
+        """Фоновое обновление ключей с периодом max_age_s из ответа auth"""
+        while True:
+            try:
+                ok = await self.refresh()
+            except Exception as e:
+                # Без этого цикла шлюз до перезапуска проверяет токены только через auth
+                logger.error(f"Ошибка обновления ключей auth: {str(e)}")
+                ok = False
+            await asyncio.sleep(self._max_age_s if ok else self._retry_s)
+
+
+public_key_cache = PublicKeyCache(
+    refresh_s=settings.JWT_KEYS_REFRESH_S,
+    min_refresh_s=settings.JWT_KEYS_MIN_REFRESH_S,
+    retry_s=settings.JWT_KEYS_RETRY_S,
+)
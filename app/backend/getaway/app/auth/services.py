@@ -40,20 +40,26 @@ async def login(
     request = auth_pb2.LoginRequest(user_email=data.login, password=data.password)
     result: auth_pb2.LoginResponse = await auth_grpc_stub.Login(request=request)
     response_body = BaseResponse(status=result.meta.status, message=result.meta.message)
-    response_body.detail = utils.parse_grpc_detail(result.meta.detail)
 
-    tokens = response_body.detail.get("tokens")
+    if result.two_factor:
+        response_body.detail = {"2FA": True, "user_id": result.user_id}
 
-    if tokens is not None:
+    if result.HasField("tokens"):
+        response_body.detail = {
+            "tokens": {
+                "jwt_access": result.tokens.jwt_access,
+                "jwt_refresh": result.tokens.jwt_refresh,
+            }
+        }
         response.set_cookie(
             key=settings.JWT_ACCESS_COOKIE,
-            value=tokens.get("jwt_access"),
+            value=result.tokens.jwt_access,
             httponly=True,
             max_age=settings.ACCESS_MAX_AGE_COOKIE_S,
         )
         response.set_cookie(
             key=settings.JWT_REFRESH_COOKIE,
-            value=tokens.get("jwt_refresh"),
+            value=result.tokens.jwt_refresh,
             httponly=True,
             max_age=settings.REFRESH_MAX_AGE_COOKIE_S,
         )
@@ -1,15 +1,25 @@
+import jwt
 from fastapi import Request, Response, HTTPException, Depends
 from common.gRpc.auth import auth_pb2_grpc, auth_pb2
 from common.gRpc.wallet_service import wallet_pb2_grpc
-from common.schemas import BaseResponse
+from getaway.Core.auth_cache import auth_cache
 from getaway.Core.config import settings
 from getaway.Core.grpc_clients.auth_grpc_client import auth_grpc_client
 from getaway.Core.grpc_clients.wallet_grpc_client import wallet_grpc_client
-from getaway.app import utils
+from getaway.Core.public_keys import public_key_cache
 from getaway.app.logger import logger
 from typing import Annotated
 
 
+async def verify_access(jwt_access: str) -> dict | None:
+    """Payload access токена, проверенного локально по ключам auth"""
+    try:
+        return await public_key_cache.verify(jwt_access)
+    except jwt.InvalidTokenError as e:
+        logger.info(f"Access токен не прошел проверку: {e}")
+        return None
+
+
 async def bearer(
     request: Request,
     auth_grpc_stub: auth_pb2_grpc.AuthServiceStub | None = Depends(
@@ -25,66 +35,43 @@ async def bearer(
         if jwt_access is None or jwt_refresh is None:
             raise exc
 
-        if auth_grpc_stub is None:
-            raise Exception("Auth service is unavailable")
-
-        # 1. Проверяем access токен
-        grpc_request = auth_pb2.CheckAccessRequest(jwt_access=jwt_access)
-        res = await auth_grpc_stub.CheckAccess(grpc_request)
+        # 1. Проверяем access токен: кэш, затем подпись локально
+        token_key = auth_cache.key(jwt_access)
+        if (user_id := auth_cache.get(token_key)) is not None:
+            return user_id
+        if auth_cache.is_revoked(token_key):
+            raise exc
 
-        response_body = BaseResponse(
-            status=res.meta.status,
-            message=res.meta.message,
-            detail=utils.parse_grpc_detail(res.meta.detail),
-        )
-        logger.info(f"Ответ от CheckAccessRequest: {response_body.model_dump()}")
+        if public_key_cache.ready:
+            payload = await verify_access(jwt_access)
+            if payload is not None:
+                auth_cache.put(token_key, payload.get("user_id"), payload["exp"])
+                return payload.get("user_id")
 
-        if response_body.status == "success":
-            return response_body.detail.get("payload").get("user_id")
+        if auth_grpc_stub is None:
+            raise Exception("Auth service is unavailable")
 
-        # 2. Обновляем токены
-        grpc_request = auth_pb2.GetNewTokensRequest(
-            jwt_refresh=jwt_refresh,
+        # 2. Проверка с обновлением токенов одним вызовом auth
+        grpc_request = auth_pb2.AuthenticateRequest(
             jwt_access=jwt_access,
+            jwt_refresh=jwt_refresh,
         )
-        res = await auth_grpc_stub.GetNewTokens(grpc_request)
-
-        response_body = BaseResponse(
-            status=res.meta.status,
-            message=res.meta.message,
-            detail=utils.parse_grpc_detail(res.meta.detail),
+        res = await auth_grpc_stub.Authenticate(grpc_request)
+        logger.info(
+            f"Ответ от AuthenticateRequest: {res.meta.status} {res.meta.message}"
         )
-        logger.info(f"Ответ от GetNewTokensRequest: {response_body.model_dump()}")
 
-        if response_body.status != "success":
+        if res.meta.status != "success":
             request.state.clear_cookies = True
             raise exc
 
-        tokens = response_body.detail.get("tokens")
-        new_access = tokens.get("jwt_access")
-        new_refresh = tokens.get("jwt_refresh")
-
-        request.state.new_tokens = {
-            settings.JWT_ACCESS_COOKIE: new_access,
-            settings.JWT_REFRESH_COOKIE: new_refresh,
-        }
-
-        # Проверяем новый access
-        grpc_request = auth_pb2.CheckAccessRequest(jwt_access=new_access)
-        res = await auth_grpc_stub.CheckAccess(grpc_request)
-
-        response_body = BaseResponse(
-            status=res.meta.status,
-            message=res.meta.message,
-            detail=utils.parse_grpc_detail(res.meta.detail),
-        )
-
-        logger.info(f"Ответ от CheckAccessRequest: {response_body.model_dump()}")
-
-        if response_body.status == "success":
-            return response_body.detail.get("payload").get("user_id")
+        if res.HasField("tokens"):
+            request.state.new_tokens = {
+                settings.JWT_ACCESS_COOKIE: res.tokens.jwt_access,
+                settings.JWT_REFRESH_COOKIE: res.tokens.jwt_refresh,
+            }
 
-        raise exc
+        return res.user_id
     except Exception as e:
         request.state.clear_cookies = True
         raise
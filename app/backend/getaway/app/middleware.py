@@ -1,40 +1,68 @@
-from fastapi import FastAPI, Request, Response, Depends
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from getaway.Core.config import settings
-from getaway.app.logger import logger
-from getaway.exceptions.catch_errors import catch_errors
+
+
+def _cookie_headers(state: dict) -> list[tuple[bytes, bytes]]:
+    """Заголовки Set-Cookie по флагам, выставленным эндпоинтом в request.state"""
+    new_tokens = state.get("new_tokens")
+    clear_cookies = state.get("clear_cookies", False)
+    if new_tokens is None and not clear_cookies:
+        return []
+
+    cookies = Response()
+    cookies.raw_headers = []
+
+    if new_tokens is not None:
+        cookies.set_cookie(
+            key=settings.JWT_ACCESS_COOKIE,
+            value=new_tokens[settings.JWT_ACCESS_COOKIE],
+            max_age=settings.ACCESS_MAX_AGE_COOKIE_S,
+            httponly=True,
+            samesite="lax",
+        )
+        cookies.set_cookie(
+            key=settings.JWT_REFRESH_COOKIE,
+            value=new_tokens[settings.JWT_REFRESH_COOKIE],
+            max_age=settings.REFRESH_MAX_AGE_COOKIE_S,
+            httponly=True,
+            samesite="lax",
+        )
+
+    if clear_cookies:
+        cookies.delete_cookie(settings.JWT_ACCESS_COOKIE)
+        cookies.delete_cookie(settings.JWT_REFRESH_COOKIE)
+
+    return cookies.raw_headers
 
 
 # 1. Middleware для обработки Response ПОСЛЕ эндпоинта
-class CookieMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger.info("---Middleware before---")
-        logger.info(f"---Func {call_next.__name__}---")
-        response = await call_next(request)  # Сначала выполняем эндпоинт
-        logger.info(f"--Middleware after--")
-
-        if hasattr(request.state, "new_tokens"):
-            logger.info(f"Устанавливаем куки...")
-            response.set_cookie(
-                key=settings.JWT_ACCESS_COOKIE,
-                value=request.state.new_tokens[settings.JWT_ACCESS_COOKIE],
-                max_age=settings.ACCESS_MAX_AGE_COOKIE_S,
-                httponly=True,
-                samesite="lax",
-            )
-            response.set_cookie(
-                key=settings.JWT_REFRESH_COOKIE,
-                value=request.state.new_tokens[settings.JWT_REFRESH_COOKIE],
-                max_age=settings.REFRESH_MAX_AGE_COOKIE_S,
-                httponly=True,
-                samesite="lax",
-            )
-            logger.info(f"Куки установлены")
-
-        if getattr(request.state, "clear_cookies", False):
-            logger.info(f"Удаляем куки")
-            response.delete_cookie(settings.JWT_ACCESS_COOKIE)
-            response.delete_cookie(settings.JWT_REFRESH_COOKIE)
-            logger.info(f"Куки удалены")
-
-        return response
+class CookieMiddleware:
+    """
+    Sets or clears the JWT cookies requested by the endpoint through
+    request.state. Plain ASGI: the Set-Cookie headers are appended to
+    http.response.start, the body is passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # request.state эндпоинта пишет в этот же словарь
+        state: dict = scope.setdefault("state", {})
+
+        async def send_with_cookies(message: Message):
+            if message["type"] == "http.response.start":
+                cookie_headers = _cookie_headers(state)
+                if cookie_headers:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in cookie_headers:
+                        headers.append(name.decode("latin-1"), value.decode("latin-1"))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookies)
@@ -1,5 +1,14 @@
 import stripe
-from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Response,
+    Request,
+    UploadFile,
+    Query,
+)
 from google.protobuf.json_format import MessageToDict, ParseDict
 
 from getaway.Core.config import settings
@@ -12,6 +21,7 @@ from getaway.app.logger import logger
 from getaway.exceptions.catch_errors import catch_errors
 from common.Metrics.metrics import func_work_time
 from fastapi.responses import RedirectResponse
+from typing import Literal
 
 router = APIRouter()
 
@@ -69,6 +79,71 @@ async def get_balance(
     )
 
 
+@router.get("/balance/stream")
+@catch_errors(logger=logger)
+async def watch_balance(
+    wallet_grpc_stub: dependencies.WalletServiceStub,
+    user_id: dependencies.Bearer,
+    currency: Optional[ValuteCode] = None,
+):
+    """
+    Подписка на изменения баланса (Server-Sent Events).
+    Сразу отдает текущий баланс, затем новый снимок после каждой операции.
+    """
+    return await services.watch_balance(
+        currency=currency, wallet_grpc_stub=wallet_grpc_stub, user_id=user_id
+    )
+
+
+@router.get("/transactions", response_model=TransactionsPage)
+@catch_errors(logger=logger)
+async def list_transactions(
+    wallet_grpc_stub: dependencies.WalletServiceStub,
+    user_id: dependencies.Bearer,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    operation_type: Optional[OperationType] = None,
+    currency: Optional[ValuteCode] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """История операций кошелька (от новых к старым, пагинация по курсору)"""
+    logger.info(f"--Запрос истории операций--")
+    return await services.list_transactions(
+        wallet_grpc_stub=wallet_grpc_stub,
+        user_id=user_id,
+        limit=limit,
+        cursor=cursor,
+        operation_type=operation_type,
+        currency=currency,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+
+@router.get("/transactions/export")
+@catch_errors(logger=logger)
+async def export_transactions(
+    wallet_grpc_stub: dependencies.WalletServiceStub,
+    user_id: dependencies.Bearer,
+    format: Literal["csv", "ndjson"] = "csv",
+    operation_type: Optional[OperationType] = None,
+    currency: Optional[ValuteCode] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """Выписка по всем операциям кошелька за период (CSV или NDJSON)"""
+    return await services.export_transactions(
+        wallet_grpc_stub=wallet_grpc_stub,
+        user_id=user_id,
+        export_format=format,
+        operation_type=operation_type,
+        currency=currency,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+
 @router.post("/transfer", response_model=OperationResponse)
 @catch_errors(logger=logger)
 async def transfer_funds(
@@ -99,6 +174,48 @@ async def transfer_funds(
     )
 
 
+@router.post("/transfer/batch")
+@catch_errors(logger=logger)
+async def batch_transfer_funds(
+    file: UploadFile,
+    wallet_grpc_stub: dependencies.WalletServiceStub,
+    user_id: dependencies.Bearer,
+):
+    """
+    Пакетный перевод средств.
+    Принимает NDJSON или CSV, возвращает NDJSON-поток результатов по каждой строке.
+    """
+    return await services.batch_transfer(
+        file=file, wallet_grpc_stub=wallet_grpc_stub, user_id=user_id
+    )
+
+
+@router.get("/operations/{correlation_id}", response_model=OperationStatusResponse)
+@catch_errors(logger=logger)
+async def get_operation_status(
+    correlation_id: str,
+    wallet_grpc_stub: dependencies.WalletServiceStub,
+    user_id: dependencies.Bearer,
+    wait: float = Query(
+        0, ge=0, le=30, description="Сколько секунд ждать результата операции"
+    ),
+):
+    """Статус операции по correlation_id (long-poll при wait > 0)"""
+    logger.info(f"--Запрос статуса операции--")
+    request_to_grpc = wallet_pb2.OperationStatusRequest(
+        user_id=user_id,
+        correlation_id=correlation_id,
+        wait_ms=int(wait * 1000),
+    )
+    response_from_grpc = await wallet_grpc_stub.GetOperationStatus(
+        request=request_to_grpc
+    )
+    result = MessageToDict(response_from_grpc, preserving_proto_field_name=True)
+    logger.info(f"Ответ: {result}")
+
+    return OperationStatusResponse(**result)
+
+
 @router.post("/convert", response_model=OperationResponse)
 @catch_errors(logger=logger)
 async def convert_currency(
@@ -1,7 +1,13 @@
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field, field_validator
-from common.Enums import ValuteCode, PaymentWorker, TransactionStatus, WalletAccountType
+from common.Enums import (
+    ValuteCode,
+    PaymentWorker,
+    TransactionStatus,
+    WalletAccountType,
+    OperationType,
+)
 from common.schemas import BaseResponse
 
 
@@ -41,6 +47,14 @@ class TransferRequest(BaseModel):
     idempotency_key: str
 
 
+class BatchTransferItemResult(BaseModel):
+    index: int = Field(..., description="Номер строки в загруженном файле (с нуля)")
+    idempotency_key: str
+    correlation_id: Optional[str] = None
+    status: TransactionStatus
+    error: Optional[str] = None
+
+
 class DepositRequest(BaseModel):
     user_id: str = Field(..., description="ID пользователя")
     amount: float
@@ -61,6 +75,31 @@ class OperationResponse(BaseModel):
     status: TransactionStatus
 
 
+class OperationStatusResponse(BaseModel):
+    correlation_id: str
+    status: TransactionStatus
+    operation: Optional[OperationType] = None
+    amount: Optional[float] = None
+    error: Optional[str] = None
+
+
+class TransactionEntry(BaseModel):
+    id: int
+    correlation_id: Optional[str] = None
+    operation_type: OperationType
+    status: TransactionStatus
+    currency: Optional[ValuteCode] = None
+    amount: float
+    date: datetime
+
+
+class TransactionsPage(BaseModel):
+    transactions: List[TransactionEntry]
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы, отсутствует на последней"
+    )
+
+
 class CreatePaymentTransactionRequest(BaseModel):
     amount: float
     currency: ValuteCode
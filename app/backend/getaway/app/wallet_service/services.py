@@ -1,8 +1,19 @@
+import asyncio
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Literal
+
+import grpc
 import stripe
 from google.protobuf.json_format import MessageToDict
-from fastapi import Request, HTTPException
+from fastapi import Request, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
-from common.Enums import PaymentWorker, ValuteCode
+from common.Enums import PaymentWorker, ValuteCode, OperationType, TransactionStatus
 from common.gRpc.wallet_service import wallet_pb2
 from getaway.Core.config import settings
 from getaway.app import dependencies
@@ -12,9 +23,296 @@ from getaway.app.wallet_service.schemas import (
     PaymentTransactionResponse,
     OperationResponse,
     StripeCallbackData,
+    TransferRequest,
+    BatchTransferItemResult,
+    BalanceResponse,
+    BalanceEntry,
+    TransactionsPage,
 )
 
 
+async def upload_lines(
+    file: UploadFile, chunk_size: int = 64 * 1024
+) -> AsyncIterator[str]:
+    """Непустые строки загруженного файла, файл читается частями по chunk_size"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    while chunk := await file.read(chunk_size):
+        tail += decoder.decode(chunk)
+        *lines, tail = tail.split("\n")
+        for line in lines:
+            if line.strip():
+                yield line.rstrip("\r")
+    tail += decoder.decode(b"", final=True)
+    if tail.strip():
+        yield tail.rstrip("\r")
+
+
+def parse_transfer_row(line: str, header: list[str] | None) -> dict:
+    """Строка файла: CSV с колонками header или объект NDJSON"""
+    if header is None:
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError("Строка NDJSON должна быть объектом")
+        return row
+
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        raise ValueError(f"Ожидалось колонок: {len(header)}, получено: {len(values)}")
+    return dict(zip(header, values))
+
+
+def failed_row(index: int, row: dict | None, error: str) -> BatchTransferItemResult:
+    key = row.get("idempotency_key") if row else None
+    return BatchTransferItemResult(
+        index=index,
+        idempotency_key=key if isinstance(key, str) else "",
+        status=TransactionStatus.FAILED,
+        error=error,
+    )
+
+
+async def batch_transfer(
+    file: UploadFile,
+    wallet_grpc_stub: dependencies.WalletServiceStub,
+    user_id: dependencies.Bearer,
+) -> StreamingResponse:
+    """
+    Пакетный перевод средств из файла.
+    CSV (с заголовком receiver_user_id,amount,currency,idempotency_key)
+    или NDJSON (по одному объекту TransferRequest на строку).
+    Файл читается построчно; некорректная строка получает результат FAILED,
+    остальные строки пакета обрабатываются.
+    """
+    logger.info(f"--Пакетный перевод средств--")
+    is_csv = (file.filename or "").lower().endswith(".csv") or (
+        file.content_type or ""
+    ).startswith("text/csv")
+
+    lines = upload_lines(file)
+    first = await anext(lines, None)
+    if first is None:
+        raise ValueError("Файл не содержит операций")
+    header = next(csv.reader([first])) if is_csv else None
+
+    # Индекс строки файла для каждого отправленного в wallet_service перевода
+    row_indices: list[int] = []
+    rejected: list[BatchTransferItemResult] = []
+
+    async def rows() -> AsyncIterator[str]:
+        if header is None:
+            yield first
+        async for line in lines:
+            yield line
+
+    async def request_iterator() -> AsyncIterator[wallet_pb2.TransferRequest]:
+        index = 0
+        async for line in rows():
+            row = None
+            try:
+                if index >= settings.BATCH_TRANSFER_MAX_ITEMS:
+                    raise ValueError(
+                        f"Слишком много операций в файле (максимум {settings.BATCH_TRANSFER_MAX_ITEMS})"
+                    )
+                row = parse_transfer_row(line, header)
+                item = TransferRequest(**row)
+            except ValidationError as e:
+                rejected.append(
+                    failed_row(index, row, f"Некорректная строка: {e.errors()}")
+                )
+            except ValueError as e:
+                rejected.append(failed_row(index, row, str(e)))
+            else:
+                row_indices.append(index)
+                yield wallet_pb2.TransferRequest(
+                    from_user_id=user_id,
+                    to_user_id=item.receiver_user_id,
+                    amount=item.amount,
+                    currency=item.currency.value,
+                    idempotency_key=item.idempotency_key,
+                )
+            index += 1
+        logger.info(f"Строк в пакете: {index}, отклонено: {len(rejected)}")
+
+    call = wallet_grpc_stub.BatchTransfer(request_iterator())
+
+    async def results() -> AsyncIterator[str]:
+        async for result in call:
+            index = row_indices[result.index]
+            # Отклоненные строки перед этой уходят в поток по порядку файла
+            while rejected and rejected[0].index < index:
+                yield rejected.pop(0).model_dump_json() + "\n"
+            item = BatchTransferItemResult(
+                index=index,
+                idempotency_key=result.idempotency_key,
+                correlation_id=result.correlation_id or None,
+                status=result.status,
+                error=result.error or None,
+            )
+            yield item.model_dump_json() + "\n"
+        for item in rejected:
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+async def watch_balance(
+    currency: ValuteCode | None,
+    wallet_grpc_stub: dependencies.WalletServiceStub,
+    user_id: dependencies.Bearer,
+) -> StreamingResponse:
+    """Server-Sent Events с актуальным балансом после каждой операции"""
+    logger.info(f"--Подписка на изменения баланса--")
+    request_to_grpc = wallet_pb2.GetBalanceRequest(user_id=user_id)
+
+    if currency is not None and currency.value:
+        request_to_grpc.currency = currency.value
+
+    call = wallet_grpc_stub.WatchBalance(request_to_grpc)
+
+    async def events() -> AsyncIterator[str]:
+        read = asyncio.ensure_future(call.read())
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {read}, timeout=settings.BALANCE_STREAM_HEARTBEAT_S
+                )
+                if not done:
+                    # Комментарий SSE, чтобы прокси не закрывали простаивающее соединение
+                    yield ": keepalive\n\n"
+                    continue
+
+                response = read.result()
+                if response is grpc.aio.EOF:
+                    break
+
+                result = MessageToDict(response, preserving_proto_field_name=True)
+                balance = BalanceResponse(
+                    user_id=result.get("user_id"),
+                    balances=[
+                        BalanceEntry(**data) for data in result.get("balances", [])
+                    ],
+                )
+                yield f"event: balance\ndata: {balance.model_dump_json()}\n\n"
+                read = asyncio.ensure_future(call.read())
+        finally:
+            read.cancel()
+            call.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def history_filters(
+    operation_type: OperationType | None,
+    currency: ValuteCode | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+) -> dict:
+    """Необязательные фильтры истории операций для gRPC запроса"""
+    filters = {
+        "operation_type": operation_type.value if operation_type else None,
+        "currency": currency.value if currency else None,
+        "date_from": date_from.isoformat() if date_from else None,
+        "date_to": date_to.isoformat() if date_to else None,
+    }
+    return {key: value for key, value in filters.items() if value is not None}
+
+
+async def list_transactions(
+    wallet_grpc_stub: dependencies.WalletServiceStub,
+    user_id: dependencies.Bearer,
+    limit: int,
+    cursor: str | None,
+    operation_type: OperationType | None,
+    currency: ValuteCode | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+) -> TransactionsPage:
+    """Страница истории операций"""
+    request_to_grpc = wallet_pb2.ListTransactionsRequest(
+        user_id=user_id,
+        limit=limit,
+        **history_filters(operation_type, currency, date_from, date_to),
+    )
+    if cursor:
+        request_to_grpc.cursor = cursor
+
+    response_from_grpc = await wallet_grpc_stub.ListTransactions(request_to_grpc)
+    result = MessageToDict(response_from_grpc, preserving_proto_field_name=True)
+
+    return TransactionsPage(
+        transactions=result.get("transactions", []),
+        next_cursor=result.get("next_cursor"),
+    )
+
+
+EXPORT_FIELDS = [
+    "id",
+    "correlation_id",
+    "operation_type",
+    "status",
+    "currency",
+    "amount",
+    "date",
+]
+
+
+async def export_transactions(
+    wallet_grpc_stub: dependencies.WalletServiceStub,
+    user_id: dependencies.Bearer,
+    export_format: Literal["csv", "ndjson"],
+    operation_type: OperationType | None,
+    currency: ValuteCode | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+) -> StreamingResponse:
+    """Выписка по кошельку в CSV/NDJSON, отдается по мере чтения из wallet_service"""
+    logger.info(f"--Выгрузка истории операций в {export_format}--")
+    request_to_grpc = wallet_pb2.ExportTransactionsRequest(
+        user_id=user_id,
+        **history_filters(operation_type, currency, date_from, date_to),
+    )
+    call = wallet_grpc_stub.ExportTransactions(request_to_grpc)
+
+    def to_rows(chunk: wallet_pb2.TransactionsChunk) -> list[dict]:
+        return [
+            {field: getattr(tx, field) for field in EXPORT_FIELDS}
+            for tx in chunk.transactions
+        ]
+
+    async def csv_lines() -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        async for chunk in call:
+            writer.writerows(to_rows(chunk))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        async for chunk in call:
+            yield "".join(json.dumps(row) + "\n" for row in to_rows(chunk))
+
+    if export_format == "csv":
+        content, media_type = csv_lines(), "text/csv"
+    else:
+        content, media_type = ndjson_lines(), "application/x-ndjson"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="statement.{export_format}"'
+        },
+    )
+
+
 async def stripe_withdraw(
     request_data: StripeWithdrawRequest,
     wallet_grpc_stub: dependencies.WalletServiceStub,
@@ -1,10 +1,29 @@
+import asyncio
+from contextlib import asynccontextmanager
 import grpc.aio
 from fastapi import FastAPI
 from getaway.app import router
+from getaway.Core.auth_cache import revocation_listener
+from getaway.Core.public_keys import public_key_cache
 from getaway.app.middleware import CookieMiddleware
 from getaway.exceptions.exceptions_handlers import *
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = [
+        asyncio.create_task(public_key_cache.run()),
+        asyncio.create_task(revocation_listener.run()),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Your API",
     description="API documentation for your project",
     version="1.0.0",
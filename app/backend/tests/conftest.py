@@ -0,0 +1,35 @@
+import os
+import sys
+from pathlib import Path
+
+# Сервисы импортируются как пакеты верхнего уровня из app/backend
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Настройки сервисов читаются из окружения при импорте. Тестам не нужны
+# настоящие Postgres, Redis, Stripe и Google: подключения не открываются
+TEST_ENV = {
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_DB": "0",
+    "REDIS_KEY_IDEMPOTENCY": "idemp",
+    "REDIS_KEY_SESSIONS": "sessions",
+    "REDIS_KEY_OPT": "2fa",
+    "REDIS_SESSIONS_LIVE": "604800",
+    "MAX_SESSIONS": "5",
+    "STRIPE_PUBLIC_KEY": "test",
+    "STRIPE_PRIVATE_KEY": "test",
+    "STRIPE_WEBHOOK_SECRET": "test",
+    "STRIPE_WEBHOOK_PAYOUT_SECRET": "test",
+    "GOOGLE_CLIENT_ID": "test",
+    "GOOGLE_CLIENT_SECRET": "test",
+    "GOOGLE_TOKEN_URL": "http://localhost",
+    "GOOGLE_USERINFO_URL": "http://localhost",
+    "NOVAFIN_URL": "http://localhost",
+}
+for name, value in TEST_ENV.items():
+    os.environ.setdefault(name, value)
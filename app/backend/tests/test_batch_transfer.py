@@ -0,0 +1,164 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from common.gRpc.wallet_service import wallet_pb2
+from wallet_service.app.gRpc import WalletServiceServicer as servicer_module
+from wallet_service.app.gRpc.WalletServiceServicer import WalletServiceServicer
+from wallet_service.app.services.WalletCore import WalletCore
+
+
+class _Session:
+    async def commit(self):
+        pass
+
+
+@asynccontextmanager
+async def _session_factory():
+    yield _Session()
+
+
+async def _batch_transfer(session, items):
+    return [
+        {
+            "index": item["index"],
+            "idempotency_key": item["idempotency_key"],
+            "status": "PROCESSED",
+        }
+        for item in items
+    ]
+
+
+async def _remember_noop(results):
+    pass
+
+
+async def _requests(user_ids):
+    for i, (from_user_id, to_user_id) in enumerate(user_ids):
+        yield wallet_pb2.TransferRequest(
+            from_user_id=from_user_id,
+            to_user_id=to_user_id,
+            amount=1,
+            currency="RUB",
+            idempotency_key=f"key-{i}",
+        )
+
+
+def test_batch_transfer_rejects_malformed_item_without_aborting(monkeypatch):
+    monkeypatch.setattr(
+        servicer_module.async_database_helper, "session_factory", _session_factory
+    )
+    monkeypatch.setattr(servicer_module.wallet_core, "batch_transfer", _batch_transfer)
+    monkeypatch.setattr(
+        servicer_module.wallet_core, "remember_batch_transfer", _remember_noop
+    )
+    monkeypatch.setattr(servicer_module.settings, "BATCH_TRANSFER_CHUNK_SIZE", 2)
+
+    async def collect():
+        stream = WalletServiceServicer().BatchTransfer(
+            _requests([("1", "2"), ("abc", "2"), ("3", "4"), ("5", "6"), ("", "1")]),
+            None,
+        )
+        return [result async for result in stream]
+
+    results = asyncio.run(collect())
+
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert [result.status for result in results] == [
+        "PROCESSED",
+        "FAILED",
+        "PROCESSED",
+        "PROCESSED",
+        "FAILED",
+    ]
+    assert results[1].idempotency_key == "key-1"
+    assert results[1].error
+
+
+class _Rows:
+    def all(self):
+        return [(1, 10), (2, 20)]
+
+
+class _FailingInsertSession:
+    async def execute(self, stmt, params=None):
+        if params is not None:
+            raise DBAPIError("INSERT", params, Exception("insert failed"))
+        return _Rows()
+
+    async def flush(self):
+        pass
+
+
+class _Kafka:
+    def __init__(self):
+        self.sent = []
+
+    async def send_many(self, topic, payloads):
+        self.sent.extend(payloads)
+
+
+class _Idempotency:
+    def __init__(self):
+        self.remembered = []
+
+    async def exists_many(self, keys):
+        return [False] * len(keys)
+
+    async def remember_many(self, keys):
+        self.remembered.extend(keys)
+
+
+def test_batch_transfer_sends_nothing_when_insert_fails():
+    core = WalletCore.__new__(WalletCore)
+    core.kafka, core.idemp = _Kafka(), _Idempotency()
+    items = [
+        {
+            "index": 0,
+            "sender_id": 1,
+            "recipient_id": 2,
+            "amount": 5,
+            "currency": "RUB",
+            "idempotency_key": "key-0",
+        }
+    ]
+
+    with pytest.raises(DBAPIError):
+        asyncio.run(core.batch_transfer(session=_FailingInsertSession(), items=items))
+
+    assert core.kafka.sent == []
+    assert core.idemp.remembered == []
+
+
+def test_batch_transfer_remembers_keys_only_after_commit(monkeypatch):
+    remembered = []
+
+    class _FailingCommitSession(_Session):
+        async def commit(self):
+            raise DBAPIError("COMMIT", None, Exception("commit failed"))
+
+    @asynccontextmanager
+    async def failing_commit_factory():
+        yield _FailingCommitSession()
+
+    async def remember(results):
+        remembered.extend(results)
+
+    monkeypatch.setattr(
+        servicer_module.async_database_helper, "session_factory", failing_commit_factory
+    )
+    monkeypatch.setattr(servicer_module.wallet_core, "batch_transfer", _batch_transfer)
+    monkeypatch.setattr(
+        servicer_module.wallet_core, "remember_batch_transfer", remember
+    )
+
+    with pytest.raises(DBAPIError):
+        asyncio.run(
+            WalletServiceServicer._batch_transfer_chunk(
+                [{"index": 0, "idempotency_key": "key-0"}], []
+            )
+        )
+
+    assert remembered == []
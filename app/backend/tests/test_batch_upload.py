@@ -0,0 +1,107 @@
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+import getaway.main  # noqa: F401  порядок импорта как при запуске шлюза
+from getaway.app.wallet_service import services
+
+
+class _Stub:
+    def __init__(self):
+        self.requests = []
+
+    def BatchTransfer(self, request_iterator):
+        async def results():
+            async for request in request_iterator:
+                index = len(self.requests)
+                self.requests.append(request)
+                yield SimpleNamespace(
+                    index=index,
+                    idempotency_key=request.idempotency_key,
+                    correlation_id="",
+                    status="PROCESSED",
+                    error="",
+                )
+
+        return results()
+
+
+def _upload(content: bytes, filename: str):
+    return SimpleNamespace(
+        filename=filename, content_type=None, file=io.BytesIO(content)
+    )
+
+
+def _run(content: bytes, filename: str):
+    upload = _upload(content, filename)
+
+    async def read(size=-1):
+        return upload.file.read(size)
+
+    upload.read = read
+    stub = _Stub()
+
+    async def collect():
+        response = await services.batch_transfer(upload, stub, "1")
+        return [json.loads(line) async for line in response.body_iterator]
+
+    return asyncio.run(collect()), stub
+
+
+def test_csv_upload_rejects_bad_rows_per_item(monkeypatch):
+    monkeypatch.setattr(services, "upload_lines", _small_chunks)
+    content = (
+        "receiver_user_id,amount,currency,idempotency_key\n"
+        "2,10,RUB,key-0\n"
+        "3,abc,RUB,key-1\n"
+        "4,10,RUB\n"
+        "5,10,RUB,key-3\n"
+    ).encode("utf-8")
+
+    results, stub = _run(content, "batch.csv")
+
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["status"] for r in results] == [
+        "PROCESSED",
+        "FAILED",
+        "FAILED",
+        "PROCESSED",
+    ]
+    assert results[1]["idempotency_key"] == "key-1"
+    assert results[1]["error"]
+    assert [r.idempotency_key for r in stub.requests] == ["key-0", "key-3"]
+
+
+def test_ndjson_upload_rejects_bad_lines_per_item(monkeypatch):
+    monkeypatch.setattr(services, "upload_lines", _small_chunks)
+    rows = [
+        json.dumps(
+            {
+                "receiver_user_id": "2",
+                "amount": 10,
+                "currency": "RUB",
+                "idempotency_key": "key-0",
+            }
+        ),
+        "{not json",
+        "[1, 2]",
+    ]
+    content = "\n".join(rows).encode("utf-8")
+
+    results, stub = _run(content, "batch.ndjson")
+
+    assert [(r["index"], r["status"]) for r in results] == [
+        (0, "PROCESSED"),
+        (1, "FAILED"),
+        (2, "FAILED"),
+    ]
+    assert len(stub.requests) == 1
+
+
+def _small_chunks(file, chunk_size=64 * 1024):
+    # Маленькие куски проверяют склейку строк на границах чтения
+    return _original_upload_lines(file, chunk_size=7)
+
+
+_original_upload_lines = services.upload_lines
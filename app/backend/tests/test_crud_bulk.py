@@ -0,0 +1,144 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import DateTime, Integer, String, UniqueConstraint, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from common.crud import CrudDb
+from common.crud.CrudDb import CRUD
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Account(Base):
+    __tablename__ = "accounts"
+    __table_args__ = (UniqueConstraint("owner", "currency"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    owner: Mapped[int] = mapped_column(Integer)
+    currency: Mapped[str] = mapped_column(String)
+    amount: Mapped[int] = mapped_column(Integer)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class _Result:
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class RecordingSession:
+    """Собирает запросы, скомпилированные для PostgreSQL, без подключения к базе"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt.compile(dialect=postgresql.dialect()))
+        return _Result()
+
+
+def _run(call, *args, **kwargs) -> RecordingSession:
+    session = RecordingSession()
+    asyncio.run(call(session, Account, *args, **kwargs))
+    return session
+
+
+def _rows(count: int, **overrides):
+    return [
+        {"owner": i, "currency": "RUB", "amount": i, **overrides} for i in range(count)
+    ]
+
+
+def test_statements_stay_under_bind_param_limit(monkeypatch):
+    # 5 колонок таблицы: по 2 строки на запрос
+    monkeypatch.setattr(CrudDb, "MAX_BIND_PARAMS", 10)
+
+    created = _run(CRUD.bulk_create, _rows(5))
+    updated = _run(CRUD.bulk_update, [{"id": i, "amount": i} for i in range(5)])
+    upserted = _run(
+        CRUD.upsert_many,
+        _rows(5),
+        conflict_cols=["owner", "currency"],
+        update_cols=["amount"],
+    )
+
+    for session in (created, updated, upserted):
+        assert len(session.statements) == 3
+        assert all(len(s.params) <= 10 for s in session.statements)
+
+
+def test_real_limit_splits_large_batches():
+    rows_per_chunk = CrudDb.MAX_BIND_PARAMS // len(Account.__table__.columns)
+
+    session = _run(CRUD.bulk_create, _rows(rows_per_chunk + 1))
+
+    assert len(session.statements) == 2
+    assert all(len(s.params) <= CrudDb.MAX_BIND_PARAMS for s in session.statements)
+
+
+@pytest.mark.parametrize(
+    "call, kwargs",
+    [
+        (CRUD.bulk_create, {}),
+        (CRUD.bulk_update, {}),
+        (CRUD.upsert_many, {"conflict_cols": ["owner", "currency"]}),
+    ],
+)
+def test_rows_with_different_keys_are_rejected(call, kwargs):
+    rows = [
+        {"id": 1, "owner": 1, "currency": "RUB", "amount": 1},
+        {"id": 2, "owner": 2, "currency": "RUB"},
+    ]
+
+    with pytest.raises(ValueError, match="same keys"):
+        _run(call, rows, **kwargs)
+
+
+def test_upsert_keeps_last_row_per_conflict_key():
+    rows = [
+        {"owner": 1, "currency": "RUB", "amount": 1},
+        {"owner": 2, "currency": "RUB", "amount": 2},
+        {"owner": 1, "currency": "RUB", "amount": 3},
+    ]
+
+    session = _run(
+        CRUD.upsert_many,
+        rows,
+        conflict_cols=["owner", "currency"],
+        update_cols=["amount"],
+    )
+
+    (stmt,) = session.statements
+    amounts = sorted(v for k, v in stmt.params.items() if k.startswith("amount"))
+    assert amounts == [2, 3]
+
+
+def test_upsert_applies_onupdate_columns():
+    session = _run(
+        CRUD.upsert_many,
+        _rows(1),
+        conflict_cols=["owner", "currency"],
+        update_cols=["amount"],
+    )
+
+    sql = str(session.statements[0])
+    assert "amount = excluded.amount" in sql
+    assert "updated_at = now()" in sql
+
+
+def test_upsert_without_update_cols_does_nothing_on_conflict():
+    session = _run(CRUD.upsert_many, _rows(1), conflict_cols=["owner", "currency"])
+
+    on_conflict = str(session.statements[0]).split("ON CONFLICT")[1]
+    on_conflict = on_conflict.split("RETURNING")[0]
+    assert "DO NOTHING" in on_conflict
+    assert "updated_at" not in on_conflict
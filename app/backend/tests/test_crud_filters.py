@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from sqlalchemy import Integer, String
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from common.crud.CrudDb import CRUD
+
+pytest.importorskip("aiosqlite")
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    a: Mapped[int] = mapped_column(Integer)
+    b: Mapped[str] = mapped_column(String, nullable=True)
+
+
+async def _with_items(check):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add_all(
+                [
+                    Item(id=1, a=1, b="x"),
+                    Item(id=2, a=1, b="y"),
+                    Item(id=3, a=2, b="x"),
+                    Item(id=4, a=2, b=None),
+                ]
+            )
+            await session.flush()
+            await check(session)
+    finally:
+        await engine.dispose()
+
+
+def test_every_filter_binds_its_own_value():
+    async def check(session):
+        for a, b, item_id in [(1, "x", 1), (1, "y", 2), (2, "x", 3)]:
+            item = await CRUD.get_one(session, Item, a=a, b=b)
+            assert item.id == item_id
+            assert await CRUD.get_scalar(session, Item.id, a=a, b=b) == item_id
+            assert await CRUD.exists(session, Item, a=a, b=b)
+        assert await CRUD.get_one(session, Item, a=2, b="y") is None
+        assert not await CRUD.exists(session, Item, a=2, b="y")
+        assert (await CRUD.get_one(session, Item, a=2, b=None)).id == 4
+
+    asyncio.run(_with_items(check))
+
+
+def test_filters_compile_to_distinct_params():
+    from sqlalchemy import select
+
+    from common.Enums.ValuteCode import ValuteCode
+    from common.Models import WalletAccount
+
+    stmt = CRUD._where(
+        select(WalletAccount),
+        WalletAccount,
+        {"wallet_id": 8, "currency_code": ValuteCode.RUB},
+    )
+    params = list(stmt.compile().params.values())
+    assert params == [8, ValuteCode.RUB]
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from common.Metrics.pool import InstrumentedQueuePool, PoolMetrics
+
+
+class _Connection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _slow_connect():
+    time.sleep(0.05)
+    return _Connection()
+
+
+def _pool(**kwargs) -> InstrumentedQueuePool:
+    pool = InstrumentedQueuePool(_slow_connect, **kwargs)
+    pool.metrics = PoolMetrics("test")
+    return pool
+
+
+def _in_greenlet(fn):
+    # AsyncAdaptedQueuePool ждет соединение через await_only
+    return asyncio.run(greenlet_spawn(fn))
+
+
+def test_queue_wait_excludes_connect_time():
+    pool = _pool(pool_size=1, max_overflow=0)
+
+    def checkout_twice():
+        pool.connect().close()
+        pool.connect().close()
+
+    _in_greenlet(checkout_twice)
+    snapshot = pool.metrics.collect()
+
+    assert snapshot["checkouts"] == 2
+    assert snapshot["connects"] == 1
+    assert snapshot["connect_max_ms"] >= 50
+    assert snapshot["queue_wait_max_ms"] < 50
+
+
+def test_queue_timeout_is_counted():
+    pool = _pool(pool_size=1, max_overflow=0, timeout=0.01)
+
+    def checkout_over_limit():
+        held = pool.connect()
+        try:
+            pool.connect()
+        finally:
+            held.close()
+
+    with pytest.raises(PoolTimeoutError):
+        _in_greenlet(checkout_over_limit)
+
+    snapshot = pool.metrics.collect()
+    assert snapshot["queue_timeouts"] == 1
+    assert snapshot["queue_wait_max_ms"] >= 10
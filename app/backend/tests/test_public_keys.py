@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+import getaway.main  # noqa: F401  порядок импорта как при запуске шлюза
+from common.gRpc.auth import auth_pb2
+from getaway.Core import public_keys
+from getaway.Core.public_keys import PublicKeyCache
+
+
+def _public_pem() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return (
+        key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("ascii")
+    )
+
+
+class _Stub:
+    def __init__(self, keys):
+        self.keys = keys
+
+    async def GetPublicKeys(self, request, timeout=None):
+        return auth_pb2.GetPublicKeysResponse(keys=self.keys, max_age_s=60)
+
+
+def _serve_keys(monkeypatch, keys):
+    async def get_stub():
+        return _Stub(keys)
+
+    monkeypatch.setattr(public_keys.auth_grpc_client, "get_stub", get_stub)
+
+
+def _cache() -> PublicKeyCache:
+    return PublicKeyCache(refresh_s=60, min_refresh_s=1, retry_s=1)
+
+
+def test_refresh_skips_unsupported_and_broken_keys(monkeypatch):
+    cache = _cache()
+    _serve_keys(
+        monkeypatch,
+        [
+            auth_pb2.PublicKey(kid="good", alg="RS256", pem=_public_pem()),
+            auth_pb2.PublicKey(kid="unknown-alg", alg="XS999", pem=_public_pem()),
+            auth_pb2.PublicKey(kid="bad-pem", alg="RS256", pem="not a key"),
+        ],
+    )
+
+    assert asyncio.run(cache.refresh()) is True
+    assert set(cache._keys) == {"good"}
+
+
+def test_refresh_keeps_previous_keys_when_all_are_bad(monkeypatch):
+    cache = _cache()
+    _serve_keys(
+        monkeypatch, [auth_pb2.PublicKey(kid="k1", alg="RS256", pem=_public_pem())]
+    )
+    asyncio.run(cache.refresh())
+    previous = dict(cache._keys)
+
+    _serve_keys(monkeypatch, [auth_pb2.PublicKey(kid="k2", alg="RS256", pem="broken")])
+
+    assert asyncio.run(cache.refresh()) is False
+    assert cache._keys == previous
+
+
+def test_refresh_keeps_previous_key_for_broken_kid(monkeypatch):
+    cache = _cache()
+    _serve_keys(
+        monkeypatch, [auth_pb2.PublicKey(kid="k1", alg="RS256", pem=_public_pem())]
+    )
+    asyncio.run(cache.refresh())
+    previous = cache._keys["k1"]
+
+    _serve_keys(
+        monkeypatch,
+        [
+            auth_pb2.PublicKey(kid="k1", alg="RS256", pem="broken"),
+            auth_pb2.PublicKey(kid="k2", alg="RS256", pem=_public_pem()),
+        ],
+    )
+
+    assert asyncio.run(cache.refresh()) is True
+    assert cache._keys["k1"] is previous
+    assert set(cache._keys) == {"k1", "k2"}
+
+
+def test_run_survives_refresh_errors(monkeypatch):
+    cache = _cache()
+    calls = []
+
+    async def refresh():
+        calls.append("refresh")
+        if len(calls) == 1:
+            raise RuntimeError("unexpected")
+        return True
+
+    async def sleep(seconds):
+        if len(calls) >= 2:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(cache, "refresh", refresh)
+    monkeypatch.setattr(public_keys.asyncio, "sleep", sleep)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cache.run())
+    assert calls == ["refresh", "refresh"]
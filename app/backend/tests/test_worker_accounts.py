@@ -0,0 +1,39 @@
+import asyncio
+
+from common.crud.CrudDb import CRUD
+from common.Enums.ValuteCode import ValuteCode
+from wallet_worker.app.services import WalletService
+
+
+class _Result:
+    def scalars(self):
+        return self
+
+    def first(self):
+        return None
+
+    def scalar(self):
+        return 1
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return _Result()
+
+
+def test_get_wallet_account_binds_wallet_and_currency():
+    session = RecordingSession()
+    account = asyncio.run(
+        WalletService(crud=CRUD()).get_wallet_account(
+            session=session, wallet_id=8, currency_code=ValuteCode.RUB
+        )
+    )
+
+    assert account is None
+    params = session.statements[0].compile().params
+    assert params["wallet_id_1"] == 8
+    assert params["currency_code_1"] == ValuteCode.RUB
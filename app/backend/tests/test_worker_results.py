@@ -0,0 +1,97 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from common.Enums.OperationType import OperationType
+from wallet_worker.app import kafka_consumer
+
+
+def _message():
+    payload = {
+        "operation": OperationType.DEPOSIT.value,
+        "amount": 10,
+        "currency": "RUB",
+        "idempotency_key": "key-1",
+        "correlation_id": "00000000-0000-0000-0000-000000000001",
+        "wallet_id": 8,
+    }
+    return SimpleNamespace(
+        topic="wallet.transaction.request",
+        partition=0,
+        offset=41,
+        value=json.dumps(payload).encode("utf-8"),
+    )
+
+
+def _patch_worker(monkeypatch, events, commit_error=None):
+    class Session:
+        async def commit(self):
+            if commit_error is not None:
+                raise commit_error
+            events.append("db commit")
+
+        async def rollback(self):
+            events.append("db rollback")
+
+    @asynccontextmanager
+    async def session_factory():
+        yield Session()
+
+    async def deposit(**kwargs):
+        events.append("deposit")
+
+    async def setex(name, time, value):
+        events.append("idempotency setex")
+
+    async def produce_message(topic, message):
+        events.append(f"produce {topic}")
+
+    async def commit_offset(offsets):
+        events.append("offset commit")
+
+    async def noop(*args):
+        pass
+
+    monkeypatch.setattr(
+        kafka_consumer.async_database_helper, "session_factory", session_factory
+    )
+    monkeypatch.setattr(kafka_consumer.wallet_service, "deposit", deposit)
+    monkeypatch.setattr(kafka_consumer.redis_client, "setex", setex)
+    monkeypatch.setattr(
+        kafka_consumer.async_kafka_client, "produce_message", produce_message
+    )
+    monkeypatch.setattr(
+        kafka_consumer.async_kafka_client,
+        "consumer",
+        SimpleNamespace(commit=commit_offset),
+    )
+    monkeypatch.setattr(kafka_consumer, "publish_operation_result", noop)
+    monkeypatch.setattr(kafka_consumer, "notify_balance_changed", noop)
+
+
+def test_result_is_published_after_commit(monkeypatch):
+    events = []
+    _patch_worker(monkeypatch, events)
+
+    result = asyncio.run(kafka_consumer.handle_message_transaction(_message()))
+
+    assert result["status"] == "success"
+    assert events == [
+        "deposit",
+        "db commit",
+        "idempotency setex",
+        f"produce {kafka_consumer.settings.OUTPUT_TOPIC}",
+        "offset commit",
+    ]
+
+
+def test_failed_commit_publishes_no_result(monkeypatch):
+    events = []
+    _patch_worker(monkeypatch, events, commit_error=RuntimeError("commit failed"))
+
+    asyncio.run(kafka_consumer.handle_message_transaction(_message()))
+
+    assert f"produce {kafka_consumer.settings.OUTPUT_TOPIC}" not in events
+    assert "idempotency setex" not in events
+    assert "produce wallet.transaction.request" in events
@@ -5,8 +5,22 @@ from pydantic_settings import SettingsConfigDict
 class Settings(Postgres, Redis, PaymentStripe):
     REDIS_KEY_IDEMPOTENCY: str
     WALLET_WORKER_REQUEST_TOPIC: str = "wallet.transaction.request"
+    WALLET_WORKER_RESULT_TOPIC: str = "wallet.transaction.result"
+    RESULT_CONSUMER_BATCH_SIZE: int = 500
+    # Результаты, пришедшие раньше коммита транзакции, повторяются каждые
+    # RESULT_RETRY_S секунд, но не дольше RESULT_PARK_MAX_AGE_S
+    REDIS_KEY_PARKED_RESULTS: str = "wallet:results:parked"
+    RESULT_RETRY_S: float = 2.0
+    RESULT_PARK_MAX_AGE_S: float = 600.0
     PAYMENT_TEST_MODE: bool = True
     NOVAFIN_URL: str
+    BATCH_TRANSFER_CHUNK_SIZE: int = 500
+    REDIS_CHANNEL_BALANCE: str = "wallet:balance"
+    REDIS_KEY_OPERATION: str = "wallet:operation"
+    REDIS_CHANNEL_OPERATION: str = "wallet:operation:done"
+    OPERATION_STATUS_MAX_WAIT_MS: int = 30000
+    TRANSACTIONS_PAGE_MAX_SIZE: int = 200
+    TRANSACTIONS_EXPORT_CHUNK_SIZE: int = 1000
 
     model_config = SettingsConfigDict(extra="ignore")
 
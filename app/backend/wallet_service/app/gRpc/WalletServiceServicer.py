@@ -1,5 +1,6 @@
+from datetime import datetime
 from decimal import Decimal
-from common.Enums import ValuteCode, PaymentWorker
+from common.Enums import ValuteCode, PaymentWorker, OperationType, TransactionStatus
 from common.gRpc.wallet_service import wallet_pb2, wallet_pb2_grpc
 import grpc
 from google.protobuf.json_format import ParseDict, MessageToDict
@@ -7,6 +8,8 @@ from wallet_service.Core.logger import logger
 from wallet_service.exceptions.catch_errors import catch_errors
 from wallet_service.app.services.WalletCore import wallet_core
 from wallet_service.Core.async_database_helper import async_database_helper
+from wallet_service.Core.config import settings
+from wallet_service.exceptions.exceptions import InvalidArgument
 
 
 class WalletServiceServicer(wallet_pb2_grpc.WalletServiceServicer):
@@ -32,7 +35,8 @@ class WalletServiceServicer(wallet_pb2_grpc.WalletServiceServicer):
         """Получение баланса по кошельку"""
         logger.info("-------Получение баланса по кошельку-------")
 
-        async with async_database_helper.session_factory() as session:
+        # Баланс по запросу допускает отставание реплики, WatchBalance читает с основного
+        async with async_database_helper.read_session() as session:
             service_result: dict = await wallet_core.get_balance(
                 session=session,
                 user_id=request.user_id,
@@ -42,6 +46,121 @@ class WalletServiceServicer(wallet_pb2_grpc.WalletServiceServicer):
 
         return ParseDict(service_result, wallet_pb2.BalanceResponse())
 
+    @catch_errors(logger=logger)
+    async def WatchBalance(
+        self, request: wallet_pb2.GetBalanceRequest, context: grpc.ServicerContext
+    ):
+        """Подписка на изменения баланса кошелька"""
+        logger.info("-------Подписка на изменения баланса кошелька-------")
+        currency = ValuteCode(request.currency) if request.currency else None
+
+        async with async_database_helper.session_factory() as session:
+            wallet_id = await wallet_core.get_wallet_id(
+                session=session, user_id=request.user_id
+            )
+
+        async with wallet_core.watcher.subscribe(wallet_id) as events:
+            yield await self._balance_snapshot(request.user_id, currency)
+
+            async for event in events:
+                logger.debug(f"Изменение баланса wallet_id={wallet_id}: {event}")
+                yield await self._balance_snapshot(request.user_id, currency)
+
+    @staticmethod
+    async def _balance_snapshot(
+        user_id: str, currency: ValuteCode | None
+    ) -> wallet_pb2.BalanceResponse:
+        async with async_database_helper.session_factory() as session:
+            service_result: dict = await wallet_core.get_balance(
+                session=session, user_id=user_id, currency=currency
+            )
+
+        return ParseDict(service_result, wallet_pb2.BalanceResponse())
+
+    @catch_errors(logger=logger)
+    async def GetOperationStatus(
+        self,
+        request: wallet_pb2.OperationStatusRequest,
+        context: grpc.ServicerContext,
+    ):
+        """Статус операции по correlation_id"""
+        logger.info("-------Получение статуса операции-------")
+
+        async with async_database_helper.session_factory() as session:
+            service_result: dict = await wallet_core.get_operation_status(
+                session=session,
+                user_id=int(request.user_id),
+                correlation_id=request.correlation_id,
+                wait_ms=request.wait_ms,
+            )
+
+        return ParseDict(service_result, wallet_pb2.OperationStatusResponse())
+
+    @catch_errors(logger=logger)
+    async def ListTransactions(
+        self,
+        request: wallet_pb2.ListTransactionsRequest,
+        context: grpc.ServicerContext,
+    ):
+        """История операций кошелька"""
+        logger.info("-------Получение истории операций-------")
+
+        async with async_database_helper.read_session() as session:
+            service_result: dict = await wallet_core.list_transactions(
+                session=session,
+                user_id=int(request.user_id),
+                limit=request.limit or 50,
+                cursor=request.cursor if request.HasField("cursor") else None,
+                **self._history_filters(request),
+            )
+
+        return ParseDict(service_result, wallet_pb2.ListTransactionsResponse())
+
+    @catch_errors(logger=logger)
+    async def ExportTransactions(
+        self,
+        request: wallet_pb2.ExportTransactionsRequest,
+        context: grpc.ServicerContext,
+    ):
+        """Потоковая выгрузка истории операций кошелька"""
+        logger.info("-------Выгрузка истории операций-------")
+        filters = self._history_filters(request)
+
+        async with async_database_helper.read_session() as session:
+            async for chunk in wallet_core.export_transactions(
+                session=session, user_id=int(request.user_id), **filters
+            ):
+                yield ParseDict({"transactions": chunk}, wallet_pb2.TransactionsChunk())
+
+    @staticmethod
+    def _history_filters(request) -> dict:
+        """Фильтры истории операций из запроса"""
+        try:
+            return {
+                "operation_type": (
+                    OperationType(request.operation_type)
+                    if request.HasField("operation_type")
+                    else None
+                ),
+                "currency": (
+                    ValuteCode(request.currency)
+                    if request.HasField("currency")
+                    else None
+                ),
+                "date_from": (
+                    datetime.fromisoformat(request.date_from)
+                    if request.HasField("date_from")
+                    else None
+                ),
+                "date_to": (
+                    datetime.fromisoformat(request.date_to)
+                    if request.HasField("date_to")
+                    else None
+                ),
+            }
+        except ValueError as e:
+            raise InvalidArgument(str(e))
+
     @catch_errors(logger=logger)
     async def Transfer(
         self, request: wallet_pb2.TransferRequest, context: grpc.ServicerContext
@@ -62,6 +181,70 @@ class WalletServiceServicer(wallet_pb2_grpc.WalletServiceServicer):
 
         return ParseDict(service_result, wallet_pb2.OperationResponse())
 
+    @catch_errors(logger=logger)
+    async def BatchTransfer(self, request_iterator, context: grpc.ServicerContext):
+        """Пакетный перевод средств между кошельками"""
+        logger.info("-------Пакетный перевод средств между кошельками-------")
+
+        chunk: list[dict] = []
+        # Элементы с некорректными полями отклоняются без остановки потока
+        rejected: list[wallet_pb2.BatchTransferResult] = []
+        index = 0
+        async for request in request_iterator:
+            try:
+                chunk.append(
+                    {
+                        "index": index,
+                        "sender_id": int(request.from_user_id),
+                        "recipient_id": int(request.to_user_id),
+                        "amount": request.amount,
+                        "currency": request.currency,
+                        "idempotency_key": request.idempotency_key,
+                    }
+                )
+            except ValueError as e:
+                rejected.append(
+                    wallet_pb2.BatchTransferResult(
+                        index=index,
+                        idempotency_key=request.idempotency_key,
+                        status=TransactionStatus.FAILED.value,
+                        error=str(e),
+                    )
+                )
+            index += 1
+
+            if len(chunk) >= settings.BATCH_TRANSFER_CHUNK_SIZE:
+                for result in await self._batch_transfer_chunk(chunk, rejected):
+                    yield result
+                chunk, rejected = [], []
+
+        for result in await self._batch_transfer_chunk(chunk, rejected):
+            yield result
+
+        logger.info(f"Пакет из {index} переводов обработан")
+
+    @staticmethod
+    async def _batch_transfer_chunk(
+        chunk: list[dict],
+        rejected: list[wallet_pb2.BatchTransferResult],
+    ) -> list[wallet_pb2.BatchTransferResult]:
+        """Результаты части пакета вместе с отклоненными элементами, по порядку"""
+        results = list(rejected)
+        if chunk:
+            async with async_database_helper.session_factory() as session:
+                service_result: list[dict] = await wallet_core.batch_transfer(
+                    session=session, items=chunk
+                )
+                await session.commit()
+            await wallet_core.remember_batch_transfer(service_result)
+
+            results.extend(
+                ParseDict(result, wallet_pb2.BatchTransferResult())
+                for result in service_result
+            )
+
+        return sorted(results, key=lambda result: result.index)
+
     @catch_errors(logger=logger)
     async def Convert(
         self, request: wallet_pb2.ConvertRequest, context: grpc.ServicerContext
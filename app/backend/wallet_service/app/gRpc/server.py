@@ -4,8 +4,14 @@ import grpc
 from common.gRpc.wallet_service import wallet_pb2, wallet_pb2_grpc
 from wallet_service.Core.logger import logger
 from wallet_service.app.gRpc.WalletServiceServicer import WalletServiceServicer
+from wallet_service.app.result_consumer import consume_results
 from wallet_service.Core.async_kafka_client import async_kafka_client
-from celery_workers.background_tasks.tasks import update_currencies
+from wallet_service.Core.async_database_helper import async_database_helper
+from wallet_service.Core.config import settings
+from celery_workers.background_tasks.tasks import (
+    maintain_transaction_partitions,
+    update_currencies,
+)
 import asyncio
 
 
@@ -13,6 +19,10 @@ class Service:
     def __init__(self):
         self._is_running = True
         self._background_task = None
+        self._result_consumer_task = None
+        self._partitions_task = None
+        self._pool_metrics_task = None
+        self._replicas_task = None
 
     async def update_currencies_event(self):
         while self._is_running:
@@ -27,11 +37,32 @@ class Service:
                 logger.error(f"Ошибка в цикле обновления валют: {str(e)}")
                 await asyncio.sleep(60)
 
+    async def maintain_partitions_event(self):
+        while self._is_running:
+            try:
+                logger.info("Запуск обслуживания партиций wallet_transactions")
+                maintain_transaction_partitions.delay()
+                await asyncio.sleep(timedelta(days=1).total_seconds())
+            except asyncio.CancelledError:
+                logger.info("Обслуживание партиций остановлено")
+                break
+            except Exception as e:
+                logger.error(f"Ошибка в цикле обслуживания партиций: {str(e)}")
+                await asyncio.sleep(60)
+
     async def _shutdown(self, sig):
         logger.info(f"Получен сигнал {sig.name}, остановка сервиса...")
         self._is_running = False
         if self._background_task:
             self._background_task.cancel()
+        if self._result_consumer_task:
+            self._result_consumer_task.cancel()
+        if self._partitions_task:
+            self._partitions_task.cancel()
+        if self._pool_metrics_task:
+            self._pool_metrics_task.cancel()
+        if self._replicas_task:
+            self._replicas_task.cancel()
         await async_kafka_client.close()
 
     async def serve(self):
@@ -45,10 +76,24 @@ class Service:
         try:
             logger.info("Запуск фоновых задач")
             self._background_task = asyncio.create_task(self.update_currencies_event())
+            self._partitions_task = asyncio.create_task(
+                self.maintain_partitions_event()
+            )
+            self._pool_metrics_task = asyncio.create_task(
+                async_database_helper.report_pool_metrics(
+                    logger=logger, interval_s=settings.POSTGRES_POOL_METRICS_INTERVAL_S
+                )
+            )
+            self._replicas_task = asyncio.create_task(
+                async_database_helper.monitor_replicas()
+            )
 
             logger.info("Инициализация продюсера Kafka...")
             await async_kafka_client.init_producer()
 
+            logger.info("Запуск обработчика результатов wallet_worker")
+            self._result_consumer_task = asyncio.create_task(consume_results())
+
             logger.info("Запуск gRPC сервера...")
             server = grpc.aio.server(
                 options=[
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import time
+
+from aiokafka.structs import ConsumerRecord, TopicPartition
+
+from wallet_service.Core.async_database_helper import async_database_helper
+from wallet_service.Core.async_kafka_client import async_kafka_client
+from wallet_service.Core.async_redis_client import async_redis_client
+from wallet_service.Core.config import settings
+from wallet_service.Core.logger import logger
+from wallet_service.app.services.ParkedResults import ParkedResults
+from wallet_service.app.services.WalletCore import wallet_core
+
+parked_results = ParkedResults(
+    redis=async_redis_client, max_age_s=settings.RESULT_PARK_MAX_AGE_S
+)
+
+
+def _parse(records: list[ConsumerRecord]) -> list[dict]:
+    results = []
+    for record in records:
+        try:
+            results.append(json.loads(record.value.decode("utf-8")))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            logger.error(
+                f"Некорректный результат offset={record.offset} в {record.topic}: {str(e)}"
+            )
+    return results
+
+
+async def consume_results():
+    """Чтение результатов wallet_worker пачками и обновление статусов транзакций"""
+    logger.info("Инициализация consumer результатов операций...")
+    await async_kafka_client.init_consumer(
+        group_id="wallet-service-results",
+        topics=[settings.WALLET_WORKER_RESULT_TOPIC],
+        max_poll_records=settings.RESULT_CONSUMER_BATCH_SIZE,
+    )
+    consumer = async_kafka_client.consumer
+    logger.info("Consumer результатов операций запущен")
+
+    retried_at = 0.0
+    try:
+        while True:
+            batch: dict[TopicPartition, list[ConsumerRecord]] = await consumer.getmany(
+                timeout_ms=1000, max_records=settings.RESULT_CONSUMER_BATCH_SIZE
+            )
+            records = [record for records in batch.values() for record in records]
+
+            try:
+                retried: list[dict] = []
+                if time.monotonic() - retried_at >= settings.RESULT_RETRY_S:
+                    retried_at = time.monotonic()
+                    retried = await parked_results.load()
+                if not records and not retried:
+                    continue
+
+                async with async_database_helper.session_factory() as session:
+                    updated, missing = await wallet_core.apply_operation_results(
+                        session=session, results=retried + _parse(records)
+                    )
+                    await session.commit()
+                # Отложенные результаты сохраняются до коммита offset
+                await parked_results.update(retried=retried, missing=missing)
+                if records:
+                    await consumer.commit()
+                logger.info(
+                    f"Обработано результатов: {len(records)}, повторно: {len(retried)}, "
+                    f"обновлено транзакций: {updated}, отложено: {len(missing)}"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ошибка обновления статусов транзакций: {str(e)}")
+                # Возвращаемся к началу пачки, чтобы перечитать ее на следующей итерации
+                for tp, tp_records in batch.items():
+                    consumer.seek(tp, tp_records[0].offset)
+                await asyncio.sleep(5)
+    except asyncio.CancelledError:
+        logger.info("Consumer результатов операций остановлен")
+    except Exception as e:
+        logger.critical(f"Fatal error in result consumer loop: {e}", exc_info=True)
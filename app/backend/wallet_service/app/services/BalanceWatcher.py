@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from redis.asyncio import Redis
+from wallet_service.Core.config import settings
+from wallet_service.Core.logger import logger
+
+# Подписка была прервана: события могли потеряться, нужен новый снимок баланса
+_RESUBSCRIBED: Dict[str, Any] = {"resubscribed": True}
+
+
+class BalanceWatcher:
+    """
+    Balance change events of wallets for WatchBalance streams.
+    All streams share a single pattern subscription; each stream gets a
+    one-slot queue, so a burst of events collapses into one update.
+    """
+
+    def __init__(self, redis: Redis):
+        self._redis = redis
+        self._streams: Dict[int, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def channel(wallet_id: int) -> str:
+        return f"{settings.REDIS_CHANNEL_BALANCE}:{wallet_id}"
+
+    @asynccontextmanager
+    async def subscribe(
+        self, wallet_id: int
+    ) -> AsyncIterator[AsyncIterator[Dict[str, Any]]]:
+        """
+        Подписка на события кошелька.
+        Подписываемся до чтения баланса, чтобы не пропустить события между снимком и подпиской.
+        """
+        await self._ensure_listener()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._streams.setdefault(wallet_id, set()).add(queue)
+        try:
+            yield self._events(queue)
+        finally:
+            queues = self._streams.get(wallet_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._streams[wallet_id]
+
+    async def _events(self, queue: asyncio.Queue) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            event = await queue.get()
+            if event is _RESUBSCRIBED:
+                await self._ensure_listener()
+            yield event
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        # Необработанное событие заменяется новым: поток все равно перечитает баланс
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            return
+
+        async with self._lock:
+            if self._listener is not None and not self._listener.done():
+                return
+
+            pubsub = self._redis.pubsub()
+            await pubsub.psubscribe(f"{settings.REDIS_CHANNEL_BALANCE}:*")
+            # Дожидаемся подтверждения подписки
+            await pubsub.get_message(timeout=1.0)
+            self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub) -> None:
+        prefix_len = len(settings.REDIS_CHANNEL_BALANCE) + 1
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode("utf-8")
+                try:
+                    wallet_id = int(channel[prefix_len:])
+                except ValueError:
+                    continue
+
+                queues = self._streams.get(wallet_id)
+                if not queues:
+                    continue
+
+                event = json.loads(message["data"])
+                for queue in queues:
+                    self._offer(queue, event)
+        except Exception as e:
+            logger.error(f"Подписка на изменения балансов прервана: {str(e)}")
+        finally:
+            await pubsub.aclose()
+            # Потоки переподпишутся и перечитают баланс
+            for queues in self._streams.values():
+                for queue in queues:
+                    self._offer(queue, _RESUBSCRIBED)
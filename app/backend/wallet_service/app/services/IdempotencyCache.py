@@ -17,3 +17,17 @@ class IdempotencyCache:
         await self._redis.setex(
             name=f"{settings.REDIS_KEY_IDEMPOTENCY}:{key}", value="", time=ttl
         )
+
+    async def exists_many(self, keys: list[str]) -> list[bool]:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.exists(f"{settings.REDIS_KEY_IDEMPOTENCY}:{key}")
+            return [bool(res) for res in await pipe.execute()]
+
+    async def remember_many(self, keys: list[str], ttl: int = 24 * 3600) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.setex(
+                    name=f"{settings.REDIS_KEY_IDEMPOTENCY}:{key}", value="", time=ttl
+                )
+            await pipe.execute()
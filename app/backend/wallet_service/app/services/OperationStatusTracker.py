@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, Optional, Set
+
+from redis.asyncio import Redis
+from wallet_service.Core.config import settings
+from wallet_service.Core.logger import logger
+
+
+class OperationStatusTracker:
+    """
+    Results of wallet_worker operations indexed by correlation_id.
+    All waiters share a single pattern subscription and are woken by pub/sub.
+    """
+
+    def __init__(self, redis: Redis):
+        self._redis = redis
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, correlation_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(f"{settings.REDIS_KEY_OPERATION}:{correlation_id}")
+        return json.loads(raw) if raw else None
+
+    async def wait(
+        self, correlation_id: str, timeout_s: float
+    ) -> Optional[Dict[str, Any]]:
+        """Результат операции; если его еще нет, ждем публикации не дольше timeout_s"""
+        if timeout_s <= 0:
+            return await self.get(correlation_id)
+
+        await self._ensure_listener()
+
+        # Регистрируемся до чтения ключа, чтобы не пропустить публикацию между ними
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(correlation_id, set()).add(future)
+        try:
+            result = await self.get(correlation_id)
+            if result is not None:
+                return result
+            return await asyncio.wait_for(future, timeout=timeout_s)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters.get(correlation_id)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[correlation_id]
+
+    async def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            return
+
+        async with self._lock:
+            if self._listener is not None and not self._listener.done():
+                return
+
+            pubsub = self._redis.pubsub()
+            await pubsub.psubscribe(f"{settings.REDIS_CHANNEL_OPERATION}:*")
+            # Дожидаемся подтверждения подписки
+            await pubsub.get_message(timeout=1.0)
+            self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub) -> None:
+        prefix_len = len(settings.REDIS_CHANNEL_OPERATION) + 1
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode("utf-8")
+                correlation_id = channel[prefix_len:]
+
+                waiters = self._waiters.get(correlation_id)
+                if not waiters:
+                    continue
+
+                result = json.loads(message["data"])
+                for future in waiters:
+                    if not future.done():
+                        future.set_result(result)
+        except Exception as e:
+            logger.error(f"Подписка на результаты операций прервана: {str(e)}")
+        finally:
+            await pubsub.aclose()
+            # Будим ожидающих: статус будет взят из БД, следующий запрос переподпишется
+            for waiters in self._waiters.values():
+                for future in waiters:
+                    if not future.done():
+                        future.set_result(None)
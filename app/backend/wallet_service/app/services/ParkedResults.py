@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+import time
+
+from redis import Redis
+from wallet_service.Core.config import settings
+from wallet_service.Core.logger import logger
+
+
+class ParkedResults:
+    """
+    Worker results that arrived before their transaction row was committed.
+    Kept in one Redis hash keyed by correlation_id, so they survive a restart
+    after the Kafka offset is committed, and retried until max_age_s.
+    """
+
+    def __init__(self, redis: Redis, max_age_s: float):
+        self._redis = redis
+        self._max_age_s = max_age_s
+
+    async def load(self) -> list[dict]:
+        """Отложенные результаты; просроченные удаляются с ошибкой в логе"""
+        parked = await self._redis.hgetall(settings.REDIS_KEY_PARKED_RESULTS)
+        now = time.time()
+        results, expired = [], []
+        for correlation_id, raw in parked.items():
+            entry = json.loads(raw)
+            if now - entry["parked_at"] > self._max_age_s:
+                expired.append(correlation_id)
+                logger.error(
+                    f"Транзакция для результата {entry['result']} так и не появилась"
+                )
+            else:
+                results.append(entry["result"])
+        if expired:
+            await self._redis.hdel(settings.REDIS_KEY_PARKED_RESULTS, *expired)
+        return results
+
+    async def update(self, retried: list[dict], missing: list[dict]) -> None:
+        """Убирает сопоставленные результаты из retried и откладывает missing"""
+        missing_ids = {str(result["correlation_id"]) for result in missing}
+        resolved = [
+            str(result["correlation_id"])
+            for result in retried
+            if str(result["correlation_id"]) not in missing_ids
+        ]
+        async with self._redis.pipeline(transaction=False) as pipe:
+            if resolved:
+                pipe.hdel(settings.REDIS_KEY_PARKED_RESULTS, *resolved)
+            for result in missing:
+                # hsetnx сохраняет время первой попытки для повторных
+                pipe.hsetnx(
+                    settings.REDIS_KEY_PARKED_RESULTS,
+                    str(result["correlation_id"]),
+                    json.dumps({"result": result, "parked_at": time.time()}),
+                )
+            await pipe.execute()
@@ -28,10 +28,10 @@ class ProviderBalanceManager:
         amount: float,
         currency: ValuteCode,
     ) -> None:
-        record_list: List[PaymentProviderBalance] = await self._crud.get_by_filter(
+        record: Optional[PaymentProviderBalance] = await self._crud.get_one(
             session=session, model=PaymentProviderBalance, provider=provider
         )
-        if not record_list and amount >= 0:
+        if record is None and amount >= 0:
             record = await self._crud.create(
                 session=session,
                 model=PaymentProviderBalance,
@@ -39,8 +39,8 @@ class ProviderBalanceManager:
                 currency=self.BASE_CURRENCY_MAP[provider],
                 available_amount=0.0,
             )
-        else:
-            record = record_list[0]
+        elif record is None:
+            raise ValueError(f"Нет баланса провайдера {provider.value}")
 
         # Convert → provider currency if neaded
         if currency != record.currency:
@@ -52,9 +52,9 @@ class ProviderBalanceManager:
         await session.flush()
 
     async def get_rate(self, session: AsyncSession, code: ValuteCode) -> float:
-        row: Currency = (
-            await self._crud.get_by_filter(
-                session=session, model=Currency, code=code.value
-            )
-        )[0]
-        return float(row.rate_to_base)
+        rate = await self._crud.get_scalar(
+            session=session, column_attr=Currency.rate_to_base, code=code
+        )
+        if rate is None:
+            raise ValueError(f"Нет курса для {code.value}")
+        return float(rate)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.Enums import OperationType
+from common.Enums.ValuteCode import ValuteCode
+from common.Models import WalletTransaction
+from wallet_service.exceptions.exceptions import InvalidArgument
+
+
+class TransactionHistory:
+    """Wallet transaction history ordered by (date DESC, id DESC)."""
+
+    # Колонки совпадают с ключом и INCLUDE индекса ix_wallet_transactions_wallet_id_date_id
+    COLUMNS = (
+        WalletTransaction.id,
+        WalletTransaction.correlation_id,
+        WalletTransaction.operation_type,
+        WalletTransaction.status,
+        WalletTransaction.currency,
+        WalletTransaction.amount,
+        WalletTransaction.date,
+    )
+
+    @staticmethod
+    def encode_cursor(date: datetime, tx_id: int) -> str:
+        raw = json.dumps({"d": date.isoformat(), "i": tx_id}).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return datetime.fromisoformat(data["d"]), int(data["i"])
+        except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+            raise InvalidArgument("Некорректный курсор")
+
+    @staticmethod
+    def to_dict(row) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "correlation_id": str(row.correlation_id) if row.correlation_id else "",
+            "operation_type": row.operation_type.value,
+            "status": row.status.value,
+            "currency": row.currency.value if row.currency else "",
+            "amount": float(row.amount),
+            "date": row.date.isoformat(),
+        }
+
+    def query(
+        self,
+        wallet_id: int,
+        operation_type: Optional[OperationType] = None,
+        currency: Optional[ValuteCode] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Select:
+        """Выборка операций кошелька с фильтрами в порядке индекса"""
+        stmt = (
+            select(*self.COLUMNS)
+            .where(WalletTransaction.wallet_id == wallet_id)
+            .order_by(WalletTransaction.date.desc(), WalletTransaction.id.desc())
+        )
+        if operation_type is not None:
+            stmt = stmt.where(WalletTransaction.operation_type == operation_type)
+        if currency is not None:
+            stmt = stmt.where(WalletTransaction.currency == currency)
+        if date_from is not None:
+            stmt = stmt.where(WalletTransaction.date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(WalletTransaction.date < date_to)
+        return stmt
+
+    def page_query(
+        self,
+        wallet_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        **filters,
+    ) -> Select:
+        """
+        Выборка страницы: limit + 1 строка, чтобы узнать, есть ли следующая.
+        Следующая страница начинается строго после (date, id) последней строки,
+        поэтому стоимость запроса не зависит от глубины пролистывания.
+        """
+        stmt = self.query(wallet_id=wallet_id, **filters).limit(limit + 1)
+        if cursor:
+            date, tx_id = self.decode_cursor(cursor)
+            # Отдельное условие по date нужно для отсечения партиций:
+            # по сравнению кортежей планировщик их не отбрасывает
+            stmt = stmt.where(
+                WalletTransaction.date <= date,
+                tuple_(WalletTransaction.date, WalletTransaction.id)
+                < tuple_(date, tx_id),
+            )
+        return stmt
+
+    async def page(
+        self,
+        session: AsyncSession,
+        wallet_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        **filters,
+    ) -> Dict[str, Any]:
+        """Страница истории и курсор следующей, если она есть"""
+        stmt = self.page_query(
+            wallet_id=wallet_id, limit=limit, cursor=cursor, **filters
+        )
+
+        rows: List = list((await session.execute(stmt)).all())
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        response: Dict[str, Any] = {"transactions": [self.to_dict(r) for r in rows]}
+        if has_more:
+            response["next_cursor"] = self.encode_cursor(rows[-1].date, rows[-1].id)
+        return response
+
+    async def stream(
+        self,
+        session: AsyncSession,
+        wallet_id: int,
+        chunk_size: int,
+        **filters,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Вся история частями по chunk_size строк.
+        Строки читаются серверным курсором, в памяти одновременно не больше одной части.
+        """
+        result = await session.stream(
+            self.query(wallet_id=wallet_id, **filters).execution_options(
+                yield_per=chunk_size
+            )
+        )
+        async for partition in result.partitions():
+            yield [self.to_dict(row) for row in partition]
@@ -2,11 +2,12 @@ from __future__ import annotations
 import json
 import uuid
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import sqlalchemy.exc
 import stripe
 from redis import Redis
+from sqlalchemy import Row, Sequence, and_, column, insert, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.Enums import OperationType, PaymentWorker, TransactionStatus
@@ -18,18 +19,32 @@ from common.Models import (
     WalletAccount,
     Users,
     PaymentProviderBalance,
+    Currency,
 )
 from common.crud.CrudDb import CRUD
 from common.schemas import WalletTransactionRequest
 
 from wallet_service.Core import async_kafka_client, logger, settings, async_redis_client
+from wallet_service.app.services.BalanceWatcher import BalanceWatcher
 from wallet_service.app.services.IdempotencyCache import IdempotencyCache
+from wallet_service.app.services.OperationStatusTracker import (
+    OperationStatusTracker,
+)
 from wallet_service.app.services.ProviderBalanceManager import ProviderBalanceManager
 from wallet_service.app.services.StripeGateway import StripeGateway
-from wallet_service.exceptions.exceptions import NoWallet, IdempDone, NoStripeAccount
+from wallet_service.app.services.TransactionHistory import TransactionHistory
+from wallet_service.exceptions.exceptions import (
+    NoWallet,
+    IdempDone,
+    NoStripeAccount,
+    NoOperation,
+)
 
 stripe.api_key = settings.STRIPE_PRIVATE_KEY
 
+# Последовательность id секционированной wallet_transactions
+WALLET_TRANSACTIONS_ID_SEQ = Sequence("wallet_transactions_id_seq")
+
 
 class KafkaProducer:
     """Kafka facade to keep WalletCore unaware of implementation details."""
@@ -40,6 +55,12 @@ class KafkaProducer:
             topic=topic, message=json.dumps(payload)
         )
 
+    @staticmethod
+    async def send_many(topic: str, payloads: List[Dict[str, Any]]) -> None:
+        await async_kafka_client.produce_messages(
+            topic=topic, messages=[json.dumps(payload) for payload in payloads]
+        )
+
 
 class WalletCore:
     """Thin orchestration layer that wires helpers together."""
@@ -50,19 +71,26 @@ class WalletCore:
         self.kafka = KafkaProducer()
         self.balances = ProviderBalanceManager(crud)
         self.stripe = StripeGateway()
+        self.watcher = BalanceWatcher(redis_cli)
+        self.operations = OperationStatusTracker(redis_cli)
+        self.history = TransactionHistory()
 
     # ───────────── Wallet helpers ──────────────
 
     async def _wallet_id(self, session: AsyncSession, user_id: int) -> int:
-        wallets: List[Wallet] = await self.crud.get_by_filter(
-            session=session, model=Wallet, user_id=user_id
+        wallet_id: Optional[int] = await self.crud.get_scalar(
+            session=session, column_attr=Wallet.id, user_id=user_id
         )
-        if not wallets:
+        if wallet_id is None:
             raise NoWallet("Кошелек не найден")
-        return wallets[0].id
+        return wallet_id
 
     # ───────────── Public API ──────────────
 
+    async def get_wallet_id(self, session: AsyncSession, user_id: int) -> int:
+        """ID кошелька пользователя"""
+        return await self._wallet_id(session=session, user_id=int(user_id))
+
     async def create_wallet(
         self, session: AsyncSession, user_id: str
     ) -> Dict[str, Any]:
@@ -79,46 +107,212 @@ class WalletCore:
     async def get_balance(
         self, session: AsyncSession, user_id: int, currency: Optional[ValuteCode] = None
     ) -> Dict[str, Any]:
-        try:
-            wallet = (
-                await self.crud.get_by_filter(
-                    session=session, model=Wallet, user_id=int(user_id)
-                )
-            )[0]
-        except Exception as e:
+        """
+        Балансы кошелька одним запросом. Фильтр по валюте в условии соединения,
+        чтобы кошелек без подходящих счетов не считался отсутствующим
+        """
+        on_clause = WalletAccount.wallet_id == Wallet.id
+        if currency is not None:
+            on_clause = and_(on_clause, WalletAccount.currency_code == currency)
+
+        rows = (
+            await session.execute(
+                select(Wallet.id, WalletAccount)
+                .select_from(Wallet)
+                .outerjoin(WalletAccount, on_clause)
+                .where(Wallet.user_id == int(user_id))
+                .order_by(WalletAccount.id)
+            )
+        ).all()
+        if not rows:
             raise NoWallet("Кошелек не найден")
 
-        await session.refresh(wallet, attribute_names=["accounts"])
-        accounts = [
-            acc for acc in wallet.accounts if currency in (None, acc.currency_code)
-        ]
         return {
             "user_id": user_id,
-            "balances": [acc.to_dict() for acc in accounts],
+            "balances": [
+                row.WalletAccount.to_dict()
+                for row in rows
+                if row.WalletAccount is not None
+            ],
+        }
+
+    async def get_operation_status(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        correlation_id: str,
+        wait_ms: int = 0,
+    ) -> Dict[str, Any]:
+        """Статус операции по correlation_id, с ожиданием результата от wallet_worker"""
+        try:
+            correlation_id = str(uuid.UUID(correlation_id))
+        except ValueError:
+            raise NoOperation("Операция не найдена")
+
+        wallet_id = await self._wallet_id(session=session, user_id=int(user_id))
+        # Не держим соединение с БД, пока ждем результат
+        await session.close()
+
+        wait_ms = min(max(wait_ms, 0), settings.OPERATION_STATUS_MAX_WAIT_MS)
+        result = await self.operations.wait(correlation_id, timeout_s=wait_ms / 1000)
+
+        if result is not None:
+            if result.get("wallet_id") != wallet_id:
+                raise NoOperation("Операция не найдена")
+            status = (
+                TransactionStatus.COMPLETED
+                if result["status"] == "success"
+                else TransactionStatus.FAILED
+            )
+            return {
+                "correlation_id": correlation_id,
+                "status": status.value,
+                "operation": result["operation"],
+                "amount": result["amount"],
+                "error": result.get("error"),
+            }
+
+        # Результата еще нет - отдаем статус, записанный при создании операции
+        tx = (
+            await session.execute(
+                select(
+                    WalletTransaction.status,
+                    WalletTransaction.operation_type,
+                    WalletTransaction.amount,
+                ).where(
+                    WalletTransaction.correlation_id == uuid.UUID(correlation_id),
+                    WalletTransaction.wallet_id == wallet_id,
+                )
+            )
+        ).first()
+        if tx is None:
+            raise NoOperation("Операция не найдена")
+
+        return {
+            "correlation_id": correlation_id,
+            "status": tx.status.value,
+            "operation": tx.operation_type.value,
+            "amount": float(tx.amount),
         }
 
+    async def list_transactions(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        **filters,
+    ) -> Dict[str, Any]:
+        """История операций кошелька пользователя, постранично"""
+        wallet_id = await self._wallet_id(session=session, user_id=int(user_id))
+        limit = min(max(limit, 1), settings.TRANSACTIONS_PAGE_MAX_SIZE)
+        return await self.history.page(
+            session=session, wallet_id=wallet_id, limit=limit, cursor=cursor, **filters
+        )
+
+    async def export_transactions(
+        self, session: AsyncSession, user_id: int, **filters
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Потоковая выгрузка истории операций кошелька пользователя"""
+        wallet_id = await self._wallet_id(session=session, user_id=int(user_id))
+        async for chunk in self.history.stream(
+            session=session,
+            wallet_id=wallet_id,
+            chunk_size=settings.TRANSACTIONS_EXPORT_CHUNK_SIZE,
+            **filters,
+        ):
+            yield chunk
+
+    async def apply_operation_results(
+        self, session: AsyncSession, results: List[Dict[str, Any]]
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Перевод транзакций в финальный статус по результатам wallet_worker.
+        Один UPDATE ... FROM (VALUES ...) на пачку, сопоставление по correlation_id.
+        Возвращает число обновленных транзакций и результаты, для которых строки
+        транзакции еще нет: запрос в Kafka уходит раньше коммита записи.
+        """
+        statuses: Dict[uuid.UUID, TransactionStatus] = {}
+        by_id: Dict[uuid.UUID, Dict[str, Any]] = {}
+        for result in results:
+            try:
+                correlation_id = uuid.UUID(result["correlation_id"])
+            except (KeyError, TypeError, ValueError):
+                logger.warning(f"Результат без корректного correlation_id: {result}")
+                continue
+            statuses[correlation_id] = (
+                TransactionStatus.COMPLETED
+                if result.get("status") == "success"
+                else TransactionStatus.FAILED
+            )
+            by_id[correlation_id] = result
+
+        if not statuses:
+            return 0, []
+
+        table = WalletTransaction.__table__
+        results_values = values(
+            column("correlation_id", table.c.correlation_id.type),
+            column("status", table.c.status.type),
+            name="results",
+        ).data(list(statuses.items()))
+
+        res = await session.execute(
+            update(WalletTransaction)
+            .where(
+                WalletTransaction.correlation_id == results_values.c.correlation_id,
+                WalletTransaction.status.in_(
+                    [TransactionStatus.PENDING, TransactionStatus.PROCESSED]
+                ),
+            )
+            .values(status=results_values.c.status)
+            .returning(WalletTransaction.correlation_id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = set(res.scalars().all())
+
+        unmatched = [cid for cid in statuses if cid not in updated]
+        if not unmatched:
+            return len(updated), []
+        # Уже завершенные транзакции - повтор результата, ждать нечего
+        existing = set(
+            (
+                await session.execute(
+                    select(WalletTransaction.correlation_id).where(
+                        WalletTransaction.correlation_id.in_(unmatched)
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        missing = [by_id[cid] for cid in unmatched if cid not in existing]
+        return len(updated), missing
+
     async def connect_account_stripe(
         self,
         user_id: str,
         session: AsyncSession,
     ) -> dict:
         logger.info(f"Поиск созданного аккаунта в Stripe")
-        stripe_accounts: list[StripeAccounts] = await self.crud.get_by_filter(
-            session=session, model=StripeAccounts, user_id=int(user_id)
+        account_id: Optional[str] = await self.crud.get_scalar(
+            session=session,
+            column_attr=StripeAccounts.stripe_account_id,
+            user_id=int(user_id),
         )
-        if len(stripe_accounts) != 0:
-            account_id = stripe_accounts[0].stripe_account_id
+        if account_id is not None:
             logger.info(f"Аккаунт найден id={account_id}")
         else:
             logger.info(f"Аккаунт не найден\nПоиск пользователя")
 
-            user = await self.crud.get_by_filter(
-                session=session, model=Users, id=int(user_id)
+            login: Optional[str] = await self.crud.get_scalar(
+                session=session, column_attr=Users.login, id=int(user_id)
             )
-            user = user.pop()
+            if login is None:
+                raise ValueError("Пользователь не найден")
             logger.info(f"Пользователь найден")
             logger.info(f"Создание аккаунта для пользователя в stripe")
-            account_id = await self.stripe.create_connected_account(user.login)
+            account_id = await self.stripe.create_connected_account(login)
             new_stripe_account = await self.crud.create(
                 session=session,
                 model=StripeAccounts,
@@ -181,11 +375,11 @@ class WalletCore:
         try:
             pi = payload["payment_intent"]
             tx_id = int(pi["metadata"]["transaction_id"])
-            tx: WalletTransaction = (
-                await self.crud.get_by_filter(
-                    session=session, model=WalletTransaction, id=tx_id
-                )
-            )[0]
+            tx: Optional[WalletTransaction] = await self.crud.get_one(
+                session=session, model=WalletTransaction, id=tx_id
+            )
+            if tx is None:
+                raise ValueError(f"Транзакция {tx_id} не найдена")
             amount = Decimal(pi["amount"]) / 100
             currency = ValuteCode(pi["currency"].upper())
 
@@ -225,11 +419,11 @@ class WalletCore:
         try:
             pi = payload["payment_intent"]
             tx_id = int(pi["metadata"]["transaction_id"])
-            tx: WalletTransaction = (
-                await self.crud.get_by_filter(
-                    session=session, model=WalletTransaction, id=tx_id
-                )
-            )[0]
+            tx: Optional[WalletTransaction] = await self.crud.get_one(
+                session=session, model=WalletTransaction, id=tx_id
+            )
+            if tx is None:
+                raise ValueError(f"Транзакция {tx_id} не найдена")
             amount = Decimal(pi["amount"]) / 100
             currency = ValuteCode(pi["currency"].upper())
 
@@ -271,67 +465,127 @@ class WalletCore:
     ) -> Dict[str, Any]:
         if await self.idemp.exists(idempotency_key):
             raise ValueError("Duplicate operation")
-        wallet_id = await self._wallet_id(session, user_id)
-
-        res = await self.get_balance(
-            session=session, user_id=user_id, currency=currency
+        pre = await self._withdraw_preflight(
+            session=session, user_id=user_id, currency=currency, gateway=gateway
         )
-        balance = res["balances"]
-        balance_exp = ValueError("Недостаточно средств на балансе пользователя")
-        if len(balance) == 0:
-            raise balance_exp
 
-        if float(balance[0]["amount"]) < float(amount):
-            raise balance_exp
+        if pre.balance is None or pre.balance < amount:
+            raise ValueError("Недостаточно средств на балансе пользователя")
+
+        if pre.provider_available is None:
+            raise ValueError("Недостаточно средств на счету провайдера")
+        # Баланс провайдера хранится в его базовой валюте, как в change_amount
+        needed = float(amount)
+        if currency != pre.provider_currency:
+            if pre.currency_rate is None or pre.provider_rate is None:
+                raise ValueError(f"Нет курса для {currency.value}")
+            needed = needed * float(pre.currency_rate) / float(pre.provider_rate)
+        if pre.provider_available < needed:
+            raise ValueError("Недостаточно средств на счету провайдера")
+
+        if gateway != PaymentWorker.STRIPE:
+            raise NotImplementedError(f"Gateway by {gateway.value} not supported yet")
+        if pre.stripe_account_id is None:
+            raise NoStripeAccount("Stripe account not linked")
+        await StripeGateway.verify_account_ready(pre.stripe_account_id)
 
+        # Запись создается до выплаты: ошибка БД не должна оставить выплату без
+        # транзакции в журнале
         tx = await self.crud.create(
             session=session,
             model=WalletTransaction,
+            id=pre.tx_id,
             user_id=user_id,
             amount=amount,
             currency=currency.value,
             operation_type=OperationType.WITHDRAW,
             status=TransactionStatus.PENDING,
             idempotency_key=idempotency_key,
-            wallet_id=wallet_id,
+            wallet_id=pre.wallet_id,
             correlation_id=str(uuid.uuid4()),
             payment_worker=gateway,
         )
-
-        pb: List[PaymentProviderBalance] = await self.crud.get_by_filter(
-            session=session, model=PaymentProviderBalance, provider=gateway
+        res = await StripeGateway.payout(
+            int(amount * 100),
+            pre.stripe_account_id,
+            currency,
+            wallet_id=pre.wallet_id,
+            tx_id=pre.tx_id,
         )
 
-        if len(pb) == 0:
-            raise ValueError("Недостаточно средств на счету провайдера")
-
-        if float(pb[0].available_amount) < float(amount):
-            raise ValueError("Недостаточно средств на счету провайдера")
-
-        if gateway == PaymentWorker.STRIPE:
-            sa: List[StripeAccounts] = await self.crud.get_by_filter(
-                session=session, model=StripeAccounts, user_id=user_id
-            )
-            if not sa:
-                raise NoStripeAccount("Stripe account not linked")
-            account_id = sa[0].stripe_account_id
-            await StripeGateway.verify_account_ready(account_id)
-            res = await StripeGateway.payout(
-                int(amount * 100),
-                account_id,
-                currency,
-                wallet_id=wallet_id,
-                tx_id=tx.id,
-            )
-        else:
-            raise NotImplementedError(f"Gateway by {gateway.value} not supported yet")
-
-        tx.status = TransactionStatus.PENDING
         tx.external_id = res["payout_id"]
         await session.flush()
         await self.idemp.remember(idempotency_key)
         return {"correlation_id": str(tx.correlation_id), "status": tx.status.value}
 
+    async def _withdraw_preflight(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        currency: ValuteCode,
+        gateway: PaymentWorker,
+    ) -> Row:
+        """
+        Все проверки выплаты одним запросом: кошелек, баланс счета в валюте,
+        средства провайдера в его валюте с курсами для пересчета, привязанный
+        Stripe аккаунт и id будущей транзакции
+        """
+        wallet = (
+            select(Wallet.id.label("wallet_id"))
+            .where(Wallet.user_id == user_id)
+            .cte("wallet")
+        )
+        balance = (
+            select(WalletAccount.amount)
+            .where(
+                WalletAccount.wallet_id == wallet.c.wallet_id,
+                WalletAccount.currency_code == currency,
+            )
+            .order_by(WalletAccount.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        provider = (
+            select(PaymentProviderBalance)
+            .where(PaymentProviderBalance.provider == gateway)
+            .limit(1)
+            .cte("provider")
+        )
+        provider_available = select(provider.c.available_amount).scalar_subquery()
+        provider_currency = select(provider.c.currency).scalar_subquery()
+        currency_rate = (
+            select(Currency.rate_to_base)
+            .where(Currency.code == currency)
+            .scalar_subquery()
+        )
+        provider_rate = (
+            select(Currency.rate_to_base)
+            .join(provider, provider.c.currency == Currency.code)
+            .scalar_subquery()
+        )
+        stripe_account_id = (
+            select(StripeAccounts.stripe_account_id)
+            .where(StripeAccounts.user_id == user_id)
+            .scalar_subquery()
+        )
+        row = (
+            await session.execute(
+                select(
+                    wallet.c.wallet_id,
+                    balance.label("balance"),
+                    provider_available.label("provider_available"),
+                    provider_currency.label("provider_currency"),
+                    currency_rate.label("currency_rate"),
+                    provider_rate.label("provider_rate"),
+                    stripe_account_id.label("stripe_account_id"),
+                    WALLET_TRANSACTIONS_ID_SEQ.next_value().label("tx_id"),
+                ).select_from(wallet)
+            )
+        ).first()
+        if row is None:
+            raise NoWallet("Кошелек не найден")
+        return row
+
     async def convert_currency(
         self,
         session: AsyncSession,
@@ -466,6 +720,121 @@ class WalletCore:
 
         return response
 
+    async def batch_transfer(
+        self, session: AsyncSession, items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Пакетный перевод средств.
+
+        items: [{"index", "sender_id", "recipient_id", "amount", "currency",
+        "idempotency_key"}]. Кошельки ищутся одним запросом, транзакции
+        вставляются одним multi-row INSERT, сообщения уходят в Kafka пачкой.
+        Ошибка по одному элементу не прерывает обработку остальных.
+        """
+        results: Dict[int, Dict[str, Any]] = {}
+
+        def reject(item: Dict[str, Any], error: str) -> None:
+            results[item["index"]] = {
+                "index": item["index"],
+                "idempotency_key": item["idempotency_key"],
+                "status": TransactionStatus.FAILED.value,
+                "error": error,
+            }
+
+        logger.info(f"Проверка идемпотентности {len(items)} операций...")
+        done = await self.idemp.exists_many([item["idempotency_key"] for item in items])
+        accepted: List[Dict[str, Any]] = []
+        seen_keys: set[str] = set()
+        for item, is_done in zip(items, done):
+            if is_done or item["idempotency_key"] in seen_keys:
+                reject(item, "Duplicate operation")
+                continue
+            seen_keys.add(item["idempotency_key"])
+            accepted.append(item)
+
+        logger.info(f"Получение кошельков пользователей...")
+        user_ids = {item["sender_id"] for item in accepted} | {
+            item["recipient_id"] for item in accepted
+        }
+        rows = await session.execute(
+            select(Wallet.user_id, Wallet.id).where(Wallet.user_id.in_(user_ids))
+        )
+        wallet_ids: Dict[int, int] = dict(rows.all())
+        logger.info(f"Найдено кошельков: {len(wallet_ids)}")
+
+        messages: List[Dict[str, Any]] = []
+        tx_rows: List[Dict[str, Any]] = []
+        for item in accepted:
+            from_wallet_id = wallet_ids.get(item["sender_id"])
+            to_wallet_id = wallet_ids.get(item["recipient_id"])
+            if from_wallet_id is None or to_wallet_id is None:
+                reject(item, "Кошелек не найден")
+                continue
+
+            correlation_id = uuid.uuid4()
+            try:
+                currency = ValuteCode(item["currency"])
+                message = WalletTransactionRequest(
+                    operation=OperationType.TRANSFER,
+                    amount=item["amount"],
+                    currency=currency,
+                    idempotency_key=item["idempotency_key"],
+                    correlation_id=str(correlation_id),
+                    wallet_id=from_wallet_id,
+                    to_wallet_id=to_wallet_id,
+                ).to_dict()
+            except ValueError as e:
+                reject(item, str(e))
+                continue
+
+            messages.append(message)
+            tx_rows.append(
+                {
+                    "user_id": item["sender_id"],
+                    "amount": Decimal(str(item["amount"])),
+                    "currency": currency,
+                    "operation_type": OperationType.TRANSFER,
+                    "status": TransactionStatus.PROCESSED,
+                    "idempotency_key": item["idempotency_key"],
+                    "wallet_id": from_wallet_id,
+                    "to_wallet_id": to_wallet_id,
+                    "from_wallet_id": from_wallet_id,
+                    "correlation_id": correlation_id,
+                }
+            )
+            results[item["index"]] = {
+                "index": item["index"],
+                "idempotency_key": item["idempotency_key"],
+                "correlation_id": str(correlation_id),
+                "status": TransactionStatus.PROCESSED.value,
+            }
+
+        if messages:
+            # Записи в журнале появляются до того, как wallet_worker получит операции
+            logger.info(f"Создание {len(tx_rows)} записей о транзакциях...")
+            await session.execute(insert(WalletTransaction), tx_rows)
+            await session.flush()
+            logger.info(f"Отправка {len(messages)} сообщений для wallet_worker...")
+            await self.kafka.send_many(
+                topic=settings.WALLET_WORKER_REQUEST_TOPIC, payloads=messages
+            )
+            logger.info(f"Пакет обработан")
+
+        return [results[item["index"]] for item in items]
+
+    async def remember_batch_transfer(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Запоминает ключи идемпотентности принятых переводов пакета.
+        Вызывается после коммита: если коммит не прошел, клиент может повторить пакет.
+        """
+        await self.idemp.remember_many(
+            [
+                result["idempotency_key"]
+                for result in results
+                if result["status"] == TransactionStatus.PROCESSED.value
+            ]
+        )
+
 
 # ─────────────────────────── Init singleton  ────────────────────────────
 
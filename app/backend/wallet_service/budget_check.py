@@ -0,0 +1,361 @@
+"""
+Бюджет запросов к БД и времени для методов WalletServiceServicer.
+
+Заполняет базу тестовыми данными внутри транзакции, вызывает методы сервиса
+и сравнивает число SQL запросов и время каждого вызова с BUDGETS. В конце
+транзакция откатывается. Kafka и Stripe заменяются записью вызовов в памяти,
+Redis используется настоящий. Ошибку сборки дает только число запросов,
+max_ms - ориентир, превышение которого помечается в отчете.
+
+WatchBalance измеряется до первого снимка баланса: дальше поток ждет событий.
+
+Запуск на локальном окружении (Postgres после `alembic upgrade head`, Redis):
+    PYTHONPATH=app/backend python -m wallet_service.budget_check
+
+В сборке (ненулевой код при превышении бюджета):
+    docker compose --profile ci run --rm wallet_budget_check
+"""
+
+import asyncio
+import sys
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from common.Metrics.query_budget import (
+    Budget,
+    BudgetContext,
+    report,
+    rolled_back,
+    run_budgets,
+)
+from common.Enums import PaymentWorker
+from common.gRpc.wallet_service import wallet_pb2
+from wallet_service.Core.async_database_helper import async_database_helper
+from wallet_service.app.gRpc.WalletServiceServicer import WalletServiceServicer
+from wallet_service.app.services.StripeGateway import StripeGateway
+from wallet_service.app.services.WalletCore import wallet_core
+
+SEED_PREFIX = "budget-check"
+SEED_HISTORY = 200
+BATCH_SIZE = 10
+
+BUDGETS: Dict[str, Budget] = {
+    # INSERT ... RETURNING кошелька
+    "CreateWallet": Budget(max_queries=1, max_ms=200),
+    "GetBalance": Budget(max_queries=1, max_ms=200),
+    # Кошелек пользователя и первый снимок баланса
+    "WatchBalance": Budget(max_queries=2, max_ms=200),
+    "ListTransactions": Budget(max_queries=2, max_ms=200),
+    "ExportTransactions": Budget(max_queries=2, max_ms=500),
+    "GetOperationStatus": Budget(max_queries=2, max_ms=200),
+    "Transfer": Budget(max_queries=3, max_ms=200),
+    "BatchTransfer": Budget(max_queries=2, max_ms=300),
+    "Convert": Budget(max_queries=2, max_ms=200),
+    # Кошелек пользователя и INSERT транзакции до создания Checkout Session
+    "CreatePaymentTransaction": Budget(max_queries=2, max_ms=200),
+    # Нет аккаунта: поиск аккаунта, логина и INSERT нового
+    "ConnectAccountStripe": Budget(max_queries=3, max_ms=200),
+    "HandleStripePayment": Budget(max_queries=4, max_ms=200),
+    "HandleStripePayout": Budget(max_queries=4, max_ms=200),
+    # preflight, INSERT до выплаты и UPDATE external_id после нее
+    "CreateWithdrawTransaction": Budget(max_queries=3, max_ms=300),
+}
+
+
+class KafkaRecorder:
+    def __init__(self):
+        self.messages: List[Dict[str, Any]] = []
+
+    async def send(self, topic: str, payload: Dict[str, Any]) -> None:
+        self.messages.append(payload)
+
+    async def send_many(self, topic: str, payloads: List[Dict[str, Any]]) -> None:
+        self.messages.extend(payloads)
+
+
+async def _verify_account_ready(account_id: str) -> None:
+    return None
+
+
+async def _payout(*args, **kwargs) -> Dict[str, str]:
+    return {"payout_id": f"po_{SEED_PREFIX}"}
+
+
+async def _checkout_session(*args, **kwargs) -> str:
+    return f"https://checkout.stripe.com/{SEED_PREFIX}"
+
+
+async def _connected_account(email: str) -> str:
+    return f"acct_{SEED_PREFIX}"
+
+
+async def _onboarding_link(account_id: str) -> str:
+    return f"https://connect.stripe.com/{account_id}"
+
+
+STRIPE_STUBS = {
+    "verify_account_ready": _verify_account_ready,
+    "payout": _payout,
+    "create_checkout_session": _checkout_session,
+    "create_connected_account": _connected_account,
+    "onboarding_link": _onboarding_link,
+}
+
+
+async def seed(conn: AsyncConnection) -> Dict[str, Any]:
+    user_ids = (
+        (
+            await conn.execute(
+                text(
+                    """
+                INSERT INTO "Users" (login, is_active, two_factor_enabled, auth_provider)
+                SELECT :prefix || '-' || g, true, false, 'local'
+                FROM generate_series(1, 3) g
+                RETURNING id
+                """
+                ),
+                {"prefix": SEED_PREFIX},
+            )
+        )
+        .scalars()
+        .all()
+    )
+    # У newcomer нет кошелька: для него вызывается CreateWallet
+    sender, recipient, newcomer = sorted(user_ids)
+
+    wallet_ids = dict(
+        (
+            await conn.execute(
+                text(
+                    "INSERT INTO wallets (user_id) SELECT unnest(CAST(:ids AS int[])) "
+                    "RETURNING user_id, id"
+                ),
+                {"ids": [sender, recipient]},
+            )
+        ).all()
+    )
+    for statement in (
+        """
+        INSERT INTO wallet_accounts (wallet_id, currency_code, type, amount)
+        SELECT unnest(CAST(:wallets AS int[])), 'USD', 'FIAT', 1000
+        """,
+        """
+        INSERT INTO currencies (code, rate_to_base)
+        VALUES ('RUB', 1), ('USD', 90), ('EUR', 100)
+        ON CONFLICT (code) DO NOTHING
+        """,
+        """
+        INSERT INTO payment_provider_balances (provider, currency, available_amount)
+        VALUES ('STRIPE', 'USD', 100000)
+        """,
+        """
+        INSERT INTO stripe_accounts (user_id, stripe_account_id)
+        VALUES (:sender, 'acct_budget_check')
+        """,
+        """
+        INSERT INTO wallet_transactions (
+            user_id, wallet_id, amount, currency, operation_type, status,
+            date, correlation_id, idempotency_key
+        )
+        SELECT :sender, :wallet, 1, 'USD', 'TRANSFER', 'COMPLETED',
+               now() - g * interval '1 hour', gen_random_uuid(), :prefix || '-' || g
+        FROM generate_series(1, :history) g
+        """,
+    ):
+        await conn.execute(
+            text(statement),
+            {
+                "wallets": list(wallet_ids.values()),
+                "sender": sender,
+                "wallet": wallet_ids[sender],
+                "prefix": SEED_PREFIX,
+                "history": SEED_HISTORY,
+            },
+        )
+
+    pending = {}
+    for operation in ("DEPOSIT", "WITHDRAW"):
+        pending[operation] = (
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO wallet_transactions (
+                        user_id, wallet_id, amount, currency, operation_type, status,
+                        correlation_id, idempotency_key, payment_worker
+                    )
+                    VALUES (:sender, :wallet, 20, 'USD', :operation, 'PENDING',
+                            gen_random_uuid(), :key, 'STRIPE')
+                    RETURNING id, correlation_id
+                    """
+                ),
+                {
+                    "sender": sender,
+                    "wallet": wallet_ids[sender],
+                    "operation": operation,
+                    "key": f"{SEED_PREFIX}-{operation.lower()}",
+                },
+            )
+        ).one()
+    await conn.execute(text("ANALYZE wallets, wallet_accounts, wallet_transactions"))
+    return {
+        "sender": sender,
+        "recipient": recipient,
+        "newcomer": newcomer,
+        "wallet_id": wallet_ids[sender],
+        "deposit_id": pending["DEPOSIT"].id,
+        "deposit_correlation_id": str(pending["DEPOSIT"].correlation_id),
+        "withdraw_id": pending["WITHDRAW"].id,
+    }
+
+
+def cases(data: Dict[str, Any]):
+    servicer = WalletServiceServicer()
+    context = BudgetContext()
+
+    def key() -> str:
+        return f"{SEED_PREFIX}-{uuid.uuid4()}"
+
+    async def drain(stream):
+        async for _ in stream:
+            pass
+
+    async def first(stream):
+        try:
+            await anext(stream)
+        finally:
+            await stream.aclose()
+
+    def stripe_notification(transaction_id: int):
+        return wallet_pb2.StripePaymentNotification(
+            event_type="payment_intent.succeeded",
+            payment_intent=wallet_pb2.StripePaymentNotification.PaymentIntent(
+                id=f"pi_{SEED_PREFIX}-{transaction_id}",
+                amount=2000,
+                currency="usd",
+                status="succeeded",
+                metadata={
+                    "transaction_id": str(transaction_id),
+                    "wallet_id": str(data["wallet_id"]),
+                },
+            ),
+            idempotency_key=key(),
+        )
+
+    async def batch_requests():
+        for _ in range(BATCH_SIZE):
+            yield wallet_pb2.TransferRequest(
+                from_user_id=str(data["sender"]),
+                to_user_id=str(data["recipient"]),
+                amount=1,
+                currency="USD",
+                idempotency_key=key(),
+            )
+
+    calls = {
+        "CreateWallet": lambda: servicer.CreateWallet(
+            wallet_pb2.CreateWalletRequest(user_id=str(data["newcomer"])), context
+        ),
+        "GetBalance": lambda: servicer.GetBalance(
+            wallet_pb2.GetBalanceRequest(user_id=str(data["sender"])), context
+        ),
+        "WatchBalance": lambda: first(
+            servicer.WatchBalance(
+                wallet_pb2.GetBalanceRequest(user_id=str(data["sender"])), context
+            )
+        ),
+        "ListTransactions": lambda: servicer.ListTransactions(
+            wallet_pb2.ListTransactionsRequest(user_id=str(data["sender"]), limit=50),
+            context,
+        ),
+        "ExportTransactions": lambda: drain(
+            servicer.ExportTransactions(
+                wallet_pb2.ExportTransactionsRequest(user_id=str(data["sender"])),
+                context,
+            )
+        ),
+        "GetOperationStatus": lambda: servicer.GetOperationStatus(
+            wallet_pb2.OperationStatusRequest(
+                user_id=str(data["sender"]),
+                correlation_id=data["deposit_correlation_id"],
+            ),
+            context,
+        ),
+        "Transfer": lambda: servicer.Transfer(
+            wallet_pb2.TransferRequest(
+                from_user_id=str(data["sender"]),
+                to_user_id=str(data["recipient"]),
+                amount=1,
+                currency="USD",
+                idempotency_key=key(),
+            ),
+            context,
+        ),
+        "BatchTransfer": lambda: drain(
+            servicer.BatchTransfer(batch_requests(), context)
+        ),
+        "Convert": lambda: servicer.Convert(
+            wallet_pb2.ConvertRequest(
+                user_id=str(data["sender"]),
+                amount=1,
+                from_currency="USD",
+                to_currency="EUR",
+                idempotency_key=key(),
+            ),
+            context,
+        ),
+        "CreatePaymentTransaction": lambda: servicer.CreatePaymentTransaction(
+            wallet_pb2.CreatePaymentTransactionRequest(
+                user_id=str(data["sender"]),
+                amount=20,
+                currency="USD",
+                gateway=PaymentWorker.STRIPE.value,
+                idempotency_key=key(),
+            ),
+            context,
+        ),
+        "ConnectAccountStripe": lambda: servicer.ConnectAccountStripe(
+            wallet_pb2.ConnectAccountStripeRequest(user_id=str(data["recipient"])),
+            context,
+        ),
+        "HandleStripePayment": lambda: servicer.HandleStripePayment(
+            stripe_notification(data["deposit_id"]), context
+        ),
+        "HandleStripePayout": lambda: servicer.HandleStripePayout(
+            stripe_notification(data["withdraw_id"]), context
+        ),
+        "CreateWithdrawTransaction": lambda: servicer.CreateWithdrawTransaction(
+            wallet_pb2.WithdrawRequest(
+                user_id=str(data["sender"]),
+                amount=5,
+                currency="USD",
+                getaway=PaymentWorker.STRIPE.value,
+                idempotency_key=key(),
+            ),
+            context,
+        ),
+    }
+    return [(name, BUDGETS[name], call) for name, call in calls.items()]
+
+
+async def main() -> int:
+    kafka, wallet_core.kafka = wallet_core.kafka, KafkaRecorder()
+    stripe = {name: getattr(StripeGateway, name) for name in STRIPE_STUBS}
+    for name, stub in STRIPE_STUBS.items():
+        setattr(StripeGateway, name, staticmethod(stub))
+    try:
+        async with rolled_back(async_database_helper) as conn:
+            data = await seed(conn)
+            results = await run_budgets(async_database_helper, cases(data))
+    finally:
+        wallet_core.kafka = kafka
+        for name, method in stripe.items():
+            setattr(StripeGateway, name, staticmethod(method))
+        await async_database_helper.engine.dispose()
+    return report(results)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
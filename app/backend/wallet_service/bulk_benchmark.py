@@ -0,0 +1,194 @@
+"""
+Сравнение пакетных методов CRUD с построчными на счетах кошельков.
+
+Для ROWS кошельков создает, обновляет и upsert-ит по одному счету двумя
+способами: построчно (CRUD.create, CRUD.update_by_id, get_one + create/flush)
+и пакетно (bulk_create, bulk_update, upsert_many). Каждый прогон идет внутри
+транзакции, которая откатывается: данные в базе не меняются. Для каждой
+операции печатается время, число SQL запросов и итог по таблице, который
+у обоих способов должен совпадать.
+
+Запуск на локальном окружении (Postgres после `alembic upgrade head`):
+    PYTHONPATH=app/backend python -m wallet_service.bulk_benchmark [ROWS]
+
+Не входит в сборку: время зависит от машины и сети до базы.
+"""
+
+import asyncio
+import sys
+import time
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from common.Enums import ValuteCode, WalletAccountType
+from common.Metrics.query_budget import QueryCounter, rolled_back
+from common.Models import WalletAccount
+from common.crud.CrudDb import CRUD
+from wallet_service.Core.async_database_helper import async_database_helper
+
+SEED_PREFIX = "bulk-benchmark"
+ROWS = 10_000
+RUNS = 2
+CONFLICT_COLS = ["wallet_id", "currency_code", "type"]
+
+Operation = Tuple[str, Callable[[AsyncSession], Awaitable[Any]]]
+
+
+async def seed(conn: AsyncConnection, rows: int) -> List[int]:
+    """Пользователи и кошельки без счетов; id кошельков по возрастанию"""
+    await conn.execute(
+        text(
+            """
+            INSERT INTO "Users" (login, is_active, two_factor_enabled, auth_provider)
+            SELECT :prefix || '-' || g, true, false, 'local'
+            FROM generate_series(1, :rows) g
+            """
+        ),
+        {"prefix": SEED_PREFIX, "rows": rows},
+    )
+    return (
+        (
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO wallets (user_id)
+                    SELECT id FROM "Users" WHERE login LIKE :prefix || '-%'
+                    RETURNING id
+                    """
+                ),
+                {"prefix": SEED_PREFIX},
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+def accounts(wallet_ids: List[int], amount: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "wallet_id": wallet_id,
+            "currency_code": ValuteCode.RUB,
+            "type": WalletAccountType.FIAT,
+            "amount": Decimal(amount),
+        }
+        for wallet_id in sorted(wallet_ids)
+    ]
+
+
+async def account_ids(session: AsyncSession, wallet_ids: List[int]) -> List[int]:
+    return (
+        (
+            await session.execute(
+                text(
+                    "SELECT id FROM wallet_accounts "
+                    "WHERE wallet_id = ANY(CAST(:ids AS int[])) ORDER BY id"
+                ),
+                {"ids": wallet_ids},
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+def row_operations(wallet_ids: List[int]) -> List[Operation]:
+    async def create(session: AsyncSession):
+        for row in accounts(wallet_ids, "1"):
+            await CRUD.create(session, WalletAccount, **row)
+
+    async def update(session: AsyncSession):
+        for account_id in await account_ids(session, wallet_ids):
+            await CRUD.update_by_id(
+                session, WalletAccount, account_id, amount=Decimal("2")
+            )
+
+    async def upsert(session: AsyncSession):
+        # SELECT, затем INSERT или UPDATE для каждой строки
+        session.expunge_all()
+        for row in accounts(wallet_ids, "3"):
+            account = await CRUD.get_one(
+                session, WalletAccount, **{c: row[c] for c in CONFLICT_COLS}
+            )
+            if account is None:
+                await CRUD.create(session, WalletAccount, **row)
+            else:
+                account.amount = row["amount"]
+                await session.flush()
+
+    return [("create", create), ("update", update), ("upsert", upsert)]
+
+
+def bulk_operations(wallet_ids: List[int]) -> List[Operation]:
+    async def create(session: AsyncSession):
+        await CRUD.bulk_create(session, WalletAccount, accounts(wallet_ids, "1"))
+
+    async def update(session: AsyncSession):
+        rows = [
+            {"id": account_id, "amount": Decimal("2")}
+            for account_id in await account_ids(session, wallet_ids)
+        ]
+        await CRUD.bulk_update(session, WalletAccount, rows)
+
+    async def upsert(session: AsyncSession):
+        await CRUD.upsert_many(
+            session,
+            WalletAccount,
+            accounts(wallet_ids, "3"),
+            conflict_cols=CONFLICT_COLS,
+            update_cols=["amount"],
+        )
+
+    return [("create", create), ("update", update), ("upsert", upsert)]
+
+
+async def run(
+    rows: int, operations: Callable[[List[int]], List[Operation]]
+) -> Tuple[List[Tuple[str, float, int]], Tuple[int, Decimal]]:
+    """Время и число запросов каждой операции и итог (count, sum) по счетам"""
+    async with rolled_back(async_database_helper) as conn:
+        wallet_ids = await seed(conn, rows)
+        timings = []
+        async with async_database_helper.session_factory() as session:
+            for name, operation in operations(wallet_ids):
+                with QueryCounter(async_database_helper) as counter:
+                    started = time.perf_counter()
+                    await operation(session)
+                    elapsed = time.perf_counter() - started
+                timings.append((name, elapsed, len(counter.statements)))
+            total = (
+                await session.execute(
+                    text(
+                        "SELECT count(*), coalesce(sum(amount), 0) FROM wallet_accounts "
+                        "WHERE wallet_id = ANY(CAST(:ids AS int[]))"
+                    ),
+                    {"ids": wallet_ids},
+                )
+            ).one()
+    return timings, tuple(total)
+
+
+async def main(rows: int = ROWS) -> int:
+    totals = set()
+    for attempt in range(1, RUNS + 1):
+        for label, operations in (("row", row_operations), ("bulk", bulk_operations)):
+            timings, total = await run(rows, operations)
+            totals.add(total)
+            for name, elapsed, queries in timings:
+                print(
+                    f"#{attempt} {label:<5} {name:<7} {elapsed:>8.3f} s "
+                    f"{queries:>6} queries"
+                )
+            print(f"#{attempt} {label:<5} итог: {total[0]} счетов, сумма {total[1]}")
+
+    if len(totals) != 1:
+        print(f"\nИтоги построчного и пакетного способов расходятся: {totals}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(*(int(arg) for arg in sys.argv[1:2]))))
@@ -7,7 +7,48 @@ from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional, Type
 import redis
 from common.gRpc.wallet_service import wallet_pb2
-from wallet_service.exceptions.exceptions import NoWallet, IdempDone, NoStripeAccount
+from wallet_service.exceptions.exceptions import (
+    NoWallet,
+    IdempDone,
+    NoStripeAccount,
+    NoOperation,
+    InvalidArgument,
+)
+
+
+async def _handle_error(
+    e: Exception, func_name: str, context, logger: logging.Logger
+) -> None:
+    """Логирует ошибку и, если есть context, завершает вызов нужным gRPC статусом"""
+    if isinstance(e, HTTPException):
+        logger.error(f"HTTP error in {func_name}: {e.status_code} - {e.detail}")
+        return
+    if isinstance(e, grpc.RpcError):
+        logger.warning(f"gRPC warning in {func_name}: {e.code()} - {e.details()}")
+        return
+    if isinstance(e, SQLAlchemyError):
+        logger.error(f"Database error in {func_name}: {str(e)}")
+        return
+    if isinstance(e, redis.exceptions.RedisError):
+        logger.error(f"Redis error in {func_name}: {str(e)}")
+        return
+
+    if isinstance(e, (NoWallet, NoOperation)):
+        code = grpc.StatusCode.NOT_FOUND
+    elif isinstance(e, (IdempDone, InvalidArgument)):
+        code = grpc.StatusCode.INVALID_ARGUMENT
+    elif isinstance(e, NoStripeAccount):
+        code = grpc.StatusCode.UNAVAILABLE
+    else:
+        code = grpc.StatusCode.INTERNAL
+
+    if code == grpc.StatusCode.INTERNAL:
+        logger.error(f"Unexpected error in {func_name}: {str(e)}")
+    else:
+        logger.error(f"Error in {func_name}: {str(e)}")
+
+    if context:
+        await context.abort(code, str(e))
 
 
 def catch_errors(logger: Optional[logging.Logger] = None, response_class: Type = None):
@@ -15,53 +56,35 @@ def catch_errors(logger: Optional[logging.Logger] = None, response_class: Type =
         logger = logging.getLogger(__name__)
 
     def decorator(func):
-        @functools.wraps(func)
-        async def wrapper(*args, **kwargs):
-            sig = inspect.signature(func)
+        sig = inspect.signature(func)
+
+        def get_context(args, kwargs):
             bound_args = sig.bind(*args, **kwargs)
             bound_args.apply_defaults()
-            context = bound_args.arguments.get("context")
-            try:
-                return await func(*args, **kwargs)
-            except HTTPException as e:
-                logger.error(
-                    f"HTTP error in {func.__name__}: {e.status_code} - {e.detail}"
-                )
-                raise
-            except grpc.RpcError as e:
-                logger.warning(
-                    f"gRPC warning in {func.__name__}: {e.code()} - {e.details()}"
-                )
-                raise
-            except SQLAlchemyError as e:
-                logger.error(f"Database error in {func.__name__}: {str(e)}")
-                raise
-            except redis.exceptions.RedisError as e:
-                logger.error(f"Redis error in {func.__name__}: {str(e)}")
-                raise
+            return bound_args.arguments.get("context")
 
-            except NoWallet as e:
-                logger.error(f"Error in {func.__name__}: {str(e)}")
-                if context:
-                    await context.abort(grpc.StatusCode.NOT_FOUND, str(e))
-                raise
+        # Стриминговые RPC (async-генераторы)
+        if inspect.isasyncgenfunction(func):
 
-            except IdempDone as e:
-                logger.error(f"Error in {func.__name__}: {str(e)}")
-                if context:
-                    await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
-                raise
+            @functools.wraps(func)
+            async def stream_wrapper(*args, **kwargs):
+                context = get_context(args, kwargs)
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                except Exception as e:
+                    await _handle_error(e, func.__name__, context, logger)
+                    raise
 
-            except NoStripeAccount as e:
-                logger.error(f"Error in {func.__name__}: {str(e)}")
-                if context:
-                    await context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
-                raise
+            return stream_wrapper
 
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            context = get_context(args, kwargs)
+            try:
+                return await func(*args, **kwargs)
             except Exception as e:
-                logger.error(f"Unexpected error in {func.__name__}: {str(e)}")
-                if context:
-                    await context.abort(grpc.StatusCode.INTERNAL, str(e))
+                await _handle_error(e, func.__name__, context, logger)
                 raise
 
         return wrapper
@@ -8,3 +8,11 @@ class IdempDone(Exception):
 
 class NoStripeAccount(Exception):
     pass
+
+
+class NoOperation(Exception):
+    pass
+
+
+class InvalidArgument(Exception):
+    pass
@@ -7,6 +7,9 @@ class Settings(Postgres, Redis):
     INPUT_TOPIC: str = "wallet.transaction.request"
     OUTPUT_TOPIC: str = "wallet.transaction.result"
     REDIS_KEY_IDEMPOTENCY: str
+    REDIS_CHANNEL_BALANCE: str = "wallet:balance"
+    REDIS_KEY_OPERATION: str = "wallet:operation"
+    REDIS_CHANNEL_OPERATION: str = "wallet:operation:done"
 
     model_config = SettingsConfigDict(extra="ignore")
 
@@ -20,6 +20,46 @@ from wallet_worker.Core.redis_cli import redis_client
 MAX_RETRIES = 3
 
 
+async def notify_balance_changed(value: WalletTransactionRequest):
+    """Публикация события об изменении баланса для подписчиков WatchBalance"""
+    wallet_ids = {value.wallet_id}
+    if value.operation == OperationType.TRANSFER:
+        wallet_ids.add(value.to_wallet_id)
+
+    event = json.dumps(
+        {"correlation_id": value.correlation_id, "operation": value.operation.value}
+    )
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for wallet_id in wallet_ids:
+                pipe.publish(f"{settings.REDIS_CHANNEL_BALANCE}:{wallet_id}", event)
+            await pipe.execute()
+    except Exception as e:
+        # Операция уже зафиксирована, потеря уведомления не должна приводить к повтору
+        logger.error(f"Не удалось опубликовать изменение баланса: {str(e)}")
+
+
+async def publish_operation_result(result: dict):
+    """
+    Сохранение результата по correlation_id и пробуждение ожидающих GetOperationStatus
+    """
+    correlation_id = result["correlation_id"]
+    payload = json.dumps(result)
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(
+                name=f"{settings.REDIS_KEY_OPERATION}:{correlation_id}",
+                time=24 * 3600,
+                value=payload,
+            )
+            pipe.publish(
+                f"{settings.REDIS_CHANNEL_OPERATION}:{correlation_id}", payload
+            )
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"Не удалось сохранить результат операции: {str(e)}")
+
+
 @catch_errors(logger=logger)
 async def handle_message_transaction(msg: ConsumerRecord):
     logger.info(f"--------------Handle-------------------------")
@@ -38,6 +78,19 @@ async def handle_message_transaction(msg: ConsumerRecord):
             await async_kafka_client.produce_message(
                 topic="wallet.transaction.dlq", message=json.dumps(message_data)
             )
+            result = WalletTransactionResult(
+                status="error",
+                correlation_id=value.correlation_id,
+                operation=value.operation,
+                amount=value.amount,
+                wallet_id=value.wallet_id,
+                idempotency_key=value.idempotency_key,
+                error=message_data.get("error"),
+            ).to_dict()
+            await async_kafka_client.produce_message(
+                topic=settings.OUTPUT_TOPIC, message=json.dumps(result)
+            )
+            await publish_operation_result(result)
             # Коммитим офсет даже для DLQ
             await async_kafka_client.consumer.commit(
                 {
@@ -81,52 +134,12 @@ async def handle_message_transaction(msg: ConsumerRecord):
                         amount=Decimal(str(value.amount)),
                     )
 
-                result = WalletTransactionResult(
-                    status="success",
-                    correlation_id=value.correlation_id,
-                    operation=value.operation,
-                    amount=value.amount,
-                    wallet_id=value.wallet_id,
-                    idempotency_key=value.idempotency_key,
-                )
-                result = result.to_dict()
-
-                logger.info(
-                    f"Сохранение результата операции idemotency_key={value.idempotency_key} в redis..."
-                )
-
-                await redis_client.setex(
-                    name=f"{settings.REDIS_KEY_IDEMPOTENCY}:{value.idempotency_key}",
-                    time=24 * 3600,
-                    value=json.dumps(result),
-                )
-
-                logger.info(f"Результат сохранен")
-
-                logger.info(f"Отправка результата обработчика в топик")
-                await async_kafka_client.produce_message(
-                    topic=settings.OUTPUT_TOPIC,
-                    message=json.dumps(result),
-                )
-                logger.info("Сообщение отправлено")
-
                 await session.commit()
-
-                # Явный коммит офсета после успешной обработки
-                await async_kafka_client.consumer.commit(
-                    {
-                        TopicPartition(msg.topic, msg.partition): OffsetAndMetadata(
-                            msg.offset + 1, ""
-                        )
-                    }
-                )
-
-                logger.info(f"Сообщение обработалось успешно")
-                return result
             except Exception as e:
                 await session.rollback()
                 # Увеличиваем счетчик retries и отправляем сообщение обратно
                 message_data["retries"] = message_data.get("retries", 0) + 1
+                message_data["error"] = str(e)
                 logger.info(f"Повторная отправка сообщения в кафку...")
                 await async_kafka_client.produce_message(
                     topic=msg.topic, message=json.dumps(message_data)
@@ -142,6 +155,52 @@ async def handle_message_transaction(msg: ConsumerRecord):
                 )
                 raise
 
+        # Результат публикуется только после коммита: wallet_service по нему
+        # помечает транзакцию COMPLETED. Ошибки ниже не отправляют операцию на повтор
+        result = WalletTransactionResult(
+            status="success",
+            correlation_id=value.correlation_id,
+            operation=value.operation,
+            amount=value.amount,
+            wallet_id=value.wallet_id,
+            idempotency_key=value.idempotency_key,
+        )
+        result = result.to_dict()
+
+        logger.info(
+            f"Сохранение результата операции idemotency_key={value.idempotency_key} в redis..."
+        )
+
+        await redis_client.setex(
+            name=f"{settings.REDIS_KEY_IDEMPOTENCY}:{value.idempotency_key}",
+            time=24 * 3600,
+            value=json.dumps(result),
+        )
+
+        logger.info(f"Результат сохранен")
+
+        logger.info(f"Отправка результата обработчика в топик")
+        await async_kafka_client.produce_message(
+            topic=settings.OUTPUT_TOPIC,
+            message=json.dumps(result),
+        )
+        logger.info("Сообщение отправлено")
+
+        await publish_operation_result(result)
+        await notify_balance_changed(value)
+
+        # Явный коммит офсета после успешной обработки
+        await async_kafka_client.consumer.commit(
+            {
+                TopicPartition(msg.topic, msg.partition): OffsetAndMetadata(
+                    msg.offset + 1, ""
+                )
+            }
+        )
+
+        logger.info(f"Сообщение обработалось успешно")
+        return result
+
     except Exception as e:
         logger.error(f"Ошибка обработки сообщения: {str(e)}", exc_info=True)
         raise
@@ -158,6 +217,11 @@ async def consume():
     logger.info("Инициализация producer")
     await async_kafka_client.init_producer()
     logger.info(f"producer инициализирован")
+    pool_metrics_task = asyncio.create_task(
+        async_database_helper.report_pool_metrics(
+            logger=logger, interval_s=settings.POSTGRES_POOL_METRICS_INTERVAL_S
+        )
+    )
 
     try:
         async for msg in async_kafka_client.consumer:
@@ -179,6 +243,7 @@ async def consume():
     except Exception as e:
         logger.critical(f"Fatal error in consumer loop: {e}", exc_info=True)
     finally:
+        pool_metrics_task.cancel()
         await async_kafka_client.close()
 
     logger.info("Консюмер остновлен")
@@ -22,33 +22,24 @@ class WalletService:
     async def delete_wallet(self, session: AsyncSession, wallet_id: int):
         await self.crud.delete_by_id(session=session, model=Wallet, object_id=wallet_id)
 
-    async def get_wallet(self, session: AsyncSession, wallet_id: int) -> Wallet:
-        logger.info("Получение Wallet...")
-        wallets = await self.crud.get_by_filter(
-            session=session, model=Wallet, id=wallet_id
-        )
-        if not wallets:
-            raise ValueError("Кошелек не найден.")
-
-        wallet = wallets[0]
-        logger.info(f"Кошелек найден: {wallet.__repr__()}")
-        return wallet
-
-    @staticmethod
     async def get_wallet_account(
-        session: AsyncSession, wallet: Wallet, currency_code: ValuteCode
+        self, session: AsyncSession, wallet_id: int, currency_code: ValuteCode
     ) -> WalletAccount | None:
         logger.info("Получение счета пользователя...")
+        account = await self.crud.get_one(
+            session=session,
+            model=WalletAccount,
+            wallet_id=wallet_id,
+            currency_code=currency_code,
+        )
+        if account is None:
+            if not await self.crud.exists(session=session, model=Wallet, id=wallet_id):
+                raise ValueError("Кошелек не найден.")
+            logger.info(f"Счет не найден")
+            return None
 
-        await session.refresh(wallet, attribute_names=["accounts"])
-
-        for account in wallet.accounts:
-            if account.currency_code == currency_code:
-                logger.info(f"Счет найден: {account.__repr__()}")
-                return account
-
-        logger.info(f"Счет не найден")
-        return None
+        logger.info(f"Счет найден: {account.__repr__()}")
+        return account
 
     async def _change_balance(
         self,
@@ -58,9 +49,8 @@ class WalletService:
         delta: Decimal,
     ):
         logger.info("---Change Balance---")
-        wallet = await self.get_wallet(session, wallet_id)
         account = await self.get_wallet_account(
-            session=session, wallet=wallet, currency_code=currency_code
+            session=session, wallet_id=wallet_id, currency_code=currency_code
         )
 
         if account is None:
@@ -139,12 +129,14 @@ class WalletService:
         if amount <= 0:
             raise ValueError("Сумма для конвертации должна быть больше нуля.")
 
-        from_rate = (
-            await self.crud.get_by_filter(session, Currency, code=from_currency)
-        )[0].rate_to_base
-        to_rate = (await self.crud.get_by_filter(session, Currency, code=to_currency))[
-            0
-        ].rate_to_base
+        from_rate = await self.crud.get_scalar(
+            session, Currency.rate_to_base, code=from_currency
+        )
+        to_rate = await self.crud.get_scalar(
+            session, Currency.rate_to_base, code=to_currency
+        )
+        if from_rate is None or to_rate is None:
+            raise ValueError("Курс валюты не найден.")
 
         converted_amount = amount * from_rate / to_rate
 